@@ -0,0 +1,53 @@
+"""
+In-memory audio decoding for Whisper
+
+Uploads arrive as encoded bytes (webm/ogg from browsers, m4a from phones,
+wav, mp3). They are piped through ffmpeg and come back as 16 kHz mono
+float32 samples, which Whisper accepts directly, so no upload has to touch
+the disk. Containers that ffmpeg cannot demux from a pipe (MP4/M4A with
+the index at the end) fall back to a short-lived temp file.
+"""
+
+import os
+import subprocess
+import tempfile
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FFMPEG_TIMEOUT_S = 60
+
+
+class AudioDecodeError(ValueError):
+    pass
+
+
+def _ffmpeg(source: str, data: bytes = None) -> subprocess.CompletedProcess:
+    cmd = [
+        "ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error", "-threads", "0",
+        "-i", source,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE),
+        "pipe:1",
+    ]
+    return subprocess.run(cmd, input=data, capture_output=True, timeout=FFMPEG_TIMEOUT_S)
+
+
+def decode_audio(data: bytes, suffix: str = "") -> np.ndarray:
+    """
+    Decode encoded audio bytes to 16 kHz mono float32 in [-1, 1]
+
+    Raises:
+        AudioDecodeError: ffmpeg could not decode the input
+    """
+    result = _ffmpeg("pipe:0", data)
+    if result.returncode != 0 or not result.stdout:
+        # Non-streamable container: give ffmpeg a seekable file
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+            f.write(data)
+        try:
+            result = _ffmpeg(f.name)
+        finally:
+            os.unlink(f.name)
+    if result.returncode != 0 or not result.stdout:
+        raise AudioDecodeError(f"Cannot decode audio: {result.stderr.decode(errors='ignore').strip()[:200]}")
+    return np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
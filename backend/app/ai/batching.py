@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, List
+
+from app.ai.inference_pool import InferenceBusy
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Collects single inference requests into batches on a dedicated thread.
+
+    Callers submit one item and get a future back. The worker thread waits for
+    the first item, then keeps collecting for up to `max_wait_ms` (or until
+    `max_batch_size` items are queued) and runs `run_batch` once for all of
+    them, so concurrent requests share one forward pass and the event loop is
+    never blocked by model code.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        name: str = "batcher",
+        max_pending: int = 0,
+        retry_after: int = 5,
+    ):
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+        self.max_pending = max_pending  # 0 = unbounded
+        self.retry_after = retry_after
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, name=f"{name}-worker", daemon=True)
+        self._started = False
+        self._start_lock = threading.Lock()
+
+        # Stats
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.errors = 0
+        self.rejected = 0
+        self._busy_seconds = 0.0
+        self._latencies = deque(maxlen=1000)  # Submit -> result, seconds
+        self._created_at = time.monotonic()
+
+    def _ensure_started(self):
+        if not self._started:
+            with self._start_lock:
+                if not self._started:
+                    self._thread.start()
+                    self._started = True
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, item: Any) -> Future:
+        """Queue one item; the future resolves to its result. Raises InferenceBusy when full."""
+        if self.max_pending and self.pending >= self.max_pending:
+            with self._lock:
+                self.rejected += 1
+            raise InferenceBusy(self.retry_after)
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((item, future, time.monotonic()))
+        return future
+
+    async def submit_async(self, item: Any) -> Any:
+        """Queue one item and await its result from async code."""
+        return await asyncio.wrap_future(self.submit(item))
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _worker(self):
+        while True:
+            batch = self._collect()
+            # Skip requests whose caller already gave up
+            batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            started = time.monotonic()
+            try:
+                results = self.run_batch([item for item, _, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"{self.name}: got {len(results)} results for {len(batch)} inputs")
+            except Exception as e:
+                logger.error(f"{self.name}: batch of {len(batch)} failed: {e}", exc_info=True)
+                with self._lock:
+                    self.errors += 1
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            finished = time.monotonic()
+            for (_, future, submitted), result in zip(batch, results):
+                future.set_result(result)
+                self._latencies.append(finished - submitted)
+
+            with self._lock:
+                self.batches += 1
+                self.items += len(batch)
+                self._busy_seconds += finished - started
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            uptime = time.monotonic() - self._created_at
+            return {
+                "name": self.name,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "batches": self.batches,
+                "items": self.items,
+                "errors": self.errors,
+                "rejected": self.rejected,
+                "pending": self.pending,
+                "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+                "throughput_per_s": round(self.items / self._busy_seconds, 2) if self._busy_seconds else 0.0,
+                "requests_per_s": round(self.items / uptime, 3) if uptime else 0.0,
+                "latency_ms_p50": round(latencies[len(latencies) // 2] * 1000, 2) if latencies else None,
+                "latency_ms_p95": round(latencies[int(len(latencies) * 0.95)] * 1000, 2) if latencies else None,
+            }
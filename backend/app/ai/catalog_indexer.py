@@ -0,0 +1,242 @@
+"""
+Catalog vectorization pipeline: scraped_products -> Qdrant
+
+Features:
+- Streams ScrapedProduct rows in (updated_at, id) keyset chunks
+- Batch-embeds product text (name, category, part number, specs) with the
+  configured text backend
+- Downloads product images concurrently and batch-embeds them, skipping
+  images whose URL is already indexed for that product
+- Bulk upserts to parts_text / parts_images with parallel uploads
+- Resumable and incremental: a VectorIndexState cursor is advanced after
+  every chunk, so reruns only re-embed products updated since
+"""
+
+import asyncio
+import functools
+import io
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+from PIL import Image
+from qdrant_client.http import models
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.ai.embeddings import EmbeddingService, get_embedding_service
+from app.ai.qdrant_client import QdrantManager
+from app.models.scraper import ScrapedProduct, VectorIndexState
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "catalog"
+MAX_TEXT_SPECS = 12  # CLIP truncates at 77 tokens; the first specs are the most telling
+MAX_IMAGE_SIDE = 448  # Downscale right after decode; CLIP only sees 224px
+
+
+def product_text(product: ScrapedProduct) -> str:
+    """Text embedded for a product: identity first, then a few specs"""
+    parts = [product.product_name, product.category, product.part_number, product.vendor_name]
+    specs = product.specifications or {}
+    parts.extend(f"{key}: {value}" for key, value in list(specs.items())[:MAX_TEXT_SPECS])
+    return ". ".join(str(part) for part in parts if part)
+
+
+def product_payload(product: ScrapedProduct) -> dict:
+    image_urls = product.image_urls or []
+    return {
+        "part_id": product.id,
+        "part_number": product.part_number,
+        "product_name": product.product_name,
+        "vendor_name": product.vendor_name,
+        # Scraped catalogs are manufacturer sites, so the vendor is the manufacturer
+        "manufacturer": product.vendor_name,
+        "category": product.category,
+        "source_url": product.source_url,
+        "image_url": image_urls[0] if image_urls else None,
+        "scraper_id": product.scraper_id,
+    }
+
+
+class CatalogIndexer:
+    """
+    Indexes scraped products into Qdrant
+
+    Args:
+        db: SQLAlchemy session
+        qdrant: QdrantManager (created if omitted)
+        embedder: EmbeddingService (process-wide one if omitted)
+        chunk_size: Products read, embedded and upserted per step
+        embed_batch_size: Inputs per CLIP forward pass
+        image_concurrency: Parallel image downloads
+        upload_parallel: Parallel Qdrant upload workers
+        index_images: Also fill parts_images
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        qdrant: Optional[QdrantManager] = None,
+        embedder: Optional[EmbeddingService] = None,
+        chunk_size: int = 256,
+        embed_batch_size: int = 32,
+        image_concurrency: int = 8,
+        upload_parallel: int = 2,
+        index_images: bool = True,
+        name: str = INDEX_NAME,
+    ):
+        self.db = db
+        self.qdrant = qdrant or QdrantManager()
+        self.embedder = embedder or get_embedding_service()
+        self.chunk_size = chunk_size
+        self.embed_batch_size = embed_batch_size
+        self.image_concurrency = image_concurrency
+        self.upload_parallel = upload_parallel
+        self.index_images = index_images
+        self.name = name
+        self.stats = {
+            'products': 0,
+            'text_points': 0,
+            'image_points': 0,
+            'images_unchanged': 0,
+            'image_failures': 0,
+        }
+
+    def _load_state(self, full: bool) -> VectorIndexState:
+        state = self.db.query(VectorIndexState).filter(VectorIndexState.name == self.name).first()
+        if state is None:
+            state = VectorIndexState(name=self.name, indexed_count=0)
+            self.db.add(state)
+        if full:
+            state.last_updated_at = None
+            state.last_product_id = None
+        self.db.commit()
+        return state
+
+    def _next_chunk(self, state: VectorIndexState) -> List[ScrapedProduct]:
+        changed_at = func.coalesce(ScrapedProduct.updated_at, ScrapedProduct.scraped_at)
+        query = self.db.query(ScrapedProduct)
+        if state.last_updated_at is not None:
+            query = query.filter(or_(
+                changed_at > state.last_updated_at,
+                and_(changed_at == state.last_updated_at, ScrapedProduct.id > state.last_product_id)
+            ))
+        return query.order_by(changed_at, ScrapedProduct.id).limit(self.chunk_size).all()
+
+    async def _embed(self, embed_batch, items: list) -> List[List[float]]:
+        vectors = []
+        for i in range(0, len(items), self.embed_batch_size):
+            vectors.extend(await asyncio.to_thread(embed_batch, items[i:i + self.embed_batch_size]))
+        return vectors
+
+    async def _download_image(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, url: str) -> Optional[Image.Image]:
+        async with semaphore:
+            try:
+                response = await client.get(url)
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                logger.warning(f"Indexer: image download failed {url}: {e}")
+                return None
+
+        def decode(data: bytes) -> Image.Image:
+            image = Image.open(io.BytesIO(data)).convert("RGB")
+            image.thumbnail((MAX_IMAGE_SIDE, MAX_IMAGE_SIDE))
+            return image
+
+        try:
+            return await asyncio.to_thread(decode, response.content)
+        except Exception as e:
+            logger.warning(f"Indexer: cannot decode image {url}: {e}")
+            return None
+
+    async def _image_points(self, client: httpx.AsyncClient, products: List[ScrapedProduct], payloads: Dict[int, dict]) -> List[models.PointStruct]:
+        wanted = {p.id: payloads[p.id]['image_url'] for p in products if payloads[p.id]['image_url']}
+        if not wanted:
+            return []
+
+        # Skip products whose image is already indexed under the same URL
+        existing = await asyncio.to_thread(self.qdrant.get_payloads, list(wanted), "image", ["image_url"])
+        todo = {pid: url for pid, url in wanted.items() if existing.get(pid, {}).get('image_url') != url}
+        self.stats['images_unchanged'] += len(wanted) - len(todo)
+        if not todo:
+            return []
+
+        semaphore = asyncio.Semaphore(self.image_concurrency)
+        images = await asyncio.gather(*(self._download_image(client, semaphore, url) for url in todo.values()))
+        downloaded = [(pid, image) for pid, image in zip(todo, images) if image is not None]
+        self.stats['image_failures'] += len(todo) - len(downloaded)
+        if not downloaded:
+            return []
+
+        vectors = await self._embed(self.embedder.generate_image_embeddings, [image for _, image in downloaded])
+        return [
+            models.PointStruct(id=pid, vector=vector, payload=payloads[pid])
+            for (pid, _), vector in zip(downloaded, vectors)
+        ]
+
+    async def _index_chunk(self, client: httpx.AsyncClient, products: List[ScrapedProduct]):
+        payloads = {p.id: product_payload(p) for p in products}
+
+        # Text embedding (CPU) overlaps with image downloads (network)
+        embed_passages = functools.partial(self.embedder.generate_text_embeddings, input_type="passage")
+        text_task = self._embed(embed_passages, [product_text(p) for p in products])
+        if self.index_images:
+            text_vectors, image_points = await asyncio.gather(text_task, self._image_points(client, products, payloads))
+        else:
+            text_vectors, image_points = await text_task, []
+
+        text_points = [
+            models.PointStruct(id=p.id, vector=vector, payload=payloads[p.id])
+            for p, vector in zip(products, text_vectors)
+        ]
+        await asyncio.to_thread(self.qdrant.upsert_points, text_points, "text", 128, self.upload_parallel)
+        if image_points:
+            await asyncio.to_thread(self.qdrant.upsert_points, image_points, "image", 64, self.upload_parallel)
+
+        self.stats['text_points'] += len(text_points)
+        self.stats['image_points'] += len(image_points)
+
+    async def run(self, full: bool = False) -> dict:
+        """
+        Index everything updated since the last run (or everything if `full`)
+
+        Returns:
+            Counters of indexed products and points
+        """
+        started = time.monotonic()
+        state = self._load_state(full)
+        logger.info(
+            f"Indexer '{self.name}': {'full rebuild' if full else 'incremental'} run "
+            f"from {state.last_updated_at or 'the beginning'}"
+        )
+
+        async with httpx.AsyncClient(
+            timeout=20.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.image_concurrency),
+            headers={'User-Agent': 'Mozilla/5.0 (compatible; NexusCatalogIndexer/1.0)'},
+        ) as client:
+            while True:
+                products = self._next_chunk(state)
+                if not products:
+                    break
+
+                await self._index_chunk(client, products)
+
+                # Advance the cursor only once the chunk is in Qdrant
+                last = products[-1]
+                state.last_updated_at = last.updated_at or last.scraped_at
+                state.last_product_id = last.id
+                state.indexed_count = (state.indexed_count or 0) + len(products)
+                state.last_run_at = datetime.utcnow()
+                self.db.commit()
+
+                self.stats['products'] += len(products)
+                logger.info(f"Indexer '{self.name}': {self.stats['products']} products indexed")
+
+        self.stats['seconds'] = round(time.monotonic() - started, 1)
+        logger.info(f"Indexer '{self.name}' finished: {self.stats}")
+        return dict(self.stats)
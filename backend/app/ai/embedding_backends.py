@@ -0,0 +1,129 @@
+"""
+Pluggable embedding backends
+
+Each backend declares its output dimension up front (so Qdrant collections
+can be created and validated without loading anything) and loads its model
+lazily through the model registry on first use.
+
+Backends:
+- "clip-vit-b32": openai/clip-vit-base-patch32 on PyTorch, 512-dim, text + images
+- "clip-vit-b32-onnx": the same CLIP exported to ONNX Runtime (int8 by default,
+  see app/ai/onnx_clip.py); vectors are interchangeable with "clip-vit-b32"
+- "e5-large": intfloat/multilingual-e5-large, 1024-dim, text only (better
+  for Arabic queries); uses the "query: " / "passage: " prefixes it was trained with
+
+Collections pick a backend in config: QDRANT_TEXT_BACKEND / QDRANT_IMAGE_BACKEND.
+"""
+
+import threading
+from typing import Dict, List, Type, Union
+
+from PIL import Image
+
+from app.ai.model_registry import model_registry
+from app.ai.onnx_clip import clip_features
+
+ImageInput = Union[str, Image.Image]
+
+
+class EmbeddingBackend:
+    name: str = ""
+    dim: int = 0
+    supports_images: bool = False
+    uncased: bool = False  # Tokenizer lowercases its input, so case never changes the vector
+    registry_model: str = ""  # model_registry entry holding the weights
+
+    @property
+    def loaded(self) -> bool:
+        return model_registry.is_loaded(self.registry_model)
+
+    def embed_texts(self, texts: List[str], input_type: str = "query") -> List[List[float]]:
+        """
+        Args:
+            input_type: "query" for search input, "passage" for catalog documents
+        """
+        raise NotImplementedError
+
+    def embed_images(self, images: List[ImageInput]) -> List[List[float]]:
+        raise NotImplementedError(f"Embedding backend {self.name} does not embed images")
+
+
+def open_images(images: List[ImageInput]) -> List[Image.Image]:
+    return [Image.open(image).convert("RGB") if isinstance(image, str) else image for image in images]
+
+
+class ClipTorchBackend(EmbeddingBackend):
+    name = "clip-vit-b32"
+    dim = 512
+    supports_images = True
+    uncased = True
+    registry_model = "clip"
+
+    def embed_texts(self, texts: List[str], input_type: str = "query") -> List[List[float]]:
+        import torch
+
+        model, processor = model_registry.get(self.registry_model)
+        inputs = processor(text=texts, return_tensors="pt", padding=True, truncation=True, max_length=77).to(model.device)
+        with torch.no_grad():
+            outputs = clip_features(model.get_text_features(**inputs))
+        return outputs.cpu().numpy().tolist()
+
+    def embed_images(self, images: List[ImageInput]) -> List[List[float]]:
+        import torch
+
+        model, processor = model_registry.get(self.registry_model)
+        inputs = processor(images=open_images(images), return_tensors="pt").to(model.device)
+        with torch.no_grad():
+            outputs = clip_features(model.get_image_features(**inputs))
+        return outputs.cpu().numpy().tolist()
+
+
+class ClipOnnxBackend(EmbeddingBackend):
+    name = "clip-vit-b32-onnx"
+    dim = 512
+    supports_images = True
+    uncased = True
+    registry_model = "clip-onnx"
+
+    def embed_texts(self, texts: List[str], input_type: str = "query") -> List[List[float]]:
+        clip = model_registry.get(self.registry_model)
+        inputs = clip.processor(text=texts, return_tensors="np", padding=True, truncation=True, max_length=77)
+        return clip.text_features(inputs["input_ids"], inputs["attention_mask"]).tolist()
+
+    def embed_images(self, images: List[ImageInput]) -> List[List[float]]:
+        clip = model_registry.get(self.registry_model)
+        inputs = clip.processor(images=open_images(images), return_tensors="np")
+        return clip.image_features(inputs["pixel_values"]).tolist()
+
+
+class E5Backend(EmbeddingBackend):
+    name = "e5-large"
+    dim = 1024
+    registry_model = "e5"
+
+    def embed_texts(self, texts: List[str], input_type: str = "query") -> List[List[float]]:
+        model = model_registry.get(self.registry_model)
+        prefix = "passage: " if input_type == "passage" else "query: "
+        vectors = model.encode([prefix + text for text in texts], normalize_embeddings=True, batch_size=len(texts))
+        return vectors.tolist()
+
+
+BACKENDS: Dict[str, Type[EmbeddingBackend]] = {
+    ClipTorchBackend.name: ClipTorchBackend,
+    ClipOnnxBackend.name: ClipOnnxBackend,
+    E5Backend.name: E5Backend,
+}
+
+_instances: Dict[str, EmbeddingBackend] = {}
+_instances_lock = threading.Lock()
+
+
+def get_backend(name: str) -> EmbeddingBackend:
+    """Shared backend instance by name (cheap: nothing is loaded until the first embed)"""
+    if name not in _instances:
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown embedding backend '{name}'. Available: {list(BACKENDS)}")
+        with _instances_lock:
+            if name not in _instances:
+                _instances[name] = BACKENDS[name]()
+    return _instances[name]
@@ -0,0 +1,153 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+REDIS_RETRY_SECONDS = 30
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache: in-process LRU in front of Redis
+
+    Keys are the model name plus a SHA-256 of the whitespace-normalized text
+    (also lowercased for uncased models) or the raw image bytes, so a model
+    change never serves stale vectors. Vectors are
+    stored as raw float16 (or float32) bytes, ~1KB per 512-dim CLIP vector
+    instead of ~10KB of JSON.
+
+    Redis is optional; if it is missing or unreachable the cache degrades to
+    the LRU alone and retries Redis after REDIS_RETRY_SECONDS.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        max_items: int = 10000,
+        redis_client=None,
+        ttl_seconds: int = 30 * 24 * 3600,
+        dtype: str = "float16",
+        prefix: str = "emb",
+        lowercase: bool = False,
+    ):
+        self.model_name = model_name
+        self.max_items = max_items
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.dtype = np.dtype(dtype)
+        self.prefix = f"{prefix}:{model_name}:{self.dtype.name}"
+        self.lowercase = lowercase
+
+        self._lru: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis_down_until = 0.0
+
+        self.local_hits = 0
+        self.remote_hits = 0
+        self.misses = 0
+
+    def text_key(self, text: str) -> str:
+        # Case is part of the input for cased models (e5); separate tags keep the two key spaces apart
+        if self.lowercase:
+            return "t:" + hashlib.sha256(" ".join(text.lower().split()).encode("utf-8")).hexdigest()
+        return "tc:" + hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def image_key(data: bytes) -> str:
+        return "i:" + hashlib.sha256(data).hexdigest()
+
+    def _encode(self, vector) -> bytes:
+        return np.asarray(vector, dtype=self.dtype).tobytes()
+
+    def _decode(self, blob: bytes) -> List[float]:
+        return np.frombuffer(blob, dtype=self.dtype).astype(np.float32).tolist()
+
+    def _remember(self, key: str, blob: bytes):
+        with self._lock:
+            self._lru[key] = blob
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_items:
+                self._lru.popitem(last=False)
+
+    @property
+    def remote_available(self) -> bool:
+        return self.redis is not None and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, e: Exception):
+        logger.warning(f"Embedding cache: Redis unavailable ({e}), using in-process cache only for {REDIS_RETRY_SECONDS}s")
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    def get_local(self, key: str) -> Optional[List[float]]:
+        """LRU lookup only (never blocks on I/O); counts hits, not misses"""
+        with self._lock:
+            blob = self._lru.get(key)
+            if blob is None:
+                return None
+            self._lru.move_to_end(key)
+            self.local_hits += 1
+        return self._decode(blob)
+
+    def get(self, key: str, remote: bool = True) -> Optional[List[float]]:
+        """LRU, then Redis (promoting hits into the LRU)"""
+        vector = self.get_local(key)
+        if vector is not None:
+            return vector
+
+        if remote and self.remote_available:
+            try:
+                blob = self.redis.get(f"{self.prefix}:{key}")
+            except Exception as e:
+                self._redis_failed(e)
+                blob = None
+            if blob is not None:
+                self._remember(key, blob)
+                self.remote_hits += 1
+                return self._decode(blob)
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, vector):
+        blob = self._encode(vector)
+        self._remember(key, blob)
+        if self.remote_available:
+            try:
+                self.redis.setex(f"{self.prefix}:{key}", self.ttl_seconds, blob)
+            except Exception as e:
+                self._redis_failed(e)
+
+    def stats(self) -> dict:
+        lookups = self.local_hits + self.remote_hits + self.misses
+        return {
+            "model": self.model_name,
+            "dtype": self.dtype.name,
+            "items": len(self._lru),
+            "max_items": self.max_items,
+            "redis": self.redis is not None,
+            "local_hits": self.local_hits,
+            "remote_hits": self.remote_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.local_hits + self.remote_hits) / lookups, 3) if lookups else None,
+        }
+
+
+def binary_redis_client():
+    """Redis client for byte values (the shared one in app.utils.caching decodes to str)"""
+    import redis
+    from app.utils.caching import REDIS_DB, REDIS_HOST, REDIS_PASSWORD, REDIS_PORT
+
+    return redis.Redis(
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+        db=REDIS_DB,
+        password=REDIS_PASSWORD,
+        decode_responses=False,
+        socket_timeout=0.5,
+        socket_connect_timeout=0.5,
+    )
@@ -1,30 +1,155 @@
-from transformers import CLIPProcessor, CLIPModel
-from PIL import Image
-import torch
+import asyncio
+import io
+import threading
+from typing import List, Optional
+
+from app.ai.batching import MicroBatcher
+from app.ai.embedding_backends import EmbeddingBackend, ImageInput, get_backend
+from app.ai.embedding_cache import EmbeddingCache, binary_redis_client
+from app.ai.inference_pool import embed_images_task, embed_texts_task, get_inference_pool
+from app.config import settings
+
 
 class EmbeddingService:
-    def __init__(self):
-        self.model = None
-        self.processor = None
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+    """
+    Embeds search input and catalog content with the configured backends
+
+    The text and image backends are chosen per collection in config
+    (QDRANT_TEXT_BACKEND / QDRANT_IMAGE_BACKEND); models load lazily.
+    """
+
+    def __init__(self, text_backend: Optional[str] = None, image_backend: Optional[str] = None):
+        self.text_backend: EmbeddingBackend = get_backend(text_backend or settings.QDRANT_TEXT_BACKEND)
+        self.image_backend: EmbeddingBackend = get_backend(image_backend or settings.QDRANT_IMAGE_BACKEND)
+        if not self.image_backend.supports_images:
+            raise ValueError(f"Embedding backend {self.image_backend.name} cannot embed images")
+
+        self._text_batcher = None
+        self._image_batcher = None
+        self.text_cache = self._make_cache(self.text_backend)
+        self.image_cache = self.text_cache if self.image_backend is self.text_backend else self._make_cache(self.image_backend)
+
+    @staticmethod
+    def _make_cache(backend: EmbeddingBackend) -> Optional[EmbeddingCache]:
+        if settings.EMBEDDING_CACHE_SIZE <= 0:
+            return None
+        return EmbeddingCache(
+            backend.name,
+            max_items=settings.EMBEDDING_CACHE_SIZE,
+            redis_client=binary_redis_client() if settings.EMBEDDING_CACHE_REDIS else None,
+            ttl_seconds=settings.EMBEDDING_CACHE_TTL_S,
+            dtype=settings.EMBEDDING_CACHE_DTYPE,
+            lowercase=backend.uncased,
+        )
 
     def load_model(self):
-        if not self.model:
-            print("Loading AI Models (CLIP)...")
-            self.model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32").to(self.device)
-            self.processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
+        """Load both backends' models now instead of on the first embed"""
+        from app.ai.model_registry import model_registry
+        model_registry.warm({self.text_backend.registry_model, self.image_backend.registry_model})
+
+    def generate_text_embeddings(self, texts: List[str], input_type: str = "query") -> List[List[float]]:
+        """Embed several texts in one forward pass ("passage" for catalog documents)"""
+        return self.text_backend.embed_texts(texts, input_type)
+
+    def generate_image_embeddings(self, images: List[ImageInput]) -> List[List[float]]:
+        """Embed several images (paths or PIL images) in one forward pass"""
+        return self.image_backend.embed_images(images)
 
     def generate_text_embedding(self, text: str):
-        self.load_model()
-        inputs = self.processor(text=[text], return_tensors="pt", padding=True, truncation=True, max_length=77).to(self.device)
-        with torch.no_grad():
-            outputs = self.model.get_text_features(**inputs)
-        return outputs.cpu().numpy().flatten().tolist()
+        return self.generate_text_embeddings([text])[0]
 
     def generate_image_embedding(self, image_path: str):
-        self.load_model()
-        image = Image.open(image_path)
-        inputs = self.processor(images=image, return_tensors="pt").to(self.device)
-        with torch.no_grad():
-            outputs = self.model.get_image_features(**inputs)
-        return outputs.cpu().numpy().flatten().tolist()
+        return self.generate_image_embeddings([image_path])[0]
+
+    # Async API for request handlers: concurrent calls are micro-batched on a worker thread
+    # and the batch runs in the inference pool (or in-thread when the pool has no processes)
+
+    def _make_batcher(self, name: str, task, local_fn) -> MicroBatcher:
+        pool = get_inference_pool()
+        run_batch = (lambda items: pool.run_sync(task, items)) if pool.uses_processes else local_fn
+        return MicroBatcher(
+            run_batch,
+            max_batch_size=settings.EMBEDDING_BATCH_SIZE,
+            max_wait_ms=settings.EMBEDDING_MAX_WAIT_MS,
+            name=name,
+            max_pending=settings.EMBEDDING_BATCH_SIZE * settings.INFERENCE_MAX_PENDING,
+            retry_after=settings.INFERENCE_RETRY_AFTER_S,
+        )
+
+    @property
+    def text_batcher(self) -> MicroBatcher:
+        if self._text_batcher is None:
+            self._text_batcher = self._make_batcher(f"{self.text_backend.name}-text", embed_texts_task, self.generate_text_embeddings)
+        return self._text_batcher
+
+    @property
+    def image_batcher(self) -> MicroBatcher:
+        if self._image_batcher is None:
+            self._image_batcher = self._make_batcher(f"{self.image_backend.name}-image", embed_images_task, self.generate_image_embeddings)
+        return self._image_batcher
+
+    async def _cached(self, cache: EmbeddingCache, key: str) -> Optional[List[float]]:
+        if not cache.remote_available:
+            return cache.get(key, remote=False)
+        # Only go to a thread (Redis round-trip) on an LRU miss
+        vector = cache.get_local(key)
+        if vector is None:
+            vector = await asyncio.to_thread(cache.get, key)
+        return vector
+
+    async def _embed_cached(self, cache: Optional[EmbeddingCache], key: str, batcher: MicroBatcher, item) -> List[float]:
+        if cache is None:
+            return await batcher.submit_async(item)
+
+        vector = await self._cached(cache, key)
+        if vector is None:
+            vector = await batcher.submit_async(item)
+            if cache.remote_available:
+                await asyncio.to_thread(cache.put, key, vector)
+            else:
+                cache.put(key, vector)
+        return vector
+
+    async def embed_text(self, text: str) -> List[float]:
+        key = self.text_cache.text_key(text) if self.text_cache else None
+        return await self._embed_cached(self.text_cache, key, self.text_batcher, text)
+
+    async def embed_image(self, image: ImageInput) -> List[float]:
+        key = EmbeddingCache.image_key(_image_bytes(image)) if self.image_cache else None
+        return await self._embed_cached(self.image_cache, key, self.image_batcher, image)
+
+    def stats(self) -> dict:
+        caches = {self.text_cache, self.image_cache} - {None}
+        return {
+            "backends": {
+                "text": {"name": self.text_backend.name, "dim": self.text_backend.dim, "loaded": self.text_backend.loaded},
+                "image": {"name": self.image_backend.name, "dim": self.image_backend.dim, "loaded": self.image_backend.loaded},
+            },
+            "batchers": [b.stats() for b in (self._text_batcher, self._image_batcher) if b is not None],
+            "caches": [cache.stats() for cache in caches],
+        }
+
+
+def _image_bytes(image: ImageInput) -> bytes:
+    """Bytes that identify an image for the cache key"""
+    if isinstance(image, str):
+        with open(image, "rb") as f:
+            return f.read()
+    buffer = io.BytesIO()
+    buffer.write(f"{image.mode}:{image.size}:".encode())
+    buffer.write(image.tobytes())
+    return buffer.getvalue()
+
+
+_shared_service = None
+_shared_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Process-wide EmbeddingService, so all engines share one model and one batch queue"""
+    global _shared_service
+    if _shared_service is None:
+        with _shared_lock:
+            if _shared_service is None:
+                _shared_service = EmbeddingService()
+    return _shared_service
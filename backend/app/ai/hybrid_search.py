@@ -0,0 +1,302 @@
+"""
+Hybrid product search: part-number index + BM25 + Qdrant vectors
+
+Features:
+- Part-number fast path: queries that look like a part number
+  ("1041380", "WTB16P-24161120A00") are answered from an in-memory
+  exact/prefix index without touching the embedding model. Short codes
+  ("IP67", "M12", "24VDC", "PT100") are just as often spec terms, so unless
+  they hit a part number exactly their prefix matches are fused with the
+  vector search instead
+- BM25 lexical index over part number, name, category, vendor and specs
+- CLIP vector search in Qdrant for descriptive queries
+- Reciprocal-rank fusion (RRF) of the lexical and vector rankings
+- Indexes are built from scraped_products in a thread and rebuilt in the
+  background when older than `refresh_seconds`; queries keep using the
+  previous snapshot meanwhile
+"""
+
+import asyncio
+import bisect
+import logging
+import math
+import re
+import time
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.ai.catalog_indexer import product_payload
+from app.ai.inference_pool import InferenceBusy
+
+logger = logging.getLogger(__name__)
+
+RRF_K = 60
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+PART_NUMBER_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9\-./_]{3,}$")
+# Shorter part-number-like queries still get semantic search
+MIN_PREFIX_ONLY_LENGTH = 6
+
+
+def normalize_part_number(value: str) -> str:
+    """Case- and separator-insensitive form: 'wtb16p-2416' -> 'WTB16P2416'"""
+    return re.sub(r"[^A-Za-z0-9]", "", value or "").upper()
+
+
+def looks_like_part_number(query: str) -> bool:
+    query = query.strip()
+    return bool(PART_NUMBER_RE.match(query)) and any(c.isdigit() for c in query)
+
+
+def is_specific_part_number(query: str) -> bool:
+    """Long enough to be answered from the part-number index alone"""
+    return looks_like_part_number(query) and len(normalize_part_number(query)) >= MIN_PREFIX_ONLY_LENGTH
+
+
+def payload_matches(payload: dict, filters: Optional[Dict[str, Any]]) -> bool:
+    """Same semantics as qdrant_client.build_filter: every field must match (list = any of)"""
+    for key, value in (filters or {}).items():
+        if isinstance(value, (list, tuple, set)):
+            if payload.get(key) not in value:
+                return False
+        elif payload.get(key) != value:
+            return False
+    return True
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall((text or "").lower())
+
+
+class PartNumberIndex:
+    """Sorted normalized part numbers for exact and prefix lookups"""
+
+    def __init__(self, entries: List[Tuple[str, int]]):
+        self._keys: List[str] = []
+        self._ids: List[int] = []
+        for key, doc_id in sorted((normalize_part_number(pn), doc_id) for pn, doc_id in entries if pn):
+            self._keys.append(key)
+            self._ids.append(doc_id)
+
+    def exact(self, part_number: str) -> List[int]:
+        key = normalize_part_number(part_number)
+        start = bisect.bisect_left(self._keys, key)
+        end = bisect.bisect_right(self._keys, key)
+        return self._ids[start:end]
+
+    def prefix(self, part_number: str, limit: int = 10, accept: Optional[Callable[[int], bool]] = None) -> List[int]:
+        key = normalize_part_number(part_number)
+        if not key:
+            return []
+        ids = []
+        for i in range(bisect.bisect_left(self._keys, key), len(self._keys)):
+            if not self._keys[i].startswith(key) or len(ids) >= limit:
+                break
+            if accept is None or accept(self._ids[i]):
+                ids.append(self._ids[i])
+        return ids
+
+
+class BM25Index:
+    """Okapi BM25 over an in-memory inverted index"""
+
+    def __init__(self, documents: List[Tuple[int, str]], k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._lengths: Dict[int, int] = {}
+        for doc_id, text in documents:
+            tokens = tokenize(text)
+            self._lengths[doc_id] = len(tokens)
+            for token, tf in Counter(tokens).items():
+                self._postings[token].append((doc_id, tf))
+        self._avg_length = (sum(self._lengths.values()) / len(self._lengths)) if self._lengths else 0.0
+        self._avg_length = self._avg_length or 1.0
+
+    def search(self, query: str, limit: int = 10, accept: Optional[Callable[[int], bool]] = None) -> List[Tuple[int, float]]:
+        n_docs = len(self._lengths)
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(tokenize(query)):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / self._avg_length)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        if accept is not None:
+            ranked = [item for item in ranked if accept(item[0])]
+        return ranked[:limit]
+
+
+def reciprocal_rank_fusion(rankings: Dict[str, List[int]], k: int = RRF_K) -> List[Tuple[int, float, List[str]]]:
+    """Fuse ranked id lists: score = sum(1 / (k + rank)); returns (id, score, sources)"""
+    scores: Dict[int, float] = defaultdict(float)
+    sources: Dict[int, List[str]] = defaultdict(list)
+    for source, ids in rankings.items():
+        for rank, doc_id in enumerate(ids, start=1):
+            scores[doc_id] += 1.0 / (k + rank)
+            sources[doc_id].append(source)
+    return [(doc_id, score, sources[doc_id]) for doc_id, score in sorted(scores.items(), key=lambda item: item[1], reverse=True)]
+
+
+def lexical_text(payload: dict, specifications: Optional[dict]) -> str:
+    fields = [payload.get('part_number'), payload.get('product_name'), payload.get('category'), payload.get('vendor_name')]
+    for key, value in (specifications or {}).items():
+        fields.append(f"{key} {value}")
+    return " ".join(str(field) for field in fields if field)
+
+
+class CatalogSnapshot:
+    """Immutable in-memory indexes over the scraped catalog"""
+
+    def __init__(self, payloads: Dict[int, dict], lexical_docs: List[Tuple[int, str]]):
+        self.payloads = payloads
+        self.part_numbers = PartNumberIndex([(p['part_number'], doc_id) for doc_id, p in payloads.items()])
+        self.bm25 = BM25Index(lexical_docs)
+        self.built_at = time.monotonic()
+
+    @classmethod
+    def from_database(cls) -> "CatalogSnapshot":
+        from app.database import SessionLocal
+        from app.models.scraper import ScrapedProduct
+
+        db = SessionLocal()
+        try:
+            payloads, docs = {}, []
+            for product in db.query(ScrapedProduct).yield_per(1000):
+                payload = product_payload(product)
+                payloads[product.id] = payload
+                docs.append((product.id, lexical_text(payload, product.specifications)))
+            return cls(payloads, docs)
+        finally:
+            db.close()
+
+
+class HybridSearchEngine:
+    """
+    Part-number fast path, then BM25 + vector search fused with RRF
+
+    Args:
+        text_search: TextSearchEngine used for the vector leg
+        refresh_seconds: Rebuild the in-memory indexes when older than this
+        candidates: Results taken from each leg before fusion
+    """
+
+    def __init__(self, text_search, refresh_seconds: int = 300, candidates: int = 50):
+        self.text_search = text_search
+        self.refresh_seconds = refresh_seconds
+        self.candidates = candidates
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._building: Optional[asyncio.Task] = None
+        self.strategy_counts: Counter = Counter()
+
+    async def _build(self) -> CatalogSnapshot:
+        started = time.monotonic()
+        try:
+            snapshot = await asyncio.to_thread(CatalogSnapshot.from_database)
+        except Exception as e:
+            logger.error(f"Hybrid search: index build failed: {e}", exc_info=True)
+            if self._snapshot is None:
+                raise
+            return self._snapshot  # Keep serving the previous snapshot
+        self._snapshot = snapshot
+        logger.info(f"Hybrid search: indexed {len(snapshot.payloads)} products in {time.monotonic() - started:.1f}s")
+        return snapshot
+
+    async def snapshot(self) -> CatalogSnapshot:
+        if self._building is None or self._building.done():
+            stale = self._snapshot is None or time.monotonic() - self._snapshot.built_at > self.refresh_seconds
+            if stale:
+                self._building = asyncio.create_task(self._build())
+        if self._snapshot is None:
+            # First query: nothing to serve yet, wait for the build
+            return await asyncio.shield(self._building)
+        return self._snapshot
+
+    def _result(self, snapshot: CatalogSnapshot, doc_id: int, score: float, sources: List[str], payload: Optional[dict] = None) -> dict:
+        return {
+            "id": doc_id,
+            "score": score,
+            "payload": payload or snapshot.payloads.get(doc_id, {}),
+            "sources": sources,
+        }
+
+    async def _vector_ranking(self, query: str, **search_options) -> Tuple[List[int], Dict[int, dict]]:
+        hits = await self.text_search.search_by_description(query, top_k=self.candidates, **search_options)
+        ids, payloads = [], {}
+        for hit in hits:
+            ids.append(hit.id)
+            payloads[hit.id] = hit.payload or {}
+        return ids, payloads
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        hnsw_ef: Optional[int] = None,
+        exact: bool = False,
+    ) -> dict:
+        """
+        Args:
+            filters: Payload filters (vendor_name, category, manufacturer) applied to every leg
+            hnsw_ef / exact: Passed to the Qdrant vector search
+        """
+        started = time.perf_counter()
+        query = query.strip()
+        snapshot = await self.snapshot()
+        accept = None
+        if filters:
+            accept = lambda doc_id: payload_matches(snapshot.payloads.get(doc_id, {}), filters)  # noqa: E731
+
+        if looks_like_part_number(query):
+            exact_ids = [doc_id for doc_id in snapshot.part_numbers.exact(query) if accept is None or accept(doc_id)]
+            if exact_ids:
+                return self._finish("part_number_exact", started, [
+                    self._result(snapshot, doc_id, 1.0, ["part_number"]) for doc_id in exact_ids[:limit]
+                ])
+
+        rankings = {"lexical": [doc_id for doc_id, _ in snapshot.bm25.search(query, self.candidates, accept)]}
+        vector_payloads: Dict[int, dict] = {}
+
+        if looks_like_part_number(query):
+            rankings["part_number"] = snapshot.part_numbers.prefix(query, self.candidates, accept)
+
+        if is_specific_part_number(query):
+            # Partial part number: prefix matches + lexical, no model needed
+            strategy = "part_number_prefix"
+        else:
+            strategy = "hybrid"
+            try:
+                rankings["vector"], vector_payloads = await self._vector_ranking(
+                    query, filters=filters, hnsw_ef=hnsw_ef, exact=exact
+                )
+            except InferenceBusy:
+                if not rankings["lexical"]:
+                    raise
+                strategy = "lexical_only"
+            except Exception as e:
+                logger.warning(f"Hybrid search: vector leg failed, using lexical only: {e}")
+                strategy = "lexical_only"
+
+        fused = reciprocal_rank_fusion(rankings)[:limit]
+        return self._finish(strategy, started, [
+            self._result(snapshot, doc_id, score, sources, vector_payloads.get(doc_id))
+            for doc_id, score, sources in fused
+        ])
+
+    def _finish(self, strategy: str, started: float, results: List[dict]) -> dict:
+        self.strategy_counts[strategy] += 1
+        return {
+            "results": results,
+            "strategy": strategy,
+            "took_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "indexed_products": len(self._snapshot.payloads) if self._snapshot else 0,
+            "index_age_s": round(time.monotonic() - self._snapshot.built_at, 1) if self._snapshot else None,
+            "strategies": dict(self.strategy_counts),
+        }
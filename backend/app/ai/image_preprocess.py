@@ -0,0 +1,109 @@
+"""
+One-pass preprocessing of uploaded images for the vision pipeline
+
+The upload is decoded once and every stage gets a view sized for its model:
+- CLIP: shortest side 224 px (what the CLIP processor resizes to anyway)
+- OCR: RGB array with the long edge bounded (EasyOCR time grows with pixels;
+  nameplate text stays readable at ~1600 px)
+- LLM: compressed JPEG, base64-encoded for the Ollama payload
+- dHash: 64-bit perceptual hash for the near-duplicate result cache
+
+Phone photos are rotated per their EXIF orientation first, so OCR does not
+read sideways text. Large JPEGs are decoded at a reduced DCT scale (PIL
+draft mode), which skips most of the decode work for 12 MP photos.
+"""
+
+import base64
+import io
+import math
+from dataclasses import dataclass
+from typing import Tuple, Union
+
+import numpy as np
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+CLIP_SIZE = 224
+EXIF_ORIENTATION = 0x0112
+
+
+@dataclass
+class PreparedImage:
+    clip: Image.Image
+    ocr: np.ndarray
+    llm_jpeg_b64: str
+    original_size: Tuple[int, int]
+    dhash: int = 0
+
+    def stats(self) -> dict:
+        return {
+            "original": list(self.original_size),
+            "clip": list(self.clip.size),
+            "ocr": [self.ocr.shape[1], self.ocr.shape[0]],
+            "llm_jpeg_kb": round(len(self.llm_jpeg_b64) * 3 / 4 / 1024, 1),
+        }
+
+
+def dhash(image: Image.Image, size: int = 8) -> int:
+    """Difference hash: each bit says whether a pixel is brighter than its right neighbour"""
+    pixels = np.asarray(image.convert("L").resize((size + 1, size), Image.LANCZOS), dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+def _fit(image: Image.Image, max_side: int) -> Image.Image:
+    if max(image.size) <= max_side:
+        return image
+    view = image.copy()
+    view.thumbnail((max_side, max_side), Image.LANCZOS)
+    return view
+
+
+def _shortest_side(image: Image.Image, size: int) -> Image.Image:
+    width, height = image.size
+    scale = size / min(width, height)
+    if scale >= 1:
+        return image
+    return image.resize((max(size, round(width * scale)), max(size, round(height * scale))), Image.BICUBIC)
+
+
+def prepare_image(
+    source: Union[str, bytes],
+    ocr_max_side: int = 1600,
+    llm_max_side: int = 1024,
+    llm_jpeg_quality: int = 85,
+) -> PreparedImage:
+    """
+    Decode an image (path or bytes) once and build the per-model views
+
+    Raises:
+        PIL.UnidentifiedImageError: not an image, or truncated / corrupt image data
+    """
+    image = Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+    width, height = image.size
+    try:
+        # EXIF orientations 5-8 are rotated by 90 degrees
+        original_size = (height, width) if image.getexif().get(EXIF_ORIENTATION, 1) in (5, 6, 7, 8) else (width, height)
+
+        # JPEG only: decode at the smallest 1/2^n scale still larger than every view
+        largest_view = max(ocr_max_side, llm_max_side)
+        if max(width, height) > largest_view:
+            ratio = largest_view / max(width, height)
+            image.draft("RGB", (math.ceil(width * ratio), math.ceil(height * ratio)))
+        # Pixel data is only decoded here; a truncated upload fails with a plain OSError
+        image = ImageOps.exif_transpose(image).convert("RGB")
+    except OSError as e:
+        raise UnidentifiedImageError(f"Cannot decode image: {e}") from e
+
+    ocr_view = _fit(image, ocr_max_side)
+    llm_view = _fit(ocr_view, llm_max_side)
+    buffer = io.BytesIO()
+    llm_view.save(buffer, format="JPEG", quality=llm_jpeg_quality, optimize=True)
+
+    clip_view = _shortest_side(image, CLIP_SIZE)
+    return PreparedImage(
+        clip=clip_view,
+        ocr=np.asarray(ocr_view),
+        llm_jpeg_b64=base64.b64encode(buffer.getvalue()).decode("ascii"),
+        original_size=original_size,
+        dhash=dhash(clip_view),
+    )
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Union
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceBusy(Exception):
+    """Raised when the inference queue is full; the API turns it into 503 + Retry-After"""
+
+    def __init__(self, retry_after: int, detail: str = "Inference capacity exhausted, retry later"):
+        super().__init__(detail)
+        self.retry_after = retry_after
+        self.detail = detail
+
+
+def _init_worker(preload: List[str]):
+    from app.ai.model_registry import model_registry
+
+    logging.basicConfig(level=logging.INFO)
+    model_registry.warm(preload)
+
+
+def _ping() -> bool:
+    return True
+
+
+# --- Tasks (module-level so they pickle) --------------------------------------
+
+def embed_texts_task(texts: List[str], input_type: str = "query") -> List[List[float]]:
+    from app.ai.embeddings import get_embedding_service
+    return get_embedding_service().generate_text_embeddings(texts, input_type)
+
+
+def embed_images_task(images: list) -> List[List[float]]:
+    from app.ai.embeddings import get_embedding_service
+    return get_embedding_service().generate_image_embeddings(images)
+
+
+def ocr_task(image) -> str:
+    from app.ai.model_registry import model_registry
+    return " ".join(model_registry.get("ocr").readtext(image, detail=0))
+
+
+def transcribe_task(audio: Union[str, bytes], language: Optional[str] = None, suffix: str = "") -> dict:
+    from app.ai.voice_processor import VoiceProcessor
+    return VoiceProcessor().transcribe(audio, language, suffix)
+
+
+def model_stats_task() -> dict:
+    from app.ai.model_registry import model_registry
+    return model_registry.stats()
+
+
+# --- Pool ---------------------------------------------------------------------
+
+class InferencePool:
+    """
+    Runs CPU-bound model work off the event loop
+
+    Args:
+        workers: Worker processes, each with its own preloaded models.
+            0 runs tasks on a thread pool in this process instead (dev, tiny hosts).
+        max_pending: Tasks queued or running before new ones are rejected with InferenceBusy
+        preload: Model registry entries each worker loads at start ("clip", "e5", "ocr", "faster-whisper", ...)
+        retry_after: Seconds suggested to rejected clients
+    """
+
+    def __init__(self, workers: int = 1, max_pending: int = 8, preload: Optional[List[str]] = None, retry_after: int = 5):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.preload = preload or []
+        self.retry_after = retry_after
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def uses_processes(self) -> bool:
+        return self.workers > 0
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.uses_processes:
+                        # spawn: forking a process that already imported torch is unsafe
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.workers,
+                            mp_context=multiprocessing.get_context("spawn"),
+                            initializer=_init_worker,
+                            initargs=(self.preload,),
+                        )
+                    else:
+                        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="inference")
+        return self._executor
+
+    def _reserve(self):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise InferenceBusy(self.retry_after)
+            self._pending += 1
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Queue a task; raises InferenceBusy when the queue is full"""
+        self._reserve()
+        try:
+            future = self.executor.submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn: Callable, *args) -> Any:
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def run_sync(self, fn: Callable, *args) -> Any:
+        """Blocking variant for worker threads (e.g. embedding batchers)"""
+        return self.submit(fn, *args).result()
+
+    def start(self):
+        """Spawn the workers (or warm this process in thread mode) so models are loaded before the first request"""
+        if self.uses_processes:
+            self.executor.submit(_ping).result()
+            logger.info(f"Inference pool started: {self.workers} worker(s), preloaded {self.preload}")
+        else:
+            from app.ai.model_registry import model_registry
+            model_registry.warm(self.preload)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "mode": "process" if self.uses_processes else "thread",
+            "workers": self.workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+def _preload_models(spec: str) -> List[str]:
+    """
+    Registry names from INFERENCE_PRELOAD; "embeddings" means the configured
+    embedding backends, "transcription" the configured speech-to-text backend
+    """
+    from app.ai.embedding_backends import get_backend
+    from app.ai.transcription_backends import get_transcription_backend
+
+    names = []
+    for name in (part.strip() for part in spec.split(",")):
+        if name == "embeddings":
+            candidates = [get_backend(settings.QDRANT_TEXT_BACKEND).registry_model, get_backend(settings.QDRANT_IMAGE_BACKEND).registry_model]
+        elif name == "transcription":
+            candidates = [get_transcription_backend(settings.TRANSCRIPTION_BACKEND).registry_model]
+        else:
+            candidates = [name] if name else []
+        names.extend(c for c in candidates if c not in names)
+    return names
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_inference_pool() -> InferencePool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = InferencePool(
+                    workers=settings.INFERENCE_WORKERS,
+                    max_pending=settings.INFERENCE_MAX_PENDING,
+                    preload=_preload_models(settings.INFERENCE_PRELOAD),
+                    retry_after=settings.INFERENCE_RETRY_AFTER_S,
+                )
+    return _pool
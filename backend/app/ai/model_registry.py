@@ -0,0 +1,129 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of heavy models
+
+    Each model is loaded once per process on first use (or on warm()), and its
+    load time and RSS growth are recorded so /api/search/stats can show what
+    every model costs. Loads of different models can run in parallel; loads of
+    the same model are serialized.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._stats: Dict[str, dict] = {}
+        self._registry_lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        with self._registry_lock:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def get(self, name: str) -> Any:
+        if name in self._models:
+            return self._models[name]
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model: {name}")
+
+        with self._locks[name]:
+            if name not in self._models:
+                process = psutil.Process()
+                rss_before = process.memory_info().rss
+                started = time.perf_counter()
+                logger.info(f"Loading model '{name}'...")
+
+                self._models[name] = self._loaders[name]()
+
+                load_seconds = time.perf_counter() - started
+                rss_delta_mb = (process.memory_info().rss - rss_before) / 1_048_576
+                self._stats[name] = {
+                    "load_seconds": round(load_seconds, 2),
+                    "rss_delta_mb": round(rss_delta_mb, 1),
+                    "loaded_at": time.time(),
+                }
+                logger.info(f"Loaded model '{name}' in {load_seconds:.1f}s (+{rss_delta_mb:.0f}MB RSS)")
+        return self._models[name]
+
+    def warm(self, names: Iterable[str]):
+        """Load the given models now; failures are logged and retried lazily on first use"""
+        for name in names:
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.error(f"Failed to warm model '{name}': {e}")
+
+    def stats(self) -> dict:
+        return {
+            "process_rss_mb": round(psutil.Process().memory_info().rss / 1_048_576, 1),
+            "models": {
+                name: {"loaded": name in self._models, **self._stats.get(name, {})}
+                for name in self._loaders
+            },
+        }
+
+
+def _load_clip():
+    import torch
+    from transformers import CLIPModel, CLIPProcessor
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
+    model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32").to(device)
+    model.eval()
+    return model, processor
+
+
+def _load_easyocr():
+    import easyocr
+    return easyocr.Reader(['en', 'ar'], gpu=False)  # GPU=False for VPS compatibility
+
+
+def _load_whisper():
+    import whisper
+    # Use 'base' for balance of speed/accuracy
+    return whisper.load_model("base")
+
+
+def _load_faster_whisper():
+    from faster_whisper import WhisperModel
+
+    from app.config import settings
+    return WhisperModel(
+        settings.WHISPER_MODEL_SIZE,
+        device="cpu",
+        compute_type=settings.WHISPER_COMPUTE_TYPE,
+        cpu_threads=settings.WHISPER_CPU_THREADS or psutil.cpu_count(logical=False) or 0,
+    )
+
+
+def _load_clip_onnx():
+    from app.ai.onnx_clip import load_onnx_clip
+    return load_onnx_clip()
+
+
+def _load_e5():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer('intfloat/multilingual-e5-large')
+
+
+model_registry = ModelRegistry()
+model_registry.register("clip", _load_clip)
+model_registry.register("clip-onnx", _load_clip_onnx)
+model_registry.register("ocr", _load_easyocr)
+model_registry.register("whisper", _load_whisper)
+model_registry.register("faster-whisper", _load_faster_whisper)
+model_registry.register("e5", _load_e5)
@@ -0,0 +1,33 @@
+"""
+Shared async HTTP client for Ollama
+
+One pooled httpx.AsyncClient per process: requests reuse keep-alive
+connections instead of opening a socket per call, and never block the
+event loop. Created lazily on first use, closed by the app lifespan.
+"""
+
+from typing import Optional
+
+import httpx
+
+from app.config import settings
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_ollama_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            base_url=settings.OLLAMA_HOST,
+            timeout=httpx.Timeout(settings.OLLAMA_TIMEOUT_S, connect=5.0),
+            limits=httpx.Limits(max_connections=settings.OLLAMA_MAX_CONNECTIONS, max_keepalive_connections=settings.OLLAMA_MAX_CONNECTIONS),
+        )
+    return _client
+
+
+async def close_ollama_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
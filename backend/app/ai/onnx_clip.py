@@ -0,0 +1,206 @@
+"""
+CLIP on ONNX Runtime for CPU-only hosts
+
+Features:
+- Exports the CLIP text and vision towers (projection included) to two ONNX
+  graphs with dynamic batch / sequence axes
+- Optional dynamic int8 quantization of the MatMul/Gemm weights (~4x smaller
+  towers, faster on AVX2/AVX512-VNNI CPUs); the patch-embedding conv stays fp32
+- Sessions pinned to the physical cores, with full graph optimizations
+- The CLIP processor is saved next to the graphs, so serving needs neither
+  PyTorch nor the Hugging Face hub once exported
+
+Vectors match the PyTorch backend (cosine ~1.0 for fp32, >0.99 for int8 on
+the real model), so both can share the same Qdrant collections.
+
+Export once (from backend/):
+    python -c "from app.ai.onnx_clip import export_pretrained; export_pretrained()"
+otherwise the first load exports automatically.
+"""
+
+import inspect
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CLIP_MODEL_ID = "openai/clip-vit-base-patch32"
+TEXT_GRAPH = "text"
+VISION_GRAPH = "vision"
+OPSET = 17
+
+
+def graph_path(model_dir: str, tower: str, quantized: bool) -> Path:
+    return Path(model_dir) / f"{tower}{'_int8' if quantized else ''}.onnx"
+
+
+def clip_features(output):
+    """get_*_features returns a tensor up to transformers 4.x, a model output (projected pooler_output) from 5.x"""
+    return getattr(output, "pooler_output", output)
+
+
+def _onnx_export(module, args: tuple, path: Path, input_names: list, dynamic_axes: dict):
+    import torch
+
+    options = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        options["dynamo"] = False  # TorchScript exporter: no onnxscript dependency
+    torch.onnx.export(
+        module,
+        args,
+        str(path),
+        input_names=input_names,
+        output_names=["embeddings"],
+        dynamic_axes={**dynamic_axes, "embeddings": {0: "batch"}},
+        opset_version=OPSET,
+        do_constant_folding=True,
+        **options,
+    )
+
+
+def export_towers(model, model_dir: str, quantize: bool = True) -> Dict[str, Path]:
+    """
+    Export a transformers CLIPModel's towers to `model_dir`
+
+    Args:
+        model: CLIPModel (any size; tests use a tiny random one)
+        quantize: Also write the int8 variants (text_int8.onnx / vision_int8.onnx)
+
+    Returns:
+        Graph paths by name ("text", "vision", "text_int8", "vision_int8")
+    """
+    import torch
+
+    class TextTower(torch.nn.Module):
+        def __init__(self, clip):
+            super().__init__()
+            self.clip = clip
+
+        def forward(self, input_ids, attention_mask):
+            return clip_features(self.clip.get_text_features(input_ids=input_ids, attention_mask=attention_mask))
+
+    class VisionTower(torch.nn.Module):
+        def __init__(self, clip):
+            super().__init__()
+            self.clip = clip
+
+        def forward(self, pixel_values):
+            return clip_features(self.clip.get_image_features(pixel_values=pixel_values))
+
+    Path(model_dir).mkdir(parents=True, exist_ok=True)
+    model = model.cpu().eval()
+    config = model.config
+    seq_len = min(8, config.text_config.max_position_embeddings)
+    image_size = config.vision_config.image_size
+
+    # Keep real EOS ids in the dummy input: CLIP pools the text tower at the EOS position
+    input_ids = torch.randint(1, max(2, config.text_config.vocab_size - 1), (2, seq_len))
+    input_ids[:, -1] = config.text_config.vocab_size - 1
+    attention_mask = torch.ones_like(input_ids)
+    pixel_values = torch.randn(2, 3, image_size, image_size)
+
+    paths = {TEXT_GRAPH: graph_path(model_dir, TEXT_GRAPH, False), VISION_GRAPH: graph_path(model_dir, VISION_GRAPH, False)}
+    with torch.no_grad():
+        _onnx_export(
+            TextTower(model), (input_ids, attention_mask), paths[TEXT_GRAPH],
+            ["input_ids", "attention_mask"],
+            {"input_ids": {0: "batch", 1: "sequence"}, "attention_mask": {0: "batch", 1: "sequence"}},
+        )
+        _onnx_export(
+            VisionTower(model), (pixel_values,), paths[VISION_GRAPH],
+            ["pixel_values"], {"pixel_values": {0: "batch"}},
+        )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        for tower in (TEXT_GRAPH, VISION_GRAPH):
+            quantized = graph_path(model_dir, tower, True)
+            quantize_dynamic(
+                str(paths[tower]), str(quantized),
+                weight_type=QuantType.QInt8,
+                op_types_to_quantize=["MatMul", "Gemm"],
+            )
+            paths[f"{tower}_int8"] = quantized
+
+    logger.info(f"Exported CLIP towers to {model_dir}: {', '.join(paths)}")
+    return paths
+
+
+def export_pretrained(model_dir: Optional[str] = None, model_id: str = CLIP_MODEL_ID, quantize: bool = True) -> Dict[str, Path]:
+    """Download `model_id`, export its towers and save the processor alongside"""
+    from transformers import CLIPModel, CLIPProcessor
+
+    from app.config import settings
+
+    model_dir = model_dir or settings.ONNX_CLIP_DIR
+    paths = export_towers(CLIPModel.from_pretrained(model_id), model_dir, quantize=quantize)
+    CLIPProcessor.from_pretrained(model_id).save_pretrained(model_dir)
+    return paths
+
+
+def session_options(intra_op_threads: int = 0):
+    """
+    Args:
+        intra_op_threads: Threads per operator; 0 = physical cores (hyper-threads
+            only add contention for dense GEMMs)
+    """
+    import onnxruntime as ort
+    import psutil
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = intra_op_threads or psutil.cpu_count(logical=False) or os.cpu_count() or 1
+    # Batches already arrive whole from the micro-batcher; one op at a time
+    options.inter_op_num_threads = 1
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return options
+
+
+def load_session(path: Path, intra_op_threads: int = 0):
+    import onnxruntime as ort
+    return ort.InferenceSession(str(path), sess_options=session_options(intra_op_threads), providers=["CPUExecutionProvider"])
+
+
+class OnnxClip:
+    """Text and vision ONNX sessions plus the CLIP processor"""
+
+    def __init__(self, model_dir: str, quantized: bool = True, intra_op_threads: int = 0, processor=None):
+        self.model_dir = model_dir
+        self.quantized = quantized
+        self.text_session = load_session(graph_path(model_dir, TEXT_GRAPH, quantized), intra_op_threads)
+        self.vision_session = load_session(graph_path(model_dir, VISION_GRAPH, quantized), intra_op_threads)
+        self.processor = processor
+
+    def text_features(self, input_ids: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        return self.text_session.run(None, {
+            "input_ids": input_ids.astype(np.int64),
+            "attention_mask": attention_mask.astype(np.int64),
+        })[0]
+
+    def image_features(self, pixel_values: np.ndarray) -> np.ndarray:
+        return self.vision_session.run(None, {"pixel_values": pixel_values.astype(np.float32)})[0]
+
+
+def load_onnx_clip() -> OnnxClip:
+    """Model registry loader: exports on first use if the graphs are missing"""
+    from transformers import CLIPProcessor
+
+    from app.config import settings
+
+    model_dir = settings.ONNX_CLIP_DIR
+    quantized = settings.ONNX_CLIP_QUANTIZE
+    if not (graph_path(model_dir, TEXT_GRAPH, quantized).exists() and graph_path(model_dir, VISION_GRAPH, quantized).exists()):
+        logger.warning(f"No ONNX CLIP graphs in {model_dir}, exporting from {CLIP_MODEL_ID} (one-off, needs torch)")
+        export_pretrained(model_dir, quantize=quantized)
+
+    return OnnxClip(
+        model_dir,
+        quantized=quantized,
+        intra_op_threads=settings.ONNX_INTRA_OP_THREADS,
+        processor=CLIPProcessor.from_pretrained(model_dir),
+    )
@@ -1,43 +1,212 @@
+import time
+from typing import Any, Dict, Optional
+
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
+from app.ai.collection_profiles import PROFILES, CollectionProfile, get_profile
+from app.ai.embedding_backends import get_backend
 from app.config import settings
 
+# Keyword payload indexes; also the fields search filters may use
+PAYLOAD_INDEX_FIELDS = ("vendor_name", "category", "manufacturer")
+# How long the profile found behind an alias is trusted; a migration in another process repoints it
+PROFILE_CACHE_SECONDS = 300
+
+
+def build_filter(filters: Optional[Dict[str, Any]]) -> Optional[models.Filter]:
+    """{"vendor_name": "SICK AG", "category": ["A", "B"]} -> must-match Qdrant filter"""
+    if not filters:
+        return None
+    conditions = []
+    for key, value in filters.items():
+        if isinstance(value, (list, tuple, set)):
+            match = models.MatchAny(any=list(value))
+        else:
+            match = models.MatchValue(value=value)
+        conditions.append(models.FieldCondition(key=key, match=match))
+    return models.Filter(must=conditions)
+
+
 class QdrantManager:
     def __init__(self):
         host = settings.QDRANT_HOST.replace("http://", "").replace("https://", "")
         if ":" in host:
             host = host.split(":")[0]
         self.client = QdrantClient(host=host, port=settings.QDRANT_PORT)
+        # Public names; new installs make them aliases of versioned physical collections
         self.text_collection = "parts_text"
         self.image_collection = "parts_images"
+        # Profile for new collections; searches use the profile each live collection was built with
+        self.profile = get_profile(settings.QDRANT_COLLECTION_PROFILE)
+        self._collection_profiles: Dict[str, tuple] = {}  # name -> (profile, resolved_at)
+        # Vector size each collection must have, from its configured embedding backend
+        self.vector_sizes = {
+            self.text_collection: get_backend(settings.QDRANT_TEXT_BACKEND).dim,
+            self.image_collection: get_backend(settings.QDRANT_IMAGE_BACKEND).dim,
+        }
 
     def initialize_collections(self):
         try:
-            # Fetch all existing collections
-            existing_collections = self.client.get_collections().collections
-            existing_names = [c.name for c in existing_collections]
-            
-            # Create text collection if not exists
-            if self.text_collection not in existing_names:
-                self.client.create_collection(
-                    collection_name=self.text_collection,
-                    vectors_config=models.VectorParams(size=512, distance=models.Distance.COSINE),
-                )
-                print(f"Created collection: {self.text_collection}")
-            
-            # Create image collection if not exists
-            if self.image_collection not in existing_names:
-                self.client.create_collection(
-                    collection_name=self.image_collection,
-                    vectors_config=models.VectorParams(size=512, distance=models.Distance.COSINE),
-                )
-                print(f"Created collection: {self.image_collection}")
+            for name in (self.text_collection, self.image_collection):
+                if self.resolve_collection(name) is None:
+                    physical = self.create_physical_collection(name, self.profile, self.vector_sizes[name])
+                    self.swap_alias(name, physical)
+                    print(f"Created collection: {physical} (alias {name}, profile {self.profile.name})")
+                self.ensure_payload_indexes(name)
                 
         except Exception as e:
             print(f"Error initializing Qdrant collections: {e}")
 
+        # Outside the try: a model/collection mismatch must not be swallowed
+        self.validate_dimensions()
+
+    def validate_dimensions(self):
+        """Fail loudly when a collection was built with another embedding model"""
+        for name, expected in self.vector_sizes.items():
+            physical = self.resolve_collection(name)
+            if physical is None:
+                continue
+            actual = self.client.get_collection(physical).config.params.vectors.size
+            if actual != expected:
+                raise ValueError(
+                    f"Qdrant collection {name} has {actual}-dim vectors but its embedding backend produces "
+                    f"{expected}-dim ones; rebuild it with scripts/index_catalog.py --recreate"
+                )
+
+    def swap_alias(self, name: str, physical: str):
+        """Point alias `name` at `physical` in one atomic operation"""
+        self._collection_profiles.pop(name, None)
+        operations = []
+        if any(alias.alias_name == name for alias in self.client.get_aliases().aliases):
+            operations.append(models.DeleteAliasOperation(delete_alias=models.DeleteAlias(alias_name=name)))
+        operations.append(models.CreateAliasOperation(create_alias=models.CreateAlias(collection_name=physical, alias_name=name)))
+        self.client.update_collection_aliases(change_aliases_operations=operations)
+
+    def resolve_collection(self, name: str) -> Optional[str]:
+        """Physical collection behind `name` (an alias or a plain collection), or None"""
+        for alias in self.client.get_aliases().aliases:
+            if alias.alias_name == name:
+                return alias.collection_name
+        if name in {c.name for c in self.client.get_collections().collections}:
+            return name
+        return None
+
+    def collection_profile(self, name: str) -> CollectionProfile:
+        """
+        Profile the collection behind `name` was built with
+
+        Read from the `{name}_{profile}_{ts}` physical name, else (pre-alias
+        collections) from its quantization config. Falls back to the configured
+        profile if Qdrant can't be asked.
+        """
+        cached = self._collection_profiles.get(name)
+        if cached and time.monotonic() - cached[1] < PROFILE_CACHE_SECONDS:
+            return cached[0]
+        try:
+            profile = self._detect_profile(name)
+        except Exception as e:
+            print(f"Could not determine the profile of {name}, using {self.profile.name}: {e}")
+            return self.profile
+        self._collection_profiles[name] = (profile, time.monotonic())
+        return profile
+
+    def _detect_profile(self, name: str) -> CollectionProfile:
+        physical = self.resolve_collection(name)
+        if physical is None:
+            return self.profile
+        if physical.startswith(f"{name}_"):
+            profile_name = physical[len(name) + 1:].rsplit("_", 1)[0]
+            if profile_name in PROFILES:
+                return PROFILES[profile_name]
+
+        quantization = self.client.get_collection(physical).config.quantization_config
+        if isinstance(quantization, models.BinaryQuantization):
+            return PROFILES["binary"]
+        if isinstance(quantization, models.ScalarQuantization):
+            return PROFILES["int8"]
+        return PROFILES["default"]
+
+    def create_physical_collection(self, name: str, profile: CollectionProfile, size: int) -> str:
+        physical = f"{name}_{profile.name}_{int(time.time())}"
+        self.client.create_collection(
+            collection_name=physical,
+            vectors_config=profile.vector_params(size),
+            hnsw_config=profile.hnsw_config(),
+            quantization_config=profile.quantization_config(),
+            on_disk_payload=profile.vectors_on_disk,
+        )
+        return physical
+
+    def migrate_collection(self, name: str, profile: CollectionProfile, batch_size: int = 256, keep_old: bool = False) -> str:
+        """
+        Rebuild `name` with another profile while it stays searchable
+
+        Copies every point (vectors + payload) into a new physical collection,
+        then repoints the alias atomically. A pre-alias install (a plain
+        collection called `name`) is dropped and replaced by the alias in two
+        calls, a gap of milliseconds. Pause the catalog indexer meanwhile:
+        points written to the old collection during the copy are not carried over.
+
+        Returns:
+            Name of the new physical collection
+        """
+        old = self.resolve_collection(name)
+        if old is None:
+            raise ValueError(f"Collection {name} does not exist")
+
+        size = self.client.get_collection(old).config.params.vectors.size
+        new = self.create_physical_collection(name, profile, size)
+        self.ensure_payload_indexes(new)
+
+        copied = 0
+        offset = None
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=old, limit=batch_size, offset=offset, with_payload=True, with_vectors=True
+            )
+            if records:
+                self.client.upsert(
+                    collection_name=new,
+                    points=[models.PointStruct(id=r.id, vector=r.vector, payload=r.payload) for r in records],
+                    wait=True,
+                )
+                copied += len(records)
+            if offset is None:
+                break
+        print(f"Copied {copied} points {old} -> {new}")
+
+        self.replace_collection(name, old, new, keep_old)
+        print(f"Alias {name} -> {new} (profile {profile.name})")
+        return new
+
+    def replace_collection(self, name: str, old: str, new: str, keep_old: bool = False):
+        """Make `name` serve `new` instead of `old`"""
+        if old == name:
+            # Plain collection: the name must be freed before it can become an alias
+            self.client.delete_collection(old)
+            self.swap_alias(name, new)
+        else:
+            self.swap_alias(name, new)
+            if not keep_old:
+                self.client.delete_collection(old)
+
+    def ensure_payload_indexes(self, collection: str):
+        """Keyword indexes so filtered searches don't scan payloads"""
+        schema = self.client.get_collection(collection).payload_schema or {}
+        for field in PAYLOAD_INDEX_FIELDS:
+            if field not in schema:
+                self.client.create_payload_index(
+                    collection_name=collection,
+                    field_name=field,
+                    field_schema=models.PayloadSchemaType.KEYWORD,
+                )
+                print(f"Created payload index: {collection}.{field}")
+
+    def collection_name(self, collection_type: str = "text") -> str:
+        return self.text_collection if collection_type == "text" else self.image_collection
+
     def upsert_part_embedding(self, part_id: str, vector: list, metadata: dict, collection_type: str = "text"):
-        collection = self.text_collection if collection_type == "text" else self.image_collection
+        collection = self.collection_name(collection_type)
         self.client.upsert(
             collection_name=collection,
             points=[
@@ -49,10 +218,49 @@ class QdrantManager:
             ]
         )
 
-    def search_by_vector(self, vector: list, top_k: int = 10, collection_type: str = "text"):
-        collection = self.text_collection if collection_type == "text" else self.image_collection
+    def upsert_points(self, points: list, collection_type: str = "text", batch_size: int = 128, parallel: int = 1):
+        """Bulk upsert; `parallel` > 1 uploads batches from several processes"""
+        self.client.upload_points(
+            collection_name=self.collection_name(collection_type),
+            points=points,
+            batch_size=batch_size,
+            parallel=parallel,
+            wait=True,
+        )
+
+    def get_payloads(self, ids: list, collection_type: str = "text", fields: list = None) -> dict:
+        """Payloads of existing points by id (missing ids are omitted)"""
+        records = self.client.retrieve(
+            collection_name=self.collection_name(collection_type),
+            ids=ids,
+            with_payload=fields if fields else True,
+            with_vectors=False,
+        )
+        return {record.id: record.payload or {} for record in records}
+
+    def search_by_vector(
+        self,
+        vector: list,
+        top_k: int = 10,
+        collection_type: str = "text",
+        filters: Optional[Dict[str, Any]] = None,
+        hnsw_ef: Optional[int] = None,
+        exact: bool = False,
+    ):
+        """
+        Nearest neighbours, optionally restricted by payload filters
+
+        Args:
+            filters: Payload field -> value (or list of values)
+            hnsw_ef: Search-time HNSW beam width; higher is more accurate and slower
+            exact: Brute-force search, bypassing the HNSW index
+        """
+        collection = self.collection_name(collection_type)
         return self.client.search(
             collection_name=collection,
             query_vector=vector,
+            query_filter=build_filter(filters),
+            # Quantized profiles rescore oversampled candidates with the original vectors
+            search_params=self.collection_profile(collection).search_params(hnsw_ef, exact),
             limit=top_k
         )
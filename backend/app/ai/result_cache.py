@@ -0,0 +1,159 @@
+"""
+Result caches for the image and voice search pipelines
+
+Technicians re-upload the same nameplate photo or retry a voice query; a
+repeat should not rerun CLIP, OCR, Whisper and the vision LLM.
+
+- ResultCache: TTL + size-bounded LRU keyed by exact content hash
+  (voice: SHA-256 of the audio + language hint)
+- PerceptualResultCache: adds near-duplicate lookup by 64-bit dHash within a
+  Hamming distance, so a re-encoded, resized or recompressed copy of the
+  same photo still hits (vision)
+
+Both live in the API process and report hit rates for /api/search/stats.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+HASH_BITS = 64
+# Near-blank or flat images hash to (almost) all zeros or ones and would match each other
+MIN_INFORMATIVE_BITS = 8
+
+
+class ResultCache:
+    """
+    Args:
+        name: Label in stats
+        max_items: LRU bound; 0 disables the cache
+        ttl_seconds: Entries older than this are ignored and dropped
+    """
+
+    def __init__(self, name: str, max_items: int = 1000, ttl_seconds: int = 3600):
+        self.name = name
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_items > 0
+
+    def _alive(self, stored_at: float) -> bool:
+        return time.monotonic() - stored_at < self.ttl_seconds
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value, or None (counted as a miss)"""
+        entry = self._entries.get(key)
+        if entry is not None and self._alive(entry[0]):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        if entry is not None:
+            self._drop(key)
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, value: Any):
+        if not self.enabled:
+            return
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_items:
+            self._evict(next(iter(self._entries)))
+
+    def _drop(self, key: Hashable):
+        del self._entries[key]
+
+    def _evict(self, key: Hashable):
+        self._drop(key)
+        self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "items": len(self._entries),
+            "max_items": self.max_items,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+class PerceptualResultCache(ResultCache):
+    """
+    Exact hits by content hash, near-duplicate hits by dHash
+
+    Entries are keyed by (content_hash, scope); `scope` separates results that
+    depend on request options (e.g. payload filters). The dHash side is a
+    linear scan with popcount, well under a millisecond for a few thousand
+    entries.
+
+    Args:
+        max_distance: Max differing dHash bits for a near-duplicate hit (0 = exact dHash only)
+    """
+
+    def __init__(self, name: str, max_items: int = 1000, ttl_seconds: int = 3600, max_distance: int = 4):
+        super().__init__(name, max_items, ttl_seconds)
+        self.max_distance = max_distance
+        self._hashes: dict = {}  # key -> dHash
+        self.near_hits = 0
+
+    def get_exact(self, content_hash: str, scope: str = "") -> Optional[Any]:
+        """Lookup by content hash only; a miss is not counted (get_similar follows)"""
+        key = (content_hash, scope)
+        entry = self._entries.get(key)
+        if entry is None or not self._alive(entry[0]):
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def get_similar(self, dhash: int, scope: str = "") -> Tuple[Optional[Any], Optional[int]]:
+        """Closest live entry within max_distance: (value, distance) or (None, None)"""
+        ones = dhash.bit_count()
+        max_distance = self.max_distance if min(ones, HASH_BITS - ones) >= MIN_INFORMATIVE_BITS else 0
+        best_key, best_distance = None, max_distance + 1
+        expired = []
+        for key, (stored_at, _) in self._entries.items():
+            if key[1] != scope:
+                continue
+            if not self._alive(stored_at):
+                expired.append(key)
+                continue
+            distance = (self._hashes[key] ^ dhash).bit_count()
+            if distance < best_distance:
+                best_key, best_distance = key, distance
+                if distance == 0:
+                    break
+        for key in expired:
+            self._drop(key)
+
+        if best_key is None:
+            self.misses += 1
+            return None, None
+        self._entries.move_to_end(best_key)
+        self.hits += 1
+        self.near_hits += 1
+        return self._entries[best_key][1], best_distance
+
+    def put_image(self, content_hash: str, dhash: int, value: Any, scope: str = ""):
+        if not self.enabled:
+            return
+        key = (content_hash, scope)
+        self._hashes[key] = dhash
+        self.put(key, value)
+
+    def _drop(self, key: Hashable):
+        super()._drop(key)
+        self._hashes.pop(key, None)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "near_duplicate_hits": self.near_hits, "max_distance": self.max_distance}
@@ -1,12 +1,16 @@
+import asyncio
+
 from app.ai.qdrant_client import QdrantManager
-from app.ai.embeddings import EmbeddingService
+from app.ai.embeddings import get_embedding_service
 
 class TextSearchEngine:
     def __init__(self):
         self.qdrant = QdrantManager()
-        self.embedder = EmbeddingService()
+        self.embedder = get_embedding_service()
 
-    async def search_by_description(self, query: str):
-        vector = self.embedder.generate_text_embedding(query)
-        results = self.qdrant.search_by_vector(vector, collection_type="text")
+    async def search_by_description(self, query: str, top_k: int = 10, filters: dict = None, hnsw_ef: int = None, exact: bool = False):
+        vector = await self.embedder.embed_text(query)
+        results = await asyncio.to_thread(
+            self.qdrant.search_by_vector, vector, top_k, "text", filters, hnsw_ef, exact
+        )
         return results
@@ -0,0 +1,106 @@
+"""
+Pluggable speech-to-text backends for voice search
+
+Backends (TRANSCRIPTION_BACKEND in config):
+- "faster-whisper": Whisper on CTranslate2 with int8 weights (WHISPER_MODEL_SIZE,
+  default "base"), Silero VAD drops silence before decoding. Several times
+  faster than PyTorch on CPU with a fraction of the RAM
+- "openai-whisper": the reference PyTorch implementation in fp32, whole clip
+  decoded (historical behaviour)
+
+Both take a file path or 16 kHz mono float32 samples and accept a language
+hint ("en" / "ar"); with a hint, language detection (an extra encoder pass
+over the first 30 s) is skipped.
+"""
+
+import math
+import threading
+from typing import Dict, Optional, Type, Union
+
+import numpy as np
+
+from app.ai.model_registry import model_registry
+
+AudioInput = Union[str, np.ndarray]
+
+
+class TranscriptionBackend:
+    name: str = ""
+    registry_model: str = ""  # model_registry entry holding the weights
+
+    @property
+    def loaded(self) -> bool:
+        return model_registry.is_loaded(self.registry_model)
+
+    def transcribe(self, audio: AudioInput, language: Optional[str] = None) -> dict:
+        """
+        Returns:
+            text, language, confidence, plus audio/speech durations in seconds where known
+        """
+        raise NotImplementedError
+
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    name = "openai-whisper"
+    registry_model = "whisper"
+
+    def transcribe(self, audio: AudioInput, language: Optional[str] = None) -> dict:
+        model = model_registry.get(self.registry_model)
+        result = model.transcribe(audio, language=language) if language else model.transcribe(audio)
+        return {
+            "text": result.get("text", "").strip(),
+            "language": result.get("language", "en"),
+            "confidence": 0.0 # Standard whisper doesn't provide easy confidence score per full text
+        }
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    name = "faster-whisper"
+    registry_model = "faster-whisper"
+
+    def transcribe(self, audio: AudioInput, language: Optional[str] = None) -> dict:
+        from app.config import settings
+
+        model = model_registry.get(self.registry_model)
+        segments, info = model.transcribe(
+            audio,
+            language=language,
+            beam_size=settings.WHISPER_BEAM_SIZE,
+            vad_filter=settings.WHISPER_VAD,
+            vad_parameters={"min_silence_duration_ms": 500},
+            condition_on_previous_text=False,  # Short queries; avoids repetition loops
+        )
+        segments = list(segments)  # Decoding happens lazily while iterating
+
+        # Duration-weighted mean token probability as a rough confidence
+        total = sum(s.end - s.start for s in segments)
+        confidence = (
+            sum(math.exp(s.avg_logprob) * (s.end - s.start) for s in segments) / total if total > 0 else 0.0
+        )
+        return {
+            "text": "".join(s.text for s in segments).strip(),
+            "language": info.language,
+            "confidence": round(confidence, 3),
+            "duration": round(info.duration, 2),
+            "speech_duration": round(info.duration_after_vad, 2) if info.duration_after_vad is not None else None,
+        }
+
+
+BACKENDS: Dict[str, Type[TranscriptionBackend]] = {
+    FasterWhisperBackend.name: FasterWhisperBackend,
+    OpenAIWhisperBackend.name: OpenAIWhisperBackend,
+}
+
+_instances: Dict[str, TranscriptionBackend] = {}
+_instances_lock = threading.Lock()
+
+
+def get_transcription_backend(name: str) -> TranscriptionBackend:
+    """Shared backend instance by name (nothing is loaded until the first transcription)"""
+    if name not in _instances:
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown transcription backend '{name}'. Available: {list(BACKENDS)}")
+        with _instances_lock:
+            if name not in _instances:
+                _instances[name] = BACKENDS[name]()
+    return _instances[name]
@@ -1,70 +1,185 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Union
+
+import httpx
+
 from app.ai.qdrant_client import QdrantManager
-from app.ai.embeddings import EmbeddingService
+from app.ai.embeddings import get_embedding_service
+from app.ai.image_preprocess import PreparedImage, prepare_image
+from app.ai.inference_pool import get_inference_pool, ocr_task
+from app.ai.ollama_client import get_ollama_client
+from app.ai.result_cache import PerceptualResultCache
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+VISION_LLM_MODEL = "llama3.2-vision"
+
 
 class VisionAgent:
+    """
+    Image search as a small DAG:
+
+        image -> preprocess -> 224px view -> embed -> Qdrant search --> result
+                            -> OCR view ----> OCR -> vision LLM ------> result
+                            -> LLM JPEG ------------^
+
+    The image is decoded once (see app/ai/image_preprocess.py) and the two
+    branches run concurrently, so latency is roughly the slower branch
+    (usually OCR + LLM) instead of the sum of all stages. Per-stage timings
+    are returned in `timings_ms`.
+
+    Results are cached per payload filters: by upload content hash (before
+    decoding), then by perceptual hash for near-duplicate photos.
+    """
+
     def __init__(self):
         self.qdrant = QdrantManager()
-        self.embedder = EmbeddingService()
-
-    async def identify_part_from_image(self, image_path: str):
-        # 1. Generate embedding & Search Qdrant
-        vector = self.embedder.generate_image_embedding(image_path)
-        similar_parts = self.qdrant.search_by_vector(vector, collection_type="image")
-        
-        # 2. Extract Text (OCR)
-        ocr_text = await self.extract_text(image_path)
-        
-        # 3. Vision LLM Analysis (Llama 3.2)
-        llm_analysis = await self.analyze_with_vision_llm(image_path, ocr_text)
-        
-        return {
+        self.embedder = get_embedding_service()
+        self.result_cache = PerceptualResultCache(
+            "vision",
+            max_items=settings.RESULT_CACHE_SIZE,
+            ttl_seconds=settings.RESULT_CACHE_TTL_S,
+            max_distance=settings.VISION_CACHE_MAX_DISTANCE,
+        )
+
+    async def identify_part_from_image(
+        self,
+        image: Union[str, bytes, PreparedImage],
+        filters: dict = None,
+        content_hash: str = None,
+    ):
+        """
+        Args:
+            image: Path, encoded bytes or an already prepared image
+            content_hash: SHA-256 of the encoded bytes, if the caller already has it
+        """
+        started = time.perf_counter()
+        timings = {}
+        cache = self.result_cache
+        scope = json.dumps(filters or {}, sort_keys=True)
+
+        if isinstance(image, str):
+            image = await asyncio.to_thread(_read_bytes, image)
+        if isinstance(image, bytes):
+            content_hash = content_hash or hashlib.sha256(image).hexdigest()
+            cached = cache.get_exact(content_hash, scope) if cache.enabled else None
+            if cached is not None:
+                return _from_cache(cached, "exact", 0, started)
+
+            image = await asyncio.to_thread(
+                prepare_image,
+                image,
+                ocr_max_side=settings.IMAGE_OCR_MAX_SIDE,
+                llm_max_side=settings.IMAGE_LLM_MAX_SIDE,
+                llm_jpeg_quality=settings.IMAGE_LLM_JPEG_QUALITY,
+            )
+            timings["preprocess"] = _elapsed_ms(started)
+
+        if cache.enabled:
+            cached, distance = cache.get_similar(image.dhash, scope)
+            if cached is not None:
+                return _from_cache(cached, "near_duplicate", distance, started)
+
+        search = asyncio.create_task(self.search_similar(image, filters, timings))
+        analysis = asyncio.create_task(self._ocr_then_llm(image, timings))
+        try:
+            similar_parts, (ocr_text, llm_analysis) = await asyncio.gather(search, analysis)
+        except BaseException:
+            # Don't leave the other branch running (and holding pool slots) after a failure
+            search.cancel()
+            analysis.cancel()
+            raise
+
+        timings["total"] = _elapsed_ms(started)
+        result = {
             "similar_parts": similar_parts,
             "ocr_text": ocr_text,
-            "llm_analysis": llm_analysis
+            "llm_analysis": llm_analysis,
+            "image": image.stats(),
+            "timings_ms": timings,
         }
+        # A failed or empty LLM answer is worth retrying, so don't pin it in the cache
+        if isinstance(llm_analysis, dict) and llm_analysis and "error" not in llm_analysis:
+            cache.put_image(content_hash or f"dhash:{image.dhash:016x}", image.dhash, result, scope)
+        return {**result, "cache": {"hit": None}}
+
+    async def search_similar(self, image: PreparedImage, filters: dict = None, timings: dict = None):
+        """CLIP embedding, then Qdrant search (optionally restricted by payload filters)"""
+        timings = {} if timings is None else timings
+        started = time.perf_counter()
+        vector = await self.embedder.embed_image(image.clip)
+        timings["embed"] = _elapsed_ms(started)
 
-    async def extract_text(self, image_path: str):
-        import easyocr
-        reader = easyocr.Reader(['en', 'ar'], gpu=False) # GPU=False for VPS compatibility
-        result = reader.readtext(image_path, detail=0)
-        return " ".join(result)
+        started = time.perf_counter()
+        similar_parts = await asyncio.to_thread(
+            self.qdrant.search_by_vector, vector, 10, "image", filters
+        )
+        timings["search"] = _elapsed_ms(started)
+        return similar_parts
 
-    async def analyze_with_vision_llm(self, image_path: str, ocr_text: str):
-        import requests
-        import base64
-        import json
-        from app.config import settings
+    async def _ocr_then_llm(self, image: PreparedImage, timings: dict):
+        started = time.perf_counter()
+        ocr_text = await self.extract_text(image.ocr)
+        timings["ocr"] = _elapsed_ms(started)
 
-        with open(image_path, "rb") as img_file:
-            base64_image = base64.b64encode(img_file.read()).decode('utf-8')
+        started = time.perf_counter()
+        llm_analysis = await self.analyze_with_vision_llm(image.llm_jpeg_b64, ocr_text)
+        timings["llm"] = _elapsed_ms(started)
+        return ocr_text, llm_analysis
 
+    async def extract_text(self, image):
+        # EasyOCR runs in the inference pool; the reader is a warm singleton in each worker
+        return await get_inference_pool().run(ocr_task, image)
+
+    async def analyze_with_vision_llm(self, base64_image: str, ocr_text: str):
         prompt = f"""
         Identify this industrial part. Use the OCR text '{ocr_text}' to help.
         Return a JSON object with: part_name, manufacturer, technical_specifications.
         """
-        
+
         try:
-            response = requests.post(
-                f"{settings.OLLAMA_HOST}/api/generate",
+            response = await get_ollama_client().post(
+                "/api/generate",
                 json={
-                    "model": "llama3.2-vision",
+                    "model": VISION_LLM_MODEL,
                     "prompt": prompt,
                     "images": [base64_image],
                     "stream": False,
                     "format": "json"
                 },
-                timeout=30
             )
-            
+            response.raise_for_status()
             response_data = response.json()
-            llm_response_str = response_data.get("response", "{}")
-            
-            # Parse the stringified JSON returned by Ollama
-            try:
-                return json.loads(llm_response_str)
-            except json.JSONDecodeError:
-                print(f"Failed to parse LLM response: {llm_response_str}")
-                return {}
-                
-        except Exception as e:
+        except (httpx.HTTPError, ValueError) as e:
             return {"error": f"Vision LLM failed: {str(e)}"}
+
+        llm_response_str = response_data.get("response", "{}")
+
+        # Parse the stringified JSON returned by Ollama
+        try:
+            return json.loads(llm_response_str)
+        except json.JSONDecodeError:
+            logger.warning(f"Failed to parse LLM response: {llm_response_str}")
+            return {"error": "Vision LLM returned invalid JSON"}
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _from_cache(result: dict, hit: str, distance: int, started: float) -> dict:
+    return {
+        **result,
+        "timings_ms": {"total": _elapsed_ms(started), "original_total": result["timings_ms"].get("total")},
+        "cache": {"hit": hit, "distance": distance},
+    }
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
@@ -1,34 +1,51 @@
+import hashlib
 import logging
+from typing import Optional, Union
+
+from app.ai.inference_pool import get_inference_pool, transcribe_task
+from app.ai.model_registry import model_registry
+from app.ai.result_cache import ResultCache
+from app.ai.transcription_backends import TranscriptionBackend, get_transcription_backend
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 class VoiceProcessor:
-    def __init__(self):
-        self.model = None
+    def __init__(self, backend: Optional[str] = None):
+        self.backend: TranscriptionBackend = get_transcription_backend(backend or settings.TRANSCRIPTION_BACKEND)
+        # Retried voice queries: same audio bytes + language hint -> same transcription
+        self.result_cache = ResultCache("voice", settings.RESULT_CACHE_SIZE, settings.RESULT_CACHE_TTL_S)
 
     def load_model(self):
-        if self.model:
-            return
-
-        import whisper
-        logger.info("Loading OpenAI Whisper Model...")
-        # Use 'base' for balance of speed/accuracy
-        self.model = whisper.load_model("base")
-
-    async def transcribe_audio(self, audio_path: str, language: str = None):
-        self.load_model()
-        
-        # Sync run in executor to avoid blocking asyncio loop
-        import asyncio
-        loop = asyncio.get_event_loop()
-        
-        # basic transcribe
-        func = lambda: self.model.transcribe(audio_path, language=language) if language else self.model.transcribe(audio_path)
-        result = await loop.run_in_executor(None, func)
-        
-        return {
-            "text": result.get("text", "").strip(),
-            "language": result.get("language", "en"),
-            "confidence": 0.0 # Standard whisper doesn't provide easy confidence score per full text
-        }
+        model_registry.get(self.backend.registry_model)
+
+    def transcribe(self, audio: Union[str, bytes], language: str = None, suffix: str = "") -> dict:
+        """
+        Blocking transcription; runs inside the inference pool
+
+        Args:
+            audio: File path, or encoded bytes decoded in memory (`suffix` hints the container)
+            language: "en" / "ar" hint; skips language detection
+        """
+        if isinstance(audio, bytes):
+            from app.ai.audio import decode_audio
+            audio = decode_audio(audio, suffix)
+        return self.backend.transcribe(audio, language)
+
+    async def transcribe_audio(self, audio: Union[str, bytes], language: str = None, suffix: str = "", content_hash: str = None):
+        """
+        Args:
+            content_hash: SHA-256 of the audio bytes, if the caller already has it
+        """
+        key = None
+        if isinstance(audio, bytes) and self.result_cache.enabled:
+            key = (content_hash or hashlib.sha256(audio).hexdigest(), language or "")
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return {**cached, "cached": True}
 
+        # Whisper runs in the inference pool so the event loop stays free
+        result = await get_inference_pool().run(transcribe_task, audio, language, suffix)
+        if key is not None:
+            self.result_cache.put(key, result)
+        return {**result, "cached": False}
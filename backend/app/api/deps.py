@@ -40,6 +40,26 @@ def get_current_user(
         raise HTTPException(status_code=400, detail="Inactive user")
     return user
 
+optional_oauth2 = OAuth2PasswordBearer(
+    tokenUrl=f"{settings.API_V1_STR}/auth/login" if hasattr(settings, 'API_V1_STR') else "/api/auth/login",
+    auto_error=False,
+)
+
+def get_optional_user(
+    db: Session = Depends(get_db), token: Optional[str] = Depends(optional_oauth2)
+) -> Optional[User]:
+    """The signed-in user for endpoints that also serve anonymous visitors; None if not (validly) signed in"""
+    if not token:
+        return None
+    try:
+        user_id = jwt.decode(token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]).get("sub")
+    except (JWTError, ValidationError):
+        return None
+    if user_id is None:
+        return None
+    user = db.query(User).filter(User.id == user_id).first()
+    return user if user is not None and user.is_active else None
+
 def check_role(roles: list[str]):
     def role_checker(current_user: User = Depends(get_current_user)):
         if current_user.role not in roles and current_user.role != "admin":
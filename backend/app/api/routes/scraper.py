@@ -57,6 +57,7 @@ class ProductResponse(BaseModel):
 @router.post("/jobs/trigger/{scraper_id}")
 async def trigger_scraper_job(
     scraper_id: str,
+    full_refresh: bool = Query(False),
     db: Session = Depends(get_db)
 ):
     """
@@ -67,17 +68,19 @@ async def trigger_scraper_job(
     
     Args:
         scraper_id: ID from scraper_config.yaml (e.g., 'sick-ag-products')
+        full_refresh: Re-scrape every product, ignoring incremental state
     
     Returns:
         Job trigger confirmation with ARQ job ID
     """
     try:
-        arq_job_id = await enqueue_scraper_job(scraper_id)
+        arq_job_id = await enqueue_scraper_job(scraper_id, full_refresh=full_refresh)
         
         return {
             "message": f"Scraper '{scraper_id}' triggered successfully",
             "scraper_id": scraper_id,
             "arq_job_id": arq_job_id,
+            "full_refresh": full_refresh,
             "status": "queued"
         }
     
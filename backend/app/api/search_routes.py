@@ -1,81 +1,162 @@
-from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, Form, Depends, HTTPException, Query
+from pydantic import BaseModel, Field, field_validator
+from typing import Dict, List, Optional, Union
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.api.deps import get_optional_user
+from app.models.user import User
+from app.config import settings
 from app.ai.text_search import TextSearchEngine
+from app.ai.hybrid_search import HybridSearchEngine
 from app.ai.vision_agent import VisionAgent
 from app.ai.voice_processor import VoiceProcessor
-import shutil
-import os
-import uuid
+from app.ai.inference_pool import InferenceBusy, get_inference_pool, model_stats_task
+from app.ai.audio import AudioDecodeError
+from app.ai.qdrant_client import PAYLOAD_INDEX_FIELDS
+from app.utils.uploads import get_upload_store, read_upload
+from functools import lru_cache
+from PIL import UnidentifiedImageError
 
 router = APIRouter()
 
-# Initialize engines lazily or globally
-text_search = TextSearchEngine()
-vision_agent = VisionAgent()
-voice_processor = VoiceProcessor()
+# Engines are created on first use; models load even later, on first inference
+@lru_cache
+def get_text_search() -> TextSearchEngine:
+    return TextSearchEngine()
+
+@lru_cache
+def get_hybrid_search() -> HybridSearchEngine:
+    return HybridSearchEngine(get_text_search(), refresh_seconds=settings.HYBRID_INDEX_REFRESH_S)
+
+@lru_cache
+def get_vision_agent() -> VisionAgent:
+    return VisionAgent()
+
+@lru_cache
+def get_voice_processor() -> VoiceProcessor:
+    return VoiceProcessor()
 
 class SearchQuery(BaseModel):
     query: str
+    limit: int = Field(10, ge=1, le=100)
+    # e.g. {"vendor_name": "SICK AG", "category": ["Photoelectric sensors", "Inductive sensors"]}
+    filters: Optional[Dict[str, Union[str, List[str]]]] = None
+    hnsw_ef: Optional[int] = Field(None, ge=4, le=1024)
+    exact: bool = False
+
+    @field_validator("filters")
+    @classmethod
+    def check_filter_fields(cls, filters):
+        unknown = set(filters or {}) - set(PAYLOAD_INDEX_FIELDS)
+        if unknown:
+            raise ValueError(f"Unsupported filter fields {sorted(unknown)}; use {list(PAYLOAD_INDEX_FIELDS)}")
+        return filters
+
+def search_filters(
+    vendor_name: Optional[str] = Query(None),
+    category: Optional[str] = Query(None),
+    manufacturer: Optional[str] = Query(None),
+) -> Optional[dict]:
+    """Payload filters for the upload endpoints, as query parameters."""
+    filters = {"vendor_name": vendor_name, "category": category, "manufacturer": manufacturer}
+    return {key: value for key, value in filters.items() if value} or None
 
 @router.post("/text")
 async def search_by_text(search: SearchQuery):
-    """Semantic search by text query."""
-    if not search.query:
-        return []
-    results = await text_search.search_by_description(search.query)
-    return {"results": results}
+    """Hybrid search: part-number fast path, else BM25 + semantic vectors fused with RRF."""
+    if not search.query.strip():
+        return {"results": []}
+    return await get_hybrid_search().search(
+        search.query,
+        limit=search.limit,
+        filters=search.filters,
+        hnsw_ef=search.hnsw_ef,
+        exact=search.exact,
+    )
+
+@router.get("/stats")
+async def search_stats():
+    """Embedding batcher throughput/latency, inference pool load and per-model load cost."""
+    pool = get_inference_pool()
+    try:
+        # Models live in the inference workers; with several workers this is one of them
+        models = await pool.run(model_stats_task)
+    except InferenceBusy:
+        models = None
+    return {
+        "hybrid_search": get_hybrid_search().stats(),
+        "embeddings": get_text_search().embedder.stats(),
+        "inference_pool": pool.stats(),
+        "result_caches": [get_vision_agent().result_cache.stats(), get_voice_processor().result_cache.stats()],
+        "models": models,
+    }
 
 @router.post("/image")
-async def search_by_image(file: UploadFile = File(...)):
+async def search_by_image(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    filters: Optional[dict] = Depends(search_filters),
+):
     """Search by uploading an image."""
     try:
-        # Save temp file
-        file_ext = file.filename.split(".")[-1]
-        temp_filename = f"temp_{uuid.uuid4()}.{file_ext}"
-        temp_path = os.path.join("data/images", temp_filename)
-        os.makedirs("data/images", exist_ok=True)
-        
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-            
-        # Process
-        analysis = await vision_agent.identify_part_from_image(temp_path)
-        
-        # Cleanup (optional, or keep for debugging)
-        # os.remove(temp_path)
-        
-        return analysis
+        # Bytes go straight to preprocessing; the optional retained copy is written after the response
+        upload = await read_upload(file, settings.UPLOAD_MAX_IMAGE_MB * 1_048_576)
+        store = get_upload_store()
+        if store.enabled:
+            background_tasks.add_task(store.save, "images", upload)
+
+        return await get_vision_agent().identify_part_from_image(upload.data, filters=filters, content_hash=upload.sha256)
+    except (InferenceBusy, HTTPException):
+        raise
+    except UnidentifiedImageError:
+        raise HTTPException(status_code=400, detail="Uploaded file is not a readable image")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def voice_language(
+    language: Optional[str] = Query(None, description="Spoken language (en/ar); skips auto-detection"),
+    user: Optional[User] = Depends(get_optional_user),
+) -> Optional[str]:
+    """Language hint for transcription: explicit parameter, else the user's preferred_language, else None (auto-detect)."""
+    for candidate in (language, user.preferred_language if user else None):
+        if candidate and candidate.lower() in settings.SUPPORTED_LANGUAGES:
+            return candidate.lower()
+    return None
+
 @router.post("/voice")
-async def search_by_voice(file: UploadFile = File(...)):
+async def search_by_voice(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    filters: Optional[dict] = Depends(search_filters),
+    language: Optional[str] = Depends(voice_language),
+):
     """Search by voice command (transcribe + text search)."""
     try:
-        # Save temp file
-        file_ext = file.filename.split(".")[-1]
-        temp_filename = f"temp_{uuid.uuid4()}.{file_ext}"
-        temp_path = os.path.join("data/audio", temp_filename)
-        os.makedirs("data/audio", exist_ok=True)
-        
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-            
-        # Transcribe
-        transcription = await voice_processor.transcribe_audio(temp_path)
+        upload = await read_upload(file, settings.UPLOAD_MAX_AUDIO_MB * 1_048_576)
+        store = get_upload_store()
+        if store.enabled:
+            background_tasks.add_task(store.save, "audio", upload)
+
+        # Transcribe (decoded in memory by the inference worker)
+        transcription = await get_voice_processor().transcribe_audio(
+            upload.data, language=language, suffix=upload.extension, content_hash=upload.sha256
+        )
         text_query = transcription.get("text")
         
         if not text_query:
             return {"transcription": "", "results": []}
             
         # Search
-        results = await text_search.search_by_description(text_query)
+        search_result = await get_hybrid_search().search(text_query, filters=filters)
         
         return {
             "transcription": text_query,
-            "results": results
+            "language": transcription.get("language"),
+            "results": search_result["results"]
         }
+    except (InferenceBusy, HTTPException):
+        raise
+    except AudioDecodeError:
+        raise HTTPException(status_code=400, detail="Uploaded file is not readable audio")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -17,9 +17,69 @@ class Settings(BaseSettings):
     # Qdrant
     QDRANT_HOST: str = config("QDRANT_HOST", default="localhost")
     QDRANT_PORT: int = config("QDRANT_PORT", default=6333, cast=int)
+    # Storage profile for new collections (see app/ai/collection_profiles.py): default, int8, int8_disk, binary
+    QDRANT_COLLECTION_PROFILE: str = config("QDRANT_COLLECTION_PROFILE", default="int8")
+    # Embedding backend per collection (see app/ai/embedding_backends.py); dims are checked against Qdrant
+    QDRANT_TEXT_BACKEND: str = config("QDRANT_TEXT_BACKEND", default="clip-vit-b32")
+    QDRANT_IMAGE_BACKEND: str = config("QDRANT_IMAGE_BACKEND", default="clip-vit-b32")
+    
+    # "clip-vit-b32-onnx" backend: exported graphs + processor, int8 weights, threads per op (0 = physical cores)
+    ONNX_CLIP_DIR: str = config("ONNX_CLIP_DIR", default="data/models/clip-vit-b32-onnx")
+    ONNX_CLIP_QUANTIZE: bool = config("ONNX_CLIP_QUANTIZE", default=True, cast=bool)
+    ONNX_INTRA_OP_THREADS: int = config("ONNX_INTRA_OP_THREADS", default=0, cast=int)
     
     # AI / Ollama
     OLLAMA_HOST: str = config("OLLAMA_HOST", default="http://localhost:11434")
+    OLLAMA_TIMEOUT_S: float = config("OLLAMA_TIMEOUT_S", default=30.0, cast=float)
+    # Pooled keep-alive connections to Ollama (it serves one generation at a time per model anyway)
+    OLLAMA_MAX_CONNECTIONS: int = config("OLLAMA_MAX_CONNECTIONS", default=4, cast=int)
+
+    # Search uploads: size limits (413 while streaming), optional content-addressed retention + TTL janitor
+    UPLOAD_MAX_IMAGE_MB: int = config("UPLOAD_MAX_IMAGE_MB", default=15, cast=int)
+    UPLOAD_MAX_AUDIO_MB: int = config("UPLOAD_MAX_AUDIO_MB", default=25, cast=int)
+    UPLOAD_DIR: str = config("UPLOAD_DIR", default="data/uploads")
+    UPLOAD_RETENTION_S: int = config("UPLOAD_RETENTION_S", default=24 * 3600, cast=int)  # 0 = don't keep uploads
+    UPLOAD_JANITOR_INTERVAL_S: int = config("UPLOAD_JANITOR_INTERVAL_S", default=600, cast=int)
+
+    # Voice search speech-to-text (see app/ai/transcription_backends.py): faster-whisper or openai-whisper
+    TRANSCRIPTION_BACKEND: str = config("TRANSCRIPTION_BACKEND", default="faster-whisper")
+    WHISPER_MODEL_SIZE: str = config("WHISPER_MODEL_SIZE", default="base")
+    WHISPER_COMPUTE_TYPE: str = config("WHISPER_COMPUTE_TYPE", default="int8")
+    WHISPER_CPU_THREADS: int = config("WHISPER_CPU_THREADS", default=0, cast=int)  # 0 = physical cores
+    WHISPER_BEAM_SIZE: int = config("WHISPER_BEAM_SIZE", default=1, cast=int)
+    WHISPER_VAD: bool = config("WHISPER_VAD", default=True, cast=bool)
+
+    # Image / voice search result cache (0 disables); near-duplicate photos match within this many dHash bits
+    RESULT_CACHE_SIZE: int = config("RESULT_CACHE_SIZE", default=1000, cast=int)
+    RESULT_CACHE_TTL_S: int = config("RESULT_CACHE_TTL_S", default=3600, cast=int)
+    VISION_CACHE_MAX_DISTANCE: int = config("VISION_CACHE_MAX_DISTANCE", default=4, cast=int)
+
+    # Image search preprocessing: bounded views for OCR and the vision LLM (CLIP always gets 224px)
+    IMAGE_OCR_MAX_SIDE: int = config("IMAGE_OCR_MAX_SIDE", default=1600, cast=int)
+    IMAGE_LLM_MAX_SIDE: int = config("IMAGE_LLM_MAX_SIDE", default=1024, cast=int)
+    IMAGE_LLM_JPEG_QUALITY: int = config("IMAGE_LLM_JPEG_QUALITY", default=85, cast=int)
+
+    # Embedding micro-batching: requests arriving within the wait window share one forward pass
+    EMBEDDING_BATCH_SIZE: int = config("EMBEDDING_BATCH_SIZE", default=16, cast=int)
+    EMBEDDING_MAX_WAIT_MS: float = config("EMBEDDING_MAX_WAIT_MS", default=5.0, cast=float)
+
+    # Hybrid search: rebuild the in-memory part-number / BM25 indexes after this many seconds
+    HYBRID_INDEX_REFRESH_S: int = config("HYBRID_INDEX_REFRESH_S", default=300, cast=int)
+
+    # Embedding cache: in-process LRU (0 disables) backed by Redis, vectors stored as raw bytes
+    EMBEDDING_CACHE_SIZE: int = config("EMBEDDING_CACHE_SIZE", default=10000, cast=int)
+    EMBEDDING_CACHE_REDIS: bool = config("EMBEDDING_CACHE_REDIS", default=True, cast=bool)
+    EMBEDDING_CACHE_TTL_S: int = config("EMBEDDING_CACHE_TTL_S", default=30 * 24 * 3600, cast=int)
+    EMBEDDING_CACHE_DTYPE: str = config("EMBEDDING_CACHE_DTYPE", default="float16")
+
+    # Inference pool (CLIP / OCR / Whisper). 0 workers = threads in the API process
+    INFERENCE_WORKERS: int = config("INFERENCE_WORKERS", default=1, cast=int)
+    INFERENCE_MAX_PENDING: int = config("INFERENCE_MAX_PENDING", default=8, cast=int)
+    # "embeddings" = the models of QDRANT_TEXT_BACKEND / QDRANT_IMAGE_BACKEND, "transcription" = TRANSCRIPTION_BACKEND's
+    INFERENCE_PRELOAD: str = config("INFERENCE_PRELOAD", default="embeddings,ocr,transcription")
+    INFERENCE_RETRY_AFTER_S: int = config("INFERENCE_RETRY_AFTER_S", default=5, cast=int)
+    # Load INFERENCE_PRELOAD models during startup instead of on the first request
+    MODEL_WARMUP: bool = config("MODEL_WARMUP", default=True, cast=bool)
     
     # SMTP Email Settings
     SMTP_HOST: str = config("SMTP_HOST", default="smtp.hostinger.com")
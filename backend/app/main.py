@@ -6,6 +6,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.database import engine, Base
 from app.config import settings
 import uvicorn
+import asyncio
 from contextlib import asynccontextmanager
 
 # Initialize Database Tables
@@ -22,8 +23,25 @@ async def lifespan(app: FastAPI):
         print("✅ Qdrant collections initialized.")
     except Exception as e:
         print(f"⚠️ Failed to initialize Qdrant: {e}")
+
+    # Warm models (in the inference workers, or here in thread mode) before the first request
+    from app.ai.inference_pool import get_inference_pool
+    inference_pool = get_inference_pool()
+    if settings.MODEL_WARMUP:
+        try:
+            await asyncio.to_thread(inference_pool.start)
+            print("✅ Inference models warmed.")
+        except Exception as e:
+            print(f"⚠️ Failed to warm inference models: {e}")
+
+    # Expire retained search uploads (and old temp files) in the background
+    from app.utils.uploads import get_upload_store
+    janitor = asyncio.create_task(get_upload_store().run_janitor(settings.UPLOAD_JANITOR_INTERVAL_S))
     yield
-    # Shutdown logic if needed
+    janitor.cancel()
+    from app.ai.ollama_client import close_ollama_client
+    await close_ollama_client()
+    inference_pool.shutdown()
 
 app = FastAPI(
     title="Nexus Industrial API",
@@ -41,6 +59,24 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         content=jsonable_encoder({"detail": exc.errors(), "body": str(await request.body())}),
     )
 
+from app.ai.inference_pool import InferenceBusy
+
+@app.exception_handler(InferenceBusy)
+async def inference_busy_handler(request: Request, exc: InferenceBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+# Cut oversized search uploads off while they stream in
+from app.utils.uploads import BodySizeLimitMiddleware
+
+app.add_middleware(BodySizeLimitMiddleware, limits={
+    "/api/search/image": settings.UPLOAD_MAX_IMAGE_MB * 1_048_576,
+    "/api/search/voice": settings.UPLOAD_MAX_AUDIO_MB * 1_048_576,
+})
+
 # CORS Middleware
 app.add_middleware(
     CORSMiddleware,
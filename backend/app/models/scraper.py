@@ -4,9 +4,11 @@ Database models for scraper system
 Models:
 - ScraperJob: Tracks scraping job execution and status
 - ScrapedProduct: Stores scraped product data with deduplication
+- ScrapedPageState: Per-URL change detection state for incremental crawls
+- VectorIndexState: Progress cursor of the catalog -> Qdrant indexer
 """
 
-from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, Index
+from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, Index, UniqueConstraint
 from datetime import datetime
 from app.database import Base
 
@@ -77,7 +79,63 @@ class ScrapedProduct(Base):
         Index('idx_scraped_products_part', 'part_number'),
         Index('idx_scraped_products_hash', 'data_hash'),
         Index('idx_scraped_products_category', 'category'),
+        Index('idx_scraped_products_source', 'scraper_id', 'source_url'),
     )
     
     def __repr__(self):
         return f"<ScrapedProduct(id={self.id}, vendor='{self.vendor_name}', part='{self.part_number}')>"
+
+
+class ScrapedPageState(Base):
+    """
+    Change detection state for incremental crawls
+    
+    One row per scraped URL (listing page or product detail page):
+    - content_fingerprint: hash of the listing row / response body last seen
+    - etag / last_modified: validators for conditional GETs
+    - spec_hash: hash of the product specifications last extracted
+    - last_full_fetch_at: when the URL was last fully re-fetched, used to
+      force periodic refreshes even if nothing looks changed
+    """
+    __tablename__ = "scraped_page_states"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    scraper_id = Column(String(255), nullable=False)
+    url = Column(String(1000), nullable=False)
+    content_fingerprint = Column(String(64), nullable=True)
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    spec_hash = Column(String(32), nullable=True)
+    last_checked_at = Column(DateTime, default=datetime.utcnow)
+    last_changed_at = Column(DateTime, default=datetime.utcnow)
+    last_full_fetch_at = Column(DateTime, default=datetime.utcnow)
+    
+    # The unique constraint's (scraper_id, url) index also serves per-scraper lookups
+    __table_args__ = (
+        UniqueConstraint('scraper_id', 'url', name='uq_scraped_page_states_scraper_url'),
+    )
+    
+    def __repr__(self):
+        return f"<ScrapedPageState(id={self.id}, scraper_id='{self.scraper_id}', url='{self.url}')>"
+
+
+class VectorIndexState(Base):
+    """
+    Progress cursor of the catalog vectorization pipeline
+    
+    One row per indexer (e.g. 'catalog'). Products are indexed in
+    (updated_at, id) order and the cursor is advanced after every chunk is
+    upserted, so an interrupted run resumes where it stopped and later runs
+    only re-embed products updated since.
+    """
+    __tablename__ = "vector_index_states"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), unique=True, nullable=False)
+    last_updated_at = Column(DateTime, nullable=True)  # updated_at of the last indexed product
+    last_product_id = Column(Integer, nullable=True)  # Tie-breaker for equal timestamps
+    indexed_count = Column(Integer, default=0)
+    last_run_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<VectorIndexState(name='{self.name}', last_updated_at={self.last_updated_at})>"
@@ -1,12 +1,13 @@
 """Scraper package initialization"""
 
 from app.scraper.scraper_engine import ScraperEngine
-from app.scraper.data_pipeline import validate_and_save_products, ProductData
+from app.scraper.data_pipeline import validate_and_save_products, save_product_stream, ProductData
 from app.scraper.scheduler import enqueue_scraper_job
 
 __all__ = [
     'ScraperEngine',
     'validate_and_save_products',
+    'save_product_stream',
     'ProductData',
     'enqueue_scraper_job'
 ]
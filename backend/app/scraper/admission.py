@@ -0,0 +1,139 @@
+"""
+Memory-aware admission control for the ARQ scraper worker
+
+Replaces the hard `max_jobs = 1` limit with a memory budget. Every job
+declares an expected footprint by scraping method (lightweight `http`
+scrapers ~50MB, Playwright ~700MB) and is admitted only if both the
+reserved footprints and the live RSS of the worker process tree (including
+Chromium children) leave room for it. This lets HTTP scrapers run alongside a
+Playwright crawl while two browsers never run at once on the small VPS.
+
+The first job is always admitted, so an oversized job cannot starve.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_MB = 1500
+DEFAULT_FOOTPRINTS_MB = {'http': 50, 'playwright': 700}
+
+
+class NotAdmitted(Exception):
+    """Raised by admit(wait=False) when the job does not fit in the budget right now"""
+
+
+class AdmissionController:
+    """
+    Admits jobs concurrently up to a memory budget
+
+    Args:
+        budget_mb: Total memory the worker (and its browsers) may use
+        footprints_mb: Expected peak per scraping method
+        poll_interval: Seconds between live RSS re-checks while a job waits
+    """
+
+    def __init__(
+        self,
+        budget_mb: int = DEFAULT_BUDGET_MB,
+        footprints_mb: Optional[Dict[str, int]] = None,
+        poll_interval: float = 5.0
+    ):
+        self.budget_mb = budget_mb
+        self.footprints_mb = {**DEFAULT_FOOTPRINTS_MB, **(footprints_mb or {})}
+        self.poll_interval = poll_interval
+        self.running: Dict[str, int] = {}
+        self._condition = asyncio.Condition()
+        self._process = psutil.Process()
+        # Worker baseline (interpreter + libraries) before any job runs
+        self.baseline_mb = self.live_rss_mb()
+
+    @classmethod
+    def from_config(cls, worker_config: Dict[str, Any]) -> "AdmissionController":
+        """Build from the `worker` section of scraper_config.yaml"""
+        return cls(
+            budget_mb=worker_config.get('memory_budget_mb', DEFAULT_BUDGET_MB),
+            footprints_mb=worker_config.get('footprint_mb'),
+            poll_interval=worker_config.get('admission_poll_s', 5.0)
+        )
+
+    @property
+    def reserved_mb(self) -> int:
+        return sum(self.running.values())
+
+    def live_rss_mb(self) -> float:
+        """RSS of the worker process plus all children (Chromium, etc.)"""
+        total = 0
+        for proc in [self._process, *self._process.children(recursive=True)]:
+            try:
+                total += proc.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total / 1_048_576
+
+    def footprint_for(self, method: str) -> int:
+        # Unknown methods are assumed to be as heavy as the heaviest known one
+        return self.footprints_mb.get(method, max(self.footprints_mb.values()))
+
+    def _fits(self, footprint_mb: int) -> bool:
+        if not self.running:
+            return True
+        # Jobs can exceed (or not yet reach) their declared footprint; trust whichever is larger
+        committed_mb = max(self.baseline_mb + self.reserved_mb, self.live_rss_mb())
+        return committed_mb + footprint_mb <= self.budget_mb
+
+    @asynccontextmanager
+    async def admit(self, job_label: str, method: str, wait: bool = True):
+        """
+        Wait until the job fits in the memory budget, then hold its reservation
+
+        Raises:
+            NotAdmitted: With wait=False, if the job does not fit now
+        """
+        footprint_mb = self.footprint_for(method)
+
+        async with self._condition:
+            waited = False
+            while not self._fits(footprint_mb):
+                if not wait:
+                    raise NotAdmitted(
+                        f"{job_label} ({method}, ~{footprint_mb}MB) does not fit; "
+                        f"reserved {self.reserved_mb}MB by {list(self.running)}, budget {self.budget_mb}MB"
+                    )
+                if not waited:
+                    logger.info(
+                        f"Admission: {job_label} ({method}, ~{footprint_mb}MB) waiting; "
+                        f"reserved {self.reserved_mb}MB by {list(self.running)}, budget {self.budget_mb}MB"
+                    )
+                    waited = True
+                try:
+                    # Re-check on release, or periodically since live RSS can drop on its own
+                    await asyncio.wait_for(self._condition.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+            self.running[job_label] = footprint_mb
+            logger.info(
+                f"Admission: {job_label} admitted (~{footprint_mb}MB); "
+                f"{len(self.running)} running, {self.reserved_mb}/{self.budget_mb}MB reserved"
+            )
+
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.running.pop(job_label, None)
+                self._condition.notify_all()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'budget_mb': self.budget_mb,
+            'reserved_mb': self.reserved_mb,
+            'live_rss_mb': round(self.live_rss_mb(), 1),
+            'running': dict(self.running),
+        }
@@ -6,18 +6,28 @@ Handles:
 - MD5 hash-based deduplication
 - Database persistence with conflict resolution
 - Rejected records tracking
+- Streaming persistence in micro-batches (commit as products arrive)
+- Bulk upsert mode (one prefetch query + dialect-aware ON CONFLICT writes)
 """
 
 from pydantic import BaseModel, field_validator, ValidationError
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, AsyncIterator, Callable, Any
+import inspect
 import hashlib
 import json
+from sqlalchemy import bindparam, insert, update
 from sqlalchemy.orm import Session
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Fields compared against the stored row to decide whether to update it
+TRACKED_FIELDS = ('specifications', 'product_name', 'image_urls', 'pdf_urls')
+
+# Rows per prefetch IN (...) / multi-row INSERT (stays under SQLite's variable limit)
+BULK_CHUNK_SIZE = 500
+
 
 class ProductData(BaseModel):
     """Validated product data model"""
@@ -62,11 +72,114 @@ class ProductData(BaseModel):
         return hashlib.md5(data_str.encode()).hexdigest()
 
 
+def _product_row(product: ProductData, data_hash: str, scraper_id: str, now: datetime) -> Dict:
+    """Column values for a new ScrapedProduct row"""
+    return {
+        'scraper_id': scraper_id,
+        'vendor_name': product.vendor_name,
+        'part_number': product.part_number,
+        'product_name': product.product_name,
+        'description': product.description,
+        'category': product.category,
+        'specifications': product.specifications,
+        'image_urls': product.image_urls,
+        'pdf_urls': product.pdf_urls,
+        'source_url': product.source_url,
+        'data_hash': data_hash,
+        'scraped_at': now,
+        'updated_at': now
+    }
+
+
+def _bulk_upsert(
+    products: Dict[str, ProductData],
+    scraper_id: str,
+    db: Session
+) -> Dict[str, int]:
+    """
+    Write a batch of validated products with a constant number of queries
+    
+    1. Prefetch existing rows for all hashes with a single IN query per chunk
+    2. Diff TRACKED_FIELDS in Python; unchanged rows are not written at all
+    3. Write new + changed rows with INSERT ... ON CONFLICT (data_hash) DO UPDATE
+       on PostgreSQL/SQLite, or executemany INSERT + UPDATE elsewhere
+    
+    Args:
+        products: data_hash -> validated product (already deduplicated)
+        scraper_id: ID of scraper that generated the data
+        db: SQLAlchemy database session (caller commits)
+    
+    Returns:
+        {'saved': int, 'updated': int}
+    """
+    from app.models.scraper import ScrapedProduct
+    table = ScrapedProduct.__table__
+    
+    hashes = list(products)
+    existing = {}
+    for start in range(0, len(hashes), BULK_CHUNK_SIZE):
+        chunk = hashes[start:start + BULK_CHUNK_SIZE]
+        rows = db.query(
+            ScrapedProduct.data_hash, *(getattr(ScrapedProduct, field) for field in TRACKED_FIELDS)
+        ).filter(ScrapedProduct.data_hash.in_(chunk)).all()
+        existing.update({row.data_hash: row for row in rows})
+    
+    now = datetime.utcnow()
+    new_rows = []
+    changed_rows = []
+    
+    for data_hash, product in products.items():
+        current = existing.get(data_hash)
+        if current is None:
+            new_rows.append(_product_row(product, data_hash, scraper_id, now))
+        elif any(getattr(current, field) != getattr(product, field) for field in TRACKED_FIELDS):
+            changed_rows.append({
+                'b_data_hash': data_hash,
+                'updated_at': now,
+                **{field: getattr(product, field) for field in TRACKED_FIELDS}
+            })
+    
+    dialect = db.get_bind().dialect.name
+    
+    if dialect in ('postgresql', 'sqlite') and (new_rows or changed_rows):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        
+        # Changed rows need every NOT NULL column for the INSERT half of the upsert
+        upsert_rows = new_rows + [
+            _product_row(products[row['b_data_hash']], row['b_data_hash'], scraper_id, now)
+            for row in changed_rows
+        ]
+        for start in range(0, len(upsert_rows), BULK_CHUNK_SIZE):
+            stmt = dialect_insert(table).values(upsert_rows[start:start + BULK_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['data_hash'],
+                set_={
+                    **{field: stmt.excluded[field] for field in TRACKED_FIELDS},
+                    'updated_at': stmt.excluded.updated_at
+                }
+            )
+            db.execute(stmt)
+    else:
+        if new_rows:
+            db.execute(insert(table), new_rows)
+        if changed_rows:
+            db.execute(
+                update(table).where(table.c.data_hash == bindparam('b_data_hash')),
+                changed_rows
+            )
+    
+    return {'saved': len(new_rows), 'updated': len(changed_rows)}
+
+
 async def validate_and_save_products(
     raw_products: List[Dict],
     scraper_id: str,
     vendor_name: str,
-    db: Session
+    db: Session,
+    bulk: bool = True
 ) -> Dict[str, int]:
     """
     Validate scraped data, deduplicate, and persist to database
@@ -78,11 +191,15 @@ async def validate_and_save_products(
     4. Insert new or update existing
     5. Track rejected records for debugging
     
+    In bulk mode (default) steps 3-4 run once for the whole batch via
+    _bulk_upsert instead of one SELECT per product.
+    
     Args:
         raw_products: List of raw product dictionaries from scraper
         scraper_id: ID of scraper that generated the data
         vendor_name: Vendor name for the products
         db: SQLAlchemy database session
+        bulk: Use the batched prefetch + upsert path
     
     Returns:
         Dictionary with counts: {'saved': int, 'rejected': int, 'rejected_records': [...]}
@@ -93,6 +210,7 @@ async def validate_and_save_products(
     updated_count = 0
     rejected_count = 0
     rejected_records = []
+    valid_products: Dict[str, ProductData] = {}
     
     logger.info(f"Validating {len(raw_products)} products for {vendor_name}")
     
@@ -107,6 +225,11 @@ async def validate_and_save_products(
             # Generate deduplication hash
             data_hash = product.generate_hash()
             
+            if bulk:
+                # Written in one go below; later duplicates in the batch win
+                valid_products[data_hash] = product
+                continue
+            
             # Check if exists
             existing = db.query(ScrapedProduct).filter_by(
                 data_hash=data_hash
@@ -179,6 +302,10 @@ async def validate_and_save_products(
     
     # Commit transaction
     try:
+        if valid_products:
+            counts = _bulk_upsert(valid_products, scraper_id, db)
+            saved_count += counts['saved']
+            updated_count += counts['updated']
         db.commit()
         logger.info(f"Database transaction committed: {saved_count} new, {updated_count} updated, {rejected_count} rejected")
     except Exception as e:
@@ -192,3 +319,65 @@ async def validate_and_save_products(
         'rejected': rejected_count,
         'rejected_records': rejected_records[:10]  # First 10 for debugging
     }
+
+
+async def save_product_stream(
+    products: AsyncIterator[Dict],
+    scraper_id: str,
+    vendor_name: str,
+    db: Session,
+    batch_size: int = 50,
+    on_batch: Optional[Callable[[Dict[str, int], List[Dict]], Any]] = None
+) -> Dict[str, int]:
+    """
+    Consume a product stream and persist it in micro-batches
+    
+    Each batch is validated, upserted and committed as soon as it is full, so
+    a crash late in the crawl keeps everything saved before it and memory
+    stays bounded by batch_size regardless of catalog size.
+    
+    Args:
+        products: Async iterator of raw product dictionaries (ScraperEngine.iter_vendor)
+        scraper_id: ID of scraper that generated the data
+        vendor_name: Vendor name for the products
+        db: SQLAlchemy database session
+        batch_size: Products per validate/commit cycle
+        on_batch: Called with the running totals and the batch's raw products
+                  after every committed batch (may be a coroutine function)
+    
+    Returns:
+        Same shape as validate_and_save_products, plus 'extracted'
+    """
+    totals = {'extracted': 0, 'saved': 0, 'updated': 0, 'rejected': 0, 'rejected_records': []}
+    batch: List[Dict] = []
+    
+    async def flush():
+        result = await validate_and_save_products(batch, scraper_id, vendor_name, db)
+        
+        for key in ('saved', 'updated', 'rejected'):
+            totals[key] += result[key]
+        for record in result['rejected_records']:
+            if len(totals['rejected_records']) < 10:
+                # Make row_index relative to the whole stream
+                totals['rejected_records'].append({**record, 'row_index': totals['extracted'] - len(batch) + record['row_index']})
+        
+        if on_batch:
+            outcome = on_batch(totals, batch)
+            if inspect.isawaitable(outcome):
+                await outcome
+        batch.clear()
+    
+    async for product in products:
+        batch.append(product)
+        totals['extracted'] += 1
+        if len(batch) >= batch_size:
+            await flush()
+    
+    if batch:
+        await flush()
+    
+    logger.info(
+        f"Stream complete for {vendor_name}: {totals['extracted']} extracted, "
+        f"{totals['saved']} new, {totals['updated']} updated, {totals['rejected']} rejected"
+    )
+    return totals
@@ -0,0 +1,150 @@
+"""
+Persistent crawl frontier for crash-resumable scraper jobs
+
+Keyed by ScraperJob.id and stored in Redis (the same instance ARQ uses), so a
+retried (job_try > 1) or re-enqueued job continues where the previous attempt
+stopped instead of restarting from start_urls.
+
+Tracks, per job:
+- Listing pages visited, and per start URL the last listing URL and the
+  pagination depth reached
+- Products already committed to the database, by product_key() (detail
+  URL + part number, since rows without a detail link all share their
+  listing page URL)
+
+Nothing is persisted ahead of the database: the engine only *stages*
+listing progress in memory, and commit() (called by run_scraper_job after each
+product batch is committed) writes staged progress and completed product keys
+to Redis. Products are yielded in order, so any listing position staged before
+a commit only covers products that commit already contains. A crash therefore
+re-does at most one batch of work and never skips unsaved products.
+"""
+
+import json
+import logging
+from typing import Dict, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "scraper:frontier"
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600  # Abandoned frontiers expire after a week
+
+
+def product_key(product: Dict) -> Optional[str]:
+    """Completion key of a product row, or None if it cannot be tracked (no URL or part number)"""
+    url, part_number = product.get('source_url'), product.get('part_number')
+    if not url or not part_number:
+        return None
+    return f"{url}#{part_number}"
+
+
+class CrawlFrontier:
+    """
+    Crawl progress of one ScraperJob
+
+    Reads are served from memory (loaded once with load()); progress is
+    persisted to Redis by commit() so it survives a worker crash or ARQ timeout.
+    """
+
+    def __init__(self, redis, job_id: int, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        self.redis = redis
+        self.job_id = job_id
+        self.ttl_seconds = ttl_seconds
+        self.visited_listings: Set[str] = set()
+        self.completed: Set[str] = set()
+        self.listing_progress: Dict[str, Dict] = {}
+        self._staged_progress: Dict[str, Dict] = {}
+        self._staged_visited: Set[str] = set()
+
+    def _key(self, name: str) -> str:
+        return f"{KEY_PREFIX}:{self.job_id}:{name}"
+
+    @staticmethod
+    def _decode(value) -> str:
+        return value.decode() if isinstance(value, bytes) else value
+
+    @classmethod
+    async def exists(cls, redis, job_id: int) -> bool:
+        """True if a previous attempt of this job left progress behind"""
+        frontier = cls(redis, job_id)
+        return bool(await redis.exists(frontier._key('listings'), frontier._key('completed')))
+
+    async def load(self) -> "CrawlFrontier":
+        """Load previous progress for this job (no-op for a fresh job)"""
+        self.visited_listings = {self._decode(u) for u in await self.redis.smembers(self._key('visited'))}
+        self.completed = {self._decode(u) for u in await self.redis.smembers(self._key('completed'))}
+        progress = await self.redis.hgetall(self._key('listings'))
+        self.listing_progress = {
+            self._decode(start_url): json.loads(self._decode(value))
+            for start_url, value in progress.items()
+        }
+
+        if self.completed or self.listing_progress:
+            logger.info(
+                f"[Job {self.job_id}] Resuming crawl: {len(self.completed)} products done, "
+                f"{len(self.visited_listings)} listing pages visited"
+            )
+        return self
+
+    @property
+    def is_resumed(self) -> bool:
+        return bool(self.completed or self.listing_progress)
+
+    def is_completed(self, product: Dict) -> bool:
+        key = product_key(product)
+        return key is not None and key in self.completed
+
+    def is_listing_visited(self, url: str) -> bool:
+        return url in self.visited_listings
+
+    def depth(self, start_url: str) -> int:
+        """Pagination depth reached for a start URL in a previous attempt"""
+        return self.listing_progress.get(start_url, {}).get('depth', 0)
+
+    def listing_url(self, start_url: str) -> Optional[str]:
+        """Last listing URL visited for a start URL (link-based pagination)"""
+        return self.listing_progress.get(start_url, {}).get('url')
+
+    async def _expire(self, *names: str):
+        for name in names:
+            await self.redis.expire(self._key(name), self.ttl_seconds)
+
+    def stage_listing(self, start_url: str, url: str, depth: int):
+        """Stage the listing page about to be processed (resume point)"""
+        self._staged_progress[start_url] = {'url': url, 'depth': depth}
+
+    def stage_visited(self, url: str):
+        """Stage a listing page whose products have all been yielded"""
+        self._staged_visited.add(url)
+
+    async def commit(self, products: Iterable[Dict] = ()):
+        """
+        Persist progress after a product batch is committed to the database
+
+        Args:
+            products: Products in the committed batch
+        """
+        new_keys = {product_key(product) for product in products} - self.completed - {None}
+        if new_keys:
+            self.completed.update(new_keys)
+            await self.redis.sadd(self._key('completed'), *new_keys)
+            await self._expire('completed')
+
+        if self._staged_visited:
+            self.visited_listings.update(self._staged_visited)
+            await self.redis.sadd(self._key('visited'), *self._staged_visited)
+            await self._expire('visited')
+            self._staged_visited.clear()
+
+        if self._staged_progress:
+            self.listing_progress.update(self._staged_progress)
+            await self.redis.hset(
+                self._key('listings'),
+                mapping={start_url: json.dumps(progress) for start_url, progress in self._staged_progress.items()}
+            )
+            await self._expire('listings')
+            self._staged_progress.clear()
+
+    async def clear(self):
+        """Drop all progress once the job has finished successfully"""
+        await self.redis.delete(self._key('visited'), self._key('listings'), self._key('completed'))
@@ -0,0 +1,213 @@
+"""
+Incremental crawl state and change detection
+
+Lets nightly runs scale with the amount of change instead of catalog size:
+- Listing-row fingerprints: skip the detail visit when a product's row on
+  the listing page is unchanged since the last run
+- HTTP validators: ETag / Last-Modified for conditional GETs (304 = page
+  unchanged; if its listing row changed, the product is re-emitted with the
+  specs saved in scraped_products, looked up per 304)
+- Spec hashes: track which products actually changed specifications
+- Forced full refresh: every URL is re-fetched at least every
+  `full_refresh_hours`, regardless of fingerprints
+
+Per-URL state (hashes and validators only) is loaded into memory once per job and
+written back with save() after the products have been persisted, so a crash
+never marks unsaved products as up to date.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Listing row fields that identify a product version on the listing page
+FINGERPRINT_FIELDS = ('product_name', 'name', 'part_number', 'category', 'image_urls', 'image_url', 'source_url')
+
+
+def listing_fingerprint(row: Dict[str, Any]) -> str:
+    """SHA-256 of the listing-row fields (stable key order)"""
+    data = {field: row.get(field) for field in FINGERPRINT_FIELDS if row.get(field) is not None}
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def content_fingerprint(body: bytes) -> str:
+    """SHA-256 of a raw response body"""
+    return hashlib.sha256(body).hexdigest()
+
+
+def spec_hash(specifications: Dict[str, str]) -> str:
+    """MD5 of the specifications dict (matches ScrapedProduct.data_hash width)"""
+    return hashlib.md5(json.dumps(specifications or {}, sort_keys=True).encode()).hexdigest()
+
+
+class IncrementalState:
+    """
+    In-memory view of ScrapedPageState rows for one scraper
+
+    Args:
+        scraper_id: Scraper the state belongs to
+        states: url -> dict of ScrapedPageState columns
+        full_refresh_hours: Max age of a full fetch before it is forced again
+        force_full: Ignore all fingerprints for this run (still records them)
+        db: Session used to look up saved specifications on a 304
+    """
+
+    def __init__(
+        self,
+        scraper_id: str,
+        states: Optional[Dict[str, Dict[str, Any]]] = None,
+        full_refresh_hours: float = 168,
+        force_full: bool = False,
+        db: Optional[Session] = None
+    ):
+        self.scraper_id = scraper_id
+        self.db = db
+        self.states = states or {}
+        self.full_refresh_after = timedelta(hours=full_refresh_hours)
+        self.force_full = force_full
+        self._dirty = set()
+        self.skipped = 0
+        self.changed_specs = 0
+
+    @classmethod
+    def load(cls, db: Session, scraper_id: str, incremental_config: Dict[str, Any], force_full: bool = False):
+        """Load all page states for a scraper"""
+        from app.models.scraper import ScrapedPageState
+
+        rows = db.query(ScrapedPageState).filter(ScrapedPageState.scraper_id == scraper_id).all()
+        states = {
+            row.url: {
+                'content_fingerprint': row.content_fingerprint,
+                'etag': row.etag,
+                'last_modified': row.last_modified,
+                'spec_hash': row.spec_hash,
+                'last_full_fetch_at': row.last_full_fetch_at,
+            }
+            for row in rows
+        }
+
+        full_refresh_hours = incremental_config.get('full_refresh_hours', 24 * incremental_config.get('full_refresh_days', 7))
+        logger.info(f"Loaded incremental state for {scraper_id}: {len(states)} known URLs")
+        return cls(scraper_id, states, full_refresh_hours, force_full, db=db)
+
+    def _refresh_due(self, state: Dict[str, Any]) -> bool:
+        last_full = state.get('last_full_fetch_at')
+        return last_full is None or datetime.utcnow() - last_full > self.full_refresh_after
+
+    def _touch(self, url: str) -> Dict[str, Any]:
+        self._dirty.add(url)
+        return self.states.setdefault(url, {})
+
+    def is_unchanged(self, url: str, fingerprint: str) -> bool:
+        """True if the URL can be skipped: same fingerprint and no refresh due"""
+        if self.force_full or not url:
+            return False
+        state = self.states.get(url)
+        if not state or self._refresh_due(state):
+            return False
+        return state.get('content_fingerprint') == fingerprint
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a conditional GET"""
+        state = self.states.get(url)
+        if self.force_full or not state or self._refresh_due(state):
+            return {}
+        headers = {}
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            headers['If-Modified-Since'] = state['last_modified']
+        return headers
+
+    def mark_skipped(self, url: str):
+        """Record that a URL was checked and found unchanged"""
+        self.skipped += 1
+        self._touch(url)
+
+    def record_fetch(
+        self,
+        url: str,
+        fingerprint: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        """Record a full fetch of a URL"""
+        state = self._touch(url)
+        now = datetime.utcnow()
+        if state.get('content_fingerprint') != fingerprint:
+            state['last_changed_at'] = now
+        state['content_fingerprint'] = fingerprint
+        state['etag'] = etag
+        state['last_modified'] = last_modified
+        state['last_full_fetch_at'] = now
+
+    def record_not_modified(self, url: str, fingerprint: str):
+        """Record a 304 for a URL, keeping its stored validators"""
+        state = self.states.get(url, {})
+        self.record_fetch(url, fingerprint, etag=state.get('etag'), last_modified=state.get('last_modified'))
+
+    def saved_specs(self, url: str) -> Optional[Dict[str, str]]:
+        """Specifications last saved for a URL's product, or None if unknown (one indexed query)"""
+        from app.models.scraper import ScrapedProduct
+
+        if self.db is None:
+            return None
+        row = self.db.query(ScrapedProduct.specifications).filter(
+            ScrapedProduct.scraper_id == self.scraper_id,
+            ScrapedProduct.source_url == url
+        ).order_by(ScrapedProduct.updated_at.desc()).first()
+        return dict(row.specifications or {}) if row is not None else None
+
+    def fingerprint_changed(self, url: str, fingerprint: str) -> bool:
+        return self.states.get(url, {}).get('content_fingerprint') != fingerprint
+
+    def record_specs(self, url: str, specifications: Dict[str, str]) -> bool:
+        """Record the spec hash for a product URL; returns True if it changed"""
+        state = self._touch(url)
+        new_hash = spec_hash(specifications)
+        changed = state.get('spec_hash') != new_hash
+        if changed:
+            self.changed_specs += 1
+        state['spec_hash'] = new_hash
+        return changed
+
+    def save(self, db: Session):
+        """Persist touched states (call after products are committed)"""
+        from app.models.scraper import ScrapedPageState
+
+        if not self._dirty:
+            return
+
+        now = datetime.utcnow()
+        existing = {
+            row.url: row
+            for row in db.query(ScrapedPageState).filter(
+                ScrapedPageState.scraper_id == self.scraper_id,
+                ScrapedPageState.url.in_(self._dirty)
+            )
+        }
+
+        for url in self._dirty:
+            state = self.states[url]
+            row = existing.get(url)
+            if row is None:
+                row = ScrapedPageState(scraper_id=self.scraper_id, url=url)
+                db.add(row)
+            for column in ('content_fingerprint', 'etag', 'last_modified', 'spec_hash',
+                           'last_changed_at', 'last_full_fetch_at'):
+                if column in state:
+                    setattr(row, column, state[column])
+            row.last_checked_at = now
+
+        db.commit()
+        logger.info(
+            f"Saved incremental state for {self.scraper_id}: {len(self._dirty)} URLs touched, "
+            f"{self.skipped} skipped as unchanged, {self.changed_specs} with changed specs"
+        )
+        self._dirty.clear()
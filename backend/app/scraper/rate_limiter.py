@@ -0,0 +1,71 @@
+"""
+Per-host token-bucket rate limiting for the HTTP scraper
+
+Each host gets its own bucket (`requests_per_second` refill, `burst`
+capacity), so concurrent fetches against one vendor stay polite while other
+hosts (CDNs, datasheet servers) are not throttled by it. A host can also be
+paused explicitly, e.g. when it answers 429 with Retry-After.
+"""
+
+import asyncio
+import time
+from typing import Dict
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """Async token bucket: acquire() waits until a token is available"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class HostRateLimiter:
+    """
+    Token buckets keyed by host
+
+    Args:
+        requests_per_second: Sustained rate per host
+        burst: Requests allowed back-to-back before throttling kicks in
+    """
+
+    def __init__(self, requests_per_second: float = 2.0, burst: float = 4.0):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.requests_per_second, self.burst)
+        return self._buckets[host]
+
+    async def acquire(self, url: str):
+        await self._bucket(url).acquire()
+
+    def pause(self, url: str, seconds: float):
+        """Stop all requests to the URL's host for `seconds`"""
+        self._bucket(url).pause(seconds)
@@ -0,0 +1,157 @@
+"""
+Adaptive page readiness detection for the Playwright scraper
+
+Replaces fixed sleeps with waits that end as soon as the page is usable:
+- Selector presence (any of the configured selectors is attached)
+- DOM-mutation quiescence (no DOM changes for `quiet_ms`)
+- Row-count growth after a "Show More" click
+
+Every wait is capped by `max_wait_ms` and returns the time it actually took,
+which is aggregated in ReadinessStats for the job summary.
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUIET_MS = 500
+DEFAULT_MAX_WAIT_MS = 8000
+
+# Resolves once the DOM has been quiet for quietMs, or after maxMs at the latest
+_QUIESCENCE_JS = """([quietMs, maxMs]) => new Promise(resolve => {
+    const start = performance.now();
+    let finished = false;
+    let quietTimer = null;
+    const root = document.documentElement || document;
+    const done = () => {
+        if (finished) return;
+        finished = true;
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(capTimer);
+        resolve(performance.now() - start);
+    };
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(done, quietMs);
+    });
+    observer.observe(root, {childList: true, subtree: true, characterData: true});
+    quietTimer = setTimeout(done, quietMs);
+    const capTimer = setTimeout(done, maxMs);
+})"""
+
+_ROW_GROWTH_JS = """([selector, previous]) => document.querySelectorAll(selector).length > previous"""
+
+
+class ReadinessStats:
+    """Collects how long pages took to become ready, per wait kind"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self.timeouts: Dict[str, int] = {}
+
+    def record(self, kind: str, elapsed_ms: float, timed_out: bool = False):
+        self.samples.setdefault(kind, []).append(elapsed_ms)
+        if timed_out:
+            self.timeouts[kind] = self.timeouts.get(kind, 0) + 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for kind, values in self.samples.items():
+            ordered = sorted(values)
+            result[kind] = {
+                'count': len(ordered),
+                'avg_ms': round(sum(ordered) / len(ordered), 1),
+                'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+                'max_ms': round(ordered[-1], 1),
+                'timeouts': self.timeouts.get(kind, 0),
+            }
+        return result
+
+
+async def wait_for_quiescence(page, quiet_ms: int = DEFAULT_QUIET_MS, max_wait_ms: int = DEFAULT_MAX_WAIT_MS) -> float:
+    """Wait until the DOM stops mutating; returns elapsed milliseconds"""
+    try:
+        return float(await page.evaluate(_QUIESCENCE_JS, [quiet_ms, max_wait_ms]))
+    except Exception as e:
+        # Navigation destroyed the execution context; treat as settled
+        logger.debug(f"Quiescence wait interrupted: {e}")
+        return 0.0
+
+
+async def wait_until_ready(
+    page,
+    selectors: List[str],
+    quiet_ms: int = DEFAULT_QUIET_MS,
+    max_wait_ms: int = DEFAULT_MAX_WAIT_MS,
+    stats: Optional[ReadinessStats] = None,
+    kind: str = 'detail'
+) -> float:
+    """
+    Wait until any of `selectors` is attached and the DOM is quiet
+
+    Args:
+        page: Playwright page (already navigated)
+        selectors: Candidate selectors; the first one to appear wins
+        quiet_ms: Required mutation-free window
+        max_wait_ms: Hard cap for the whole wait
+        stats: Optional collector to record the elapsed time into
+        kind: Label used in stats
+
+    Returns:
+        Milliseconds until the page was considered ready
+    """
+    started = time.perf_counter()
+    timed_out = False
+
+    if selectors:
+        try:
+            await page.wait_for_selector(', '.join(selectors), state='attached', timeout=max_wait_ms)
+        except Exception:
+            timed_out = True
+            logger.debug(f"None of {selectors} appeared within {max_wait_ms}ms")
+
+    remaining = max_wait_ms - (time.perf_counter() - started) * 1000
+    if remaining > 0:
+        await wait_for_quiescence(page, quiet_ms, int(remaining))
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if stats is not None:
+        stats.record(kind, elapsed_ms, timed_out)
+    return elapsed_ms
+
+
+async def wait_for_row_growth(
+    page,
+    selector: str,
+    previous_count: int,
+    quiet_ms: int = DEFAULT_QUIET_MS,
+    max_wait_ms: int = DEFAULT_MAX_WAIT_MS,
+    stats: Optional[ReadinessStats] = None
+) -> bool:
+    """
+    Wait for more than `previous_count` rows matching `selector` (e.g. after
+    clicking "Show More"), then for the DOM to settle
+
+    Returns:
+        True if new rows appeared before the cap, False otherwise
+    """
+    started = time.perf_counter()
+    grew = True
+
+    try:
+        await page.wait_for_function(_ROW_GROWTH_JS, arg=[selector, previous_count], timeout=max_wait_ms)
+    except Exception:
+        grew = False
+
+    if grew:
+        remaining = max_wait_ms - (time.perf_counter() - started) * 1000
+        if remaining > 0:
+            await wait_for_quiescence(page, quiet_ms, int(remaining))
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if stats is not None:
+        stats.record('pagination', elapsed_ms, not grew)
+    return grew
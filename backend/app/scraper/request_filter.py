@@ -0,0 +1,142 @@
+"""
+Network request interception for the Playwright scraper
+
+The engine only reads DOM text and image URL attributes, so most of the
+traffic a vendor page pulls in (images, fonts, video, analytics) is wasted
+bandwidth, page-load latency and browser RSS.
+
+Rules come from the `network` section of each scraper in scraper_config.yaml:
+- allow_url_patterns: always let through (checked first)
+- block_url_patterns: abort matching URLs (analytics, tag managers, ...)
+- block_resource_types: abort by Playwright resource type (media, font, ...)
+- stub_resource_types: answer with a tiny placeholder instead of the real
+  payload. Used for images so lazy-loaders still fire their `load` event and
+  mark <img> elements as loaded, which the selectors rely on.
+
+URL patterns are shell-style globs (e.g. "*google-analytics.com*").
+"""
+
+import base64
+import logging
+from collections import defaultdict
+from fnmatch import fnmatch
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# 1x1 transparent GIF served in place of stubbed images
+PLACEHOLDER_GIF = base64.b64decode(
+    "R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
+)
+
+# Never intercept the documents we navigate to
+NEVER_BLOCK_TYPES = {'document'}
+
+
+class RequestFilter:
+    """
+    Route-interception layer attached to a shared BrowserContext
+
+    Keeps per-page counters (keyed by the Playwright Page that issued the
+    request) so the engine can report what each page visit blocked, plus
+    job-wide totals for the final summary.
+
+    Aborted requests never reach the network, so their size is unknown; the
+    byte counters report what was actually loaded (from Content-Length), which
+    is the figure that shrinks when blocking works.
+    """
+
+    def __init__(self, network_config: Dict[str, Any]):
+        network_config = network_config or {}
+        self.allow_patterns: List[str] = network_config.get('allow_url_patterns', [])
+        self.block_patterns: List[str] = network_config.get('block_url_patterns', [])
+        self.block_types = set(network_config.get('block_resource_types', [])) - NEVER_BLOCK_TYPES
+        self.stub_types = set(network_config.get('stub_resource_types', [])) - NEVER_BLOCK_TYPES
+
+        self._page_stats: Dict[int, Dict[str, Any]] = defaultdict(self._empty_stats)
+        self.totals = self._empty_stats()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.block_patterns or self.block_types or self.stub_types)
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        return {
+            'requests_allowed': 0,
+            'requests_blocked': 0,
+            'requests_stubbed': 0,
+            'bytes_loaded': 0,
+            'blocked_by_type': defaultdict(int),
+        }
+
+    async def attach(self, context):
+        """Install the route handler and response accounting on a context"""
+        await context.route("**/*", self._handle_route)
+        context.on("response", self._on_response)
+        logger.info(
+            f"Request filter active: block types={sorted(self.block_types)}, "
+            f"stub types={sorted(self.stub_types)}, {len(self.block_patterns)} URL pattern(s)"
+        )
+
+    def decide(self, url: str, resource_type: str) -> str:
+        """Return 'allow', 'block' or 'stub' for a request"""
+        if resource_type in NEVER_BLOCK_TYPES:
+            return 'allow'
+        if any(fnmatch(url, pattern) for pattern in self.allow_patterns):
+            return 'allow'
+        if any(fnmatch(url, pattern) for pattern in self.block_patterns):
+            return 'block'
+        if resource_type in self.block_types:
+            return 'block'
+        if resource_type in self.stub_types:
+            return 'stub'
+        return 'allow'
+
+    async def _handle_route(self, route):
+        request = route.request
+        resource_type = request.resource_type
+        decision = self.decide(request.url, resource_type)
+
+        for stats in (self._stats_for(request), self.totals):
+            if decision == 'allow':
+                stats['requests_allowed'] += 1
+            else:
+                stats['requests_stubbed' if decision == 'stub' else 'requests_blocked'] += 1
+                stats['blocked_by_type'][resource_type] += 1
+
+        try:
+            if decision == 'block':
+                await route.abort('blockedbyclient')
+            elif decision == 'stub':
+                await route.fulfill(status=200, content_type='image/gif', body=PLACEHOLDER_GIF)
+            else:
+                await route.continue_()
+        except Exception as e:
+            # Page closed mid-flight; nothing to route anymore
+            logger.debug(f"Route handling failed for {request.url}: {e}")
+
+    def _on_response(self, response):
+        try:
+            size = int(response.headers.get('content-length', 0))
+        except (TypeError, ValueError):
+            size = 0
+        self._stats_for(response.request)['bytes_loaded'] += size
+        self.totals['bytes_loaded'] += size
+
+    def _stats_for(self, request) -> Dict[str, Any]:
+        try:
+            page = request.frame.page
+        except Exception:
+            # Service worker requests have no owning frame
+            page = None
+        return self._page_stats[id(page)]
+
+    def pop_page_stats(self, page) -> Dict[str, Any]:
+        """Return and reset the counters for one page (call after each visit)"""
+        stats = self._page_stats.pop(id(page), None) or self._empty_stats()
+        stats['blocked_by_type'] = dict(stats['blocked_by_type'])
+        return stats
+
+    def summary(self) -> Dict[str, Any]:
+        return {**self.totals, 'blocked_by_type': dict(self.totals['blocked_by_type'])}
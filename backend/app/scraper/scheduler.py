@@ -3,45 +3,181 @@ ARQ-based job scheduler for web scraping
 
 Features:
 - Redis-backed job queue with persistence
-- CRITICAL: max_jobs=1 to enforce single concurrent scraper
+- CRITICAL: Memory-aware admission control (jobs share a memory budget)
 - Cron-based scheduling for daily/weekly scrapes
 - Full job monitoring and error tracking
 - Exponential backoff retry logic
+- Incremental nightly runs (only changed products are re-scraped)
+- Crash-resumable jobs (retries continue from the persisted crawl frontier)
+- Catalog vectorization (Qdrant) queued after scrapes that changed products
 """
 
 from arq import create_pool, cron
 from arq.connections import RedisSettings, ArqRedis
 import yaml
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy import or_, and_
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.scraper import ScraperJob
 from app.scraper.scraper_engine import ScraperEngine
-from app.scraper.data_pipeline import validate_and_save_products
+from app.scraper.data_pipeline import save_product_stream
+from app.scraper.incremental import IncrementalState
+from app.scraper.frontier import CrawlFrontier, DEFAULT_TTL_SECONDS
+from app.scraper.admission import AdmissionController, NotAdmitted
+from contextlib import nullcontext
 import logging
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Tuple
 
 logger = logging.getLogger(__name__)
 
-# CRITICAL: Concurrency limit enforced at Redis level
-# Only 1 scraping job can run at a time (memory constraint)
+CONFIG_PATH = Path(__file__).parent / 'scraper_config.yaml'
+
 REDIS_SETTINGS = RedisSettings(
     host='redis',  # Docker service name
     port=6379,
     database=0
 )
 
+# Maps an ARQ job ID to the ScraperJob row its attempts share
+ARQ_JOB_KEY = "scraper:arq-job:{}"
+
+# Held while the catalog indexer runs; its cursor must not be advanced twice at once
+INDEX_LOCK_KEY = "catalog-index:lock"
+# ARQ job ID of the follow-up indexer queued while the lock was held
+INDEX_PENDING_KEY = "catalog-index:pending"
+INDEX_DEFER_SECONDS = 120
+# Delay before re-trying a scraper job that did not fit in the memory budget
+ADMISSION_DEFER_SECONDS = 60
+
+
+def _load_config_file() -> Dict[str, Any]:
+    with open(CONFIG_PATH) as f:
+        return yaml.safe_load(f)
+
+
+def load_worker_config() -> Dict[str, Any]:
+    """
+    Load the `worker` section of scraper_config.yaml
+    
+    Falls back to the historical single-job behaviour if the file or the
+    section is missing.
+    """
+    try:
+        return _load_config_file().get('worker') or {'max_jobs': 1}
+    except Exception as e:
+        logger.error(f"Failed to load worker config: {e}", exc_info=True)
+        return {'max_jobs': 1}
+
+
+def _scraping_method(scraper_id: str) -> str:
+    """Scraping method of a scraper, used to size its admission footprint"""
+    for scraper in _load_config_file().get('scrapers', []):
+        if scraper.get('id') == scraper_id:
+            return scraper.get('scraping_method', 'playwright')
+    return 'playwright'
+
 
-async def run_scraper_job(ctx: dict, scraper_id: str) -> dict:
+async def _claim_job_record(ctx: dict, db: Session, scraper_id: str, full_refresh: bool) -> Tuple[ScraperJob, bool]:
+    """
+    Get the ScraperJob row for this attempt
+    
+    - ARQ retry (same ctx['job_id']): reuse the row of the earlier attempt
+    - Re-enqueued job: adopt the latest interrupted job of this scraper that
+      still has a crawl frontier (unless full_refresh is requested)
+    - Otherwise: create a new row
+    
+    Returns:
+        (job, resumed)
+    """
+    redis = ctx.get('redis')
+    arq_job_id = ctx.get('job_id')
+    job = None
+    
+    if redis is not None and arq_job_id:
+        previous_id = await redis.get(ARQ_JOB_KEY.format(arq_job_id))
+        if previous_id:
+            job = db.query(ScraperJob).filter(ScraperJob.id == int(previous_id)).first()
+    
+    if job is None and redis is not None and not full_refresh:
+        # A job stuck in 'running' past the timeout was killed by ARQ
+        stale_before = datetime.utcnow() - timedelta(seconds=WorkerSettings.job_timeout)
+        candidate = db.query(ScraperJob).filter(
+            ScraperJob.scraper_id == scraper_id,
+            or_(
+                ScraperJob.status == 'failed',
+                and_(ScraperJob.status == 'running', ScraperJob.started_at < stale_before)
+            )
+        ).order_by(ScraperJob.id.desc()).first()
+        if candidate and await CrawlFrontier.exists(redis, candidate.id):
+            job = candidate
+    
+    resumed = job is not None
+    if job is None:
+        job = ScraperJob(
+            scraper_id=scraper_id,
+            status='running',
+            started_at=datetime.utcnow()
+        )
+        db.add(job)
+    else:
+        job.status = 'running'
+        job.error_message = None
+        job.completed_at = None
+    db.commit()
+    
+    if redis is not None and arq_job_id:
+        await redis.set(ARQ_JOB_KEY.format(arq_job_id), job.id, ex=DEFAULT_TTL_SECONDS)
+    
+    return job, resumed
+
+
+async def run_scraper_job(ctx: dict, scraper_id: str, full_refresh: bool = False) -> dict:
     """
     ARQ worker function: Execute scraper job with full monitoring
     
     This is the main entry point for scheduled and manual scraper jobs.
+    A job that does not fit in the memory budget is not held open waiting
+    (that would count against job_timeout and max_tries): it is re-enqueued
+    as a new job in ADMISSION_DEFER_SECONDS and only runs once admitted.
+    
+    Args:
+        ctx: ARQ context (contains redis connection, admission controller, etc.)
+        scraper_id: ID from scraper_config.yaml (e.g., 'sick-ag-products')
+        full_refresh: Ignore incremental state and re-scrape every product
+    
+    Returns:
+        Result dictionary with job statistics
+    """
+    admission = ctx.get('admission')
+    redis = ctx.get('redis')
+    if admission is None:
+        return await _execute_scraper_job(ctx, scraper_id, full_refresh)
+    
+    job_label = f"{scraper_id}:{ctx.get('job_id', '-')}"
+    try:
+        # Without Redis there is nowhere to re-enqueue to, so wait in place
+        async with admission.admit(job_label, _scraping_method(scraper_id), wait=redis is None):
+            return await _execute_scraper_job(ctx, scraper_id, full_refresh)
+    except NotAdmitted as e:
+        follow_up = await redis.enqueue_job('run_scraper_job', scraper_id, full_refresh, _defer_by=ADMISSION_DEFER_SECONDS)
+        # Point the follow-up at this job's ScraperJob row (set by an earlier attempt) so it resumes the crawl
+        previous_id = await redis.get(ARQ_JOB_KEY.format(ctx['job_id'])) if ctx.get('job_id') else None
+        if previous_id and follow_up is not None:
+            await redis.set(ARQ_JOB_KEY.format(follow_up.job_id), previous_id, ex=DEFAULT_TTL_SECONDS)
+        logger.info(f"Admission: {e}; re-enqueued in {ADMISSION_DEFER_SECONDS}s")
+        return {'status': 'deferred'}
+
+
+async def _execute_scraper_job(ctx: dict, scraper_id: str, full_refresh: bool = False) -> dict:
+    """
+    Run an admitted scraper job
     
     Args:
         ctx: ARQ context (contains redis connection, etc.)
         scraper_id: ID from scraper_config.yaml (e.g., 'sick-ag-products')
+        full_refresh: Ignore incremental state and re-scrape every product
     
     Returns:
         Result dictionary with job statistics
@@ -51,49 +187,76 @@ async def run_scraper_job(ctx: dict, scraper_id: str) -> dict:
     """
     db: Session = next(get_db())
     
-    # Create job record in database
-    job = ScraperJob(
-        scraper_id=scraper_id,
-        status='running',
-        started_at=datetime.utcnow()
-    )
-    db.add(job)
-    db.commit()
-    
+    # Create (or resume) job record in database
+    job, resumed = await _claim_job_record(ctx, db, scraper_id, full_refresh)
     job_id = job.id
     
     try:
-        logger.info(f"[Job {job_id}] Starting scraper: {scraper_id}")
+        logger.info(f"[Job {job_id}] {'Resuming' if resumed else 'Starting'} scraper: {scraper_id}")
+        
+        # Crawl frontier: lets a retry skip work committed by earlier attempts
+        frontier = None
+        if ctx.get('redis') is not None:
+            frontier = await CrawlFrontier(ctx['redis'], job_id).load()
         
         # Load configuration and initialize engine
-        config_path = Path(__file__).parent / 'scraper_config.yaml'
-        engine = ScraperEngine(str(config_path))
+        engine = ScraperEngine(str(CONFIG_PATH))
         config = engine.configs[scraper_id]
         
         logger.info(f"[Job {job_id}] Scraping {config.vendor_name} from {len(config.start_urls)} URLs")
         
-        # Execute scraping
-        raw_products = await engine.scrape_vendor(scraper_id)
-        job.records_extracted = len(raw_products)
-        db.commit()
+        # Incremental mode: skip products unchanged since the last run
+        state = None
+        if config.incremental.get('enabled'):
+            state = IncrementalState.load(db, scraper_id, config.incremental, force_full=full_refresh)
         
-        logger.info(f"[Job {job_id}] Extracted {len(raw_products)} products")
+        # Counters continue from earlier attempts of the same job
+        base_extracted = job.records_extracted or 0
+        base_saved = job.records_saved or 0
+        base_rejected = job.records_rejected or 0
         
-        # Validate and save to database
-        result = await validate_and_save_products(
-            raw_products=raw_products,
+        async def on_batch_committed(totals: dict, batch: list):
+            # Live progress: counters reflect every committed batch
+            job.records_extracted = base_extracted + totals['extracted']
+            job.records_saved = base_saved + totals['saved'] + totals['updated']
+            job.records_rejected = base_rejected + totals['rejected']
+            db.commit()
+            
+            if frontier is not None:
+                await frontier.commit(batch)
+        
+        # Scrape and persist in micro-batches as products arrive
+        result = await save_product_stream(
+            engine.iter_vendor(scraper_id, state=state, frontier=frontier),
             scraper_id=scraper_id,
             vendor_name=config.vendor_name,
-            db=db
+            db=db,
+            batch_size=config.limits.get('batch_size', 50),
+            on_batch=on_batch_committed
         )
         
+        logger.info(f"[Job {job_id}] Extracted {result['extracted']} products")
+        
+        # Only mark URLs as up to date once their products are committed
+        if state is not None:
+            state.save(db)
+        
         # Update job status
         job.status = 'completed'
-        job.records_saved = result['saved'] + result.get('updated', 0)
-        job.records_rejected = result['rejected']
+        job.records_saved = base_saved + result['saved'] + result.get('updated', 0)
+        job.records_rejected = base_rejected + result['rejected']
         job.completed_at = datetime.utcnow()
         db.commit()
         
+        if frontier is not None:
+            await frontier.clear()
+            if ctx.get('job_id'):
+                await ctx['redis'].delete(ARQ_JOB_KEY.format(ctx['job_id']))
+        
+        # New or changed products: bring the vector index up to date
+        if ctx.get('redis') is not None and (result['saved'] or result.get('updated', 0)):
+            await ctx['redis'].enqueue_job('index_catalog_job', _job_id=f"catalog-index-{job_id}")
+        
         logger.info(
             f"[Job {job_id}] Completed successfully: "
             f"{result['saved']} saved, {result.get('updated', 0)} updated, "
@@ -104,10 +267,11 @@ async def run_scraper_job(ctx: dict, scraper_id: str) -> dict:
             'job_id': job_id,
             'scraper_id': scraper_id,
             'status': 'completed',
-            'records_extracted': len(raw_products),
+            'records_extracted': result['extracted'],
             'records_saved': result['saved'],
             'records_updated': result.get('updated', 0),
-            'records_rejected': result['rejected']
+            'records_rejected': result['rejected'],
+            'records_unchanged': state.skipped if state is not None else 0
         }
         
     except Exception as e:
@@ -126,10 +290,60 @@ async def run_scraper_job(ctx: dict, scraper_id: str) -> dict:
         db.close()
 
 
+async def index_catalog_job(ctx: dict, full: bool = False) -> dict:
+    """
+    ARQ worker function: Embed new/changed scraped products into Qdrant
+    
+    Incremental by default (see app/ai/catalog_indexer.py). Runs under the
+    'indexer' admission footprint since it loads CLIP. Only one indexer runs
+    at a time. A run that finds the lock held returns without indexing and
+    queues a single follow-up job (a new job, so waiting never uses up
+    max_tries); the running indexer's cursor may already be past products
+    saved since it started, and the follow-up picks them up. Incremental
+    requests fold into an already queued follow-up, full ones queue their own.
+    
+    Args:
+        ctx: ARQ context
+        full: Re-embed the whole catalog
+    """
+    from app.ai.catalog_indexer import CatalogIndexer
+    
+    redis = ctx.get('redis')
+    job_id = ctx.get('job_id', '-')
+    if redis is not None and not await redis.set(INDEX_LOCK_KEY, job_id, nx=True, ex=WorkerSettings.job_timeout):
+        pending = await redis.get(INDEX_PENDING_KEY)
+        pending = pending.decode() if isinstance(pending, bytes) else pending
+        if full or pending in (None, job_id):
+            follow_up = await redis.enqueue_job('index_catalog_job', full, _defer_by=INDEX_DEFER_SECONDS)
+            if follow_up is not None and not full:
+                await redis.set(INDEX_PENDING_KEY, follow_up.job_id, ex=WorkerSettings.job_timeout)
+            logger.info(f"Catalog indexer busy; queued follow-up run in {INDEX_DEFER_SECONDS}s")
+        else:
+            logger.info(f"Catalog indexer busy; follow-up run {pending} already queued")
+        return {'status': 'deferred'}
+    
+    if redis is not None and await redis.get(INDEX_PENDING_KEY) in (job_id, job_id.encode()):
+        await redis.delete(INDEX_PENDING_KEY)
+    
+    admission = ctx.get('admission')
+    gate = admission.admit(f"catalog-index:{ctx.get('job_id', '-')}", 'indexer') if admission else nullcontext()
+    
+    db: Session = next(get_db())
+    try:
+        async with gate:
+            return await CatalogIndexer(db).run(full=full)
+    finally:
+        db.close()
+        if redis is not None:
+            await redis.delete(INDEX_LOCK_KEY)
+
+
 async def startup(ctx: dict):
     """Initialize resources when worker starts"""
     logger.info("ARQ worker starting up")
     ctx['startup_time'] = datetime.utcnow()
+    ctx['admission'] = AdmissionController.from_config(WORKER_CONFIG)
+    logger.info(f"Admission controller ready: {ctx['admission'].status()}")
 
 
 async def shutdown(ctx: dict):
@@ -137,20 +351,24 @@ async def shutdown(ctx: dict):
     logger.info("ARQ worker shutting down")
 
 
+WORKER_CONFIG = load_worker_config()
+
+
 # ARQ worker settings
 class WorkerSettings:
     """
     ARQ worker configuration
     
     CRITICAL SETTINGS:
-    - max_jobs=1: Only 1 concurrent job (memory constraint)
-    - job_timeout=3600: 1 hour max per job
+    - max_jobs: Upper bound on concurrent jobs; the real limit is the memory
+      budget enforced by AdmissionController (see `worker` in scraper_config.yaml)
+    - job_timeout=3600: 1 hour max per job (jobs that don't fit are re-enqueued, not held waiting)
     """
-    functions = [run_scraper_job]
+    functions = [run_scraper_job, index_catalog_job]
     redis_settings = REDIS_SETTINGS
     
     # CRITICAL: Resource constraints
-    max_jobs = 1  # Only 1 scraping job at a time (memory safety)
+    max_jobs = WORKER_CONFIG.get('max_jobs', 1)  # Admission controller decides within this cap
     job_timeout = 3600  # 1 hour max per job
     
     # Retry configuration
@@ -176,11 +394,8 @@ def get_cron_jobs() -> List:
     Returns:
         List of ARQ cron job definitions
     """
-    config_path = Path(__file__).parent / 'scraper_config.yaml'
-    
     try:
-        with open(config_path) as f:
-            config = yaml.safe_load(f)
+        config = _load_config_file()
         
         cron_jobs = []
         
@@ -230,12 +445,13 @@ def get_cron_jobs() -> List:
 WorkerSettings.cron_jobs = get_cron_jobs()  # Call function to get list
 
 
-async def enqueue_scraper_job(scraper_id: str) -> str:
+async def enqueue_scraper_job(scraper_id: str, full_refresh: bool = False) -> str:
     """
     Manually enqueue a scraper job (for API triggers)
     
     Args:
         scraper_id: ID from scraper_config.yaml
+        full_refresh: Bypass incremental change detection for this run
     
     Returns:
         ARQ job ID
@@ -245,6 +461,7 @@ async def enqueue_scraper_job(scraper_id: str) -> str:
     job = await redis.enqueue_job(
         'run_scraper_job',
         scraper_id,
+        full_refresh,
         _job_id=f"scraper-{scraper_id}-{int(datetime.utcnow().timestamp())}"
     )
     
@@ -4,21 +4,46 @@ Memory-optimized web scraper engine
 Supports:
 - Playwright for JavaScript-heavy sites (SICK AG, etc.)
 - HTTP requests for static HTML sites (faster, lower memory)
+- Async HTTP crawler with per-host rate limiting and HTTP/2 keep-alive
 - Browser reuse across pages (single instance per job)
-- Automatic table parsing for specifications
+- Bounded pool of reusable detail pages for concurrent child page visits
+- Request interception to block heavy/irrelevant resources
+- Adaptive readiness waits instead of fixed sleeps
+- Incremental mode (skip unchanged products, conditional GETs)
+- Streaming output (async generator) so memory stays flat per job
+- Crash-resumable crawls via a persistent frontier
+- Automatic table parsing for specifications (lxml, bs4 or in-browser backend)
 """
 
+import asyncio
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 from bs4 import BeautifulSoup
 import httpx
 import yaml
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Union
 from pydantic import BaseModel, field_validator
 import logging
+import random
 from pathlib import Path
+from urllib.parse import urljoin
+from app.scraper.request_filter import RequestFilter
+from app.scraper.readiness import ReadinessStats, wait_until_ready, wait_for_row_growth
+from app.scraper.incremental import IncrementalState, listing_fingerprint, content_fingerprint
+from app.scraper.frontier import CrawlFrontier
+from app.scraper.rate_limiter import HostRateLimiter
+from app.scraper.spec_parser import (
+    BACKENDS as PARSER_BACKENDS,
+    BROWSER_EXTRACT_JS,
+    DEFAULT_BACKEND as DEFAULT_PARSER_BACKEND,
+    pairs_to_specs,
+    parse_spec_table,
+)
 
 logger = logging.getLogger(__name__)
 
+# Statuses worth retrying with backoff in the HTTP crawler
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
 
 class ScraperConfig(BaseModel):
     """Configuration model with validation"""
@@ -30,7 +55,11 @@ class ScraperConfig(BaseModel):
     selectors: Dict[str, str]
     pagination: Dict[str, Any]
     child_pages: Dict[str, Any]
-    limits: Dict[str, int]
+    limits: Dict[str, Union[int, float]]  # Counts stay int; rates and delays may be fractional
+    network: Dict[str, Any] = {}
+    readiness: Dict[str, Any] = {}
+    incremental: Dict[str, Any] = {}
+    parser_backend: str = DEFAULT_PARSER_BACKEND
     schedule: Optional[str] = None
     
     @field_validator('base_url')
@@ -46,6 +75,13 @@ class ScraperConfig(BaseModel):
         if v not in ['playwright', 'http']:
             raise ValueError('scraping_method must be "playwright" or "http"')
         return v
+    
+    @field_validator('parser_backend')
+    @classmethod
+    def validate_parser_backend(cls, v):
+        if v not in PARSER_BACKENDS:
+            raise ValueError(f'parser_backend must be one of {PARSER_BACKENDS}')
+        return v
 
 
 class ScraperEngine:
@@ -56,6 +92,7 @@ class ScraperEngine:
     - Single browser instance per job (700MB RAM)
     - Browser reused across all pages
     - Pages closed immediately after extraction
+    - Detail pages pooled (limits.detail_concurrency tabs, ~100MB each)
     - Total memory budget: ~1.5GB peak
     """
     
@@ -69,18 +106,50 @@ class ScraperEngine:
             configs = yaml.safe_load(f)['scrapers']
             self.configs = {c['id']: ScraperConfig(**c) for c in configs}
         
+        self.readiness_stats = ReadinessStats()
+        
         logger.info(f"Loaded {len(self.configs)} scraper configurations")
     
-    async def scrape_vendor(self, scraper_id: str) -> List[Dict]:
+    async def scrape_vendor(self, scraper_id: str, state: Optional[IncrementalState] = None) -> List[Dict]:
         """
-        Execute scraping job for specified vendor
+        Execute scraping job for specified vendor and collect all products
+        
+        Convenience wrapper around iter_vendor() for small catalogs and
+        debugging. Scheduled jobs stream instead (see run_scraper_job).
         
         Args:
             scraper_id: ID from scraper_config.yaml (e.g., 'sick-ag-products')
+            state: Incremental crawl state; unchanged products are skipped and
+                   left out of the result when provided
         
         Returns:
             List of product dictionaries
         
+        Raises:
+            ValueError: If scraper_id not found
+        """
+        return [product async for product in self.iter_vendor(scraper_id, state)]
+    
+    async def iter_vendor(
+        self,
+        scraper_id: str,
+        state: Optional[IncrementalState] = None,
+        frontier: Optional[CrawlFrontier] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Execute scraping job for specified vendor, yielding products as soon as
+        their details are extracted
+        
+        Args:
+            scraper_id: ID from scraper_config.yaml (e.g., 'sick-ag-products')
+            state: Incremental crawl state (see scrape_vendor)
+            frontier: Progress of a previous attempt of the same job; committed
+                      products are skipped and pagination resumes from the
+                      recorded listing page
+        
+        Yields:
+            Product dictionaries
+        
         Raises:
             ValueError: If scraper_id not found
         """
@@ -91,17 +160,26 @@ class ScraperEngine:
         logger.info(f"Starting scraper: {scraper_id} ({config.vendor_name})")
         
         if config.scraping_method == "playwright":
-            return await self._scrape_with_playwright(config)
+            products = self._scrape_with_playwright(config, state, frontier)
         else:
-            return await self._scrape_with_http(config)
+            products = self._scrape_with_http(config, state, frontier)
+        
+        async for product in products:
+            yield product
     
-    async def _scrape_with_playwright(self, config: ScraperConfig) -> List[Dict]:
+    async def _scrape_with_playwright(
+        self,
+        config: ScraperConfig,
+        state: Optional[IncrementalState] = None,
+        frontier: Optional[CrawlFrontier] = None
+    ) -> AsyncIterator[Dict]:
         """
         Playwright scraper with CRITICAL memory optimizations:
         1. Single browser instance (reused across all pages)
         2. Single context (shared for all pages)
         3. Headless mode with minimal args (saves 34% RAM)
         4. Pages closed immediately after extraction
+        5. Products yielded per listing interaction, never accumulated
         
         Memory budget: ~700MB for browser + 300MB for data processing
         """
@@ -126,8 +204,14 @@ class ScraperEngine:
                 user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             )
             
-            all_products = []
+            # Drop images/fonts/analytics before they hit the network
+            request_filter = RequestFilter(config.network)
+            if request_filter.enabled:
+                await request_filter.attach(context)
+            
+            total_products = 0
             processed_parts = set()
+            self.readiness_stats = ReadinessStats()
             
             for start_url in config.start_urls:
                 current_url = start_url
@@ -137,6 +221,13 @@ class ScraperEngine:
                 logger.info(f"Starting pagination from: {start_url}")
                 max_pages = config.pagination.get('max_pages', 5) # Default to 5 pages for 'Show More'
                 
+                # Link-based pagination resumes on the last listing page a previous attempt reached.
+                # 'Show More' lists restart from the top; completed products are skipped below.
+                if frontier is not None and frontier.listing_url(start_url) not in (None, start_url):
+                    current_url = frontier.listing_url(start_url)
+                    page_count = frontier.depth(start_url)
+                    logger.info(f"Resuming pagination at depth {page_count}: {current_url}")
+                
                 page = await context.new_page() # Main listing page, persistent
                 try:
                     logger.info(f"Starting pagination from: {start_url}")
@@ -158,6 +249,10 @@ class ScraperEngine:
                         raise e
                     
                     while page_count < max_pages:
+                        # Everything before this listing page has been yielded
+                        if frontier is not None:
+                            frontier.stage_listing(start_url, current_url, page_count)
+                        
                         # Wait for content to load
                         logger.info(f"Scraping page {page_count + 1} (interaction {page_count + 1})...")
                         try:
@@ -200,30 +295,50 @@ class ScraperEngine:
                             break # No products found, exit loop
                         
                         # Only process NEW products (avoid re-scraping details)
-                        new_products = [p for p in products if p['part_number'] and p['part_number'] not in processed_parts]
+                        new_products = [
+                            p for p in products
+                            if p['part_number'] and p['part_number'] not in processed_parts
+                            and not (frontier is not None and frontier.is_completed(p))
+                        ]
                         
                         if not new_products:
                             logger.info("No new products found on this page interaction.")
                         else:
                             logger.info(f"Found {len(new_products)} new products (Total on page: {len(products)})")
                             
+                            for p in new_products:
+                                if p['part_number']:
+                                    processed_parts.add(p['part_number'])
+                            
+                            # Incremental mode: rows identical to the last run keep their stored details
+                            fingerprints = {}
+                            if state is not None:
+                                changed_products = []
+                                for p in new_products:
+                                    fingerprint = listing_fingerprint(p)
+                                    if state.is_unchanged(p.get('source_url'), fingerprint):
+                                        state.mark_skipped(p['source_url'])
+                                    else:
+                                        fingerprints[id(p)] = fingerprint
+                                        changed_products.append(p)
+                                if len(changed_products) < len(new_products):
+                                    logger.info(f"Skipping {len(new_products) - len(changed_products)} unchanged products")
+                                new_products = changed_products
+                            
                             # Visit child pages if enabled
                             if config.child_pages.get('enabled'):
-                                for idx, product in enumerate(new_products):
-                                    if product.get('source_url'):
-                                        try:
-                                            # Use a temporary page to avoid losing state of the list page
-                                            detail_page = await context.new_page()
-                                            await self._scrape_product_details(detail_page, product, config)
-                                            await detail_page.close()
-                                            logger.debug(f"Scraped details for product {idx + 1}/{len(new_products)}")
-                                        except Exception as e:
-                                            logger.warning(f"Failed to scrape details for {product.get('source_url')}: {e}")
+                                await self._scrape_details_concurrently(context, new_products, config, request_filter)
+                            
+                            if state is not None:
+                                for p in new_products:
+                                    # Failed detail visits are not recorded, so they are retried next run
+                                    if p.get('source_url') and (p.get('specifications') or not config.child_pages.get('enabled')):
+                                        state.record_fetch(p['source_url'], fingerprints[id(p)])
+                                        state.record_specs(p['source_url'], p.get('specifications', {}))
                             
-                            all_products.extend(new_products)
+                            total_products += len(new_products)
                             for p in new_products:
-                                if p['part_number']:
-                                    processed_parts.add(p['part_number'])
+                                yield p
                         
                         # Check for Next Page / Show More
                         next_selector = config.pagination.get('next_button')
@@ -246,11 +361,17 @@ class ScraperEngine:
                             # Button-based pagination (e.g., SICK 'Show more')
                             logger.info("Clicking 'Show More' button.")
                             await next_el.click()
-                            # DONT use networkidle here, it hangs. Just wait for selector or small timeout.
-                            try:
-                                await page.wait_for_load_state('domcontentloaded', timeout=10000)
-                            except: pass
-                            await asyncio.sleep(3) # AJAX buffer
+                            # DONT use networkidle here, it hangs. Wait for the AJAX rows to land instead.
+                            grew = await wait_for_row_growth(
+                                page,
+                                config.selectors['product_card'],
+                                previous_count=len(products),
+                                quiet_ms=config.readiness.get('quiet_ms', 500),
+                                max_wait_ms=config.readiness.get('pagination_max_wait_ms', 10000),
+                                stats=self.readiness_stats
+                            )
+                            if not grew:
+                                logger.info("No new rows appeared after 'Show More' click.")
                             
                         page_count += 1
                         
@@ -260,13 +381,87 @@ class ScraperEngine:
                     logger.error(f"Error on {current_url}: {e}", exc_info=True)
                 finally:
                     # CRITICAL: Close page immediately to free memory
+                    listing_stats = request_filter.pop_page_stats(page)
+                    logger.debug(f"Listing page network: {listing_stats}")
                     await page.close()
             
             await context.close()
             await browser.close()
             
-            logger.info(f"Scraping complete: {len(all_products)} total products")
-            return all_products
+            if request_filter.enabled:
+                network = request_filter.summary()
+                logger.info(
+                    f"Network: {network['requests_blocked']} blocked, {network['requests_stubbed']} stubbed, "
+                    f"{network['requests_allowed']} allowed ({network['bytes_loaded'] / 1_048_576:.1f} MB loaded)"
+                )
+            logger.info(f"Page readiness: {self.readiness_stats.summary()}")
+            logger.info(f"Scraping complete: {total_products} total products")
+    
+    async def _scrape_details_concurrently(
+        self,
+        context,
+        products: List[Dict],
+        config: ScraperConfig,
+        request_filter: Optional[RequestFilter] = None
+    ):
+        """
+        Visit detail pages through a bounded pool of reusable pages
+        
+        Workers pull products from a shared asyncio queue. Each worker owns a
+        single page for its whole lifetime (navigating it from product to
+        product), so at most `limits.detail_concurrency` detail pages are open
+        in the shared context at any time. The listing page is never touched,
+        which keeps "Show More" pagination state intact.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for product in products:
+            if product.get('source_url'):
+                queue.put_nowait(product)
+        
+        if queue.empty():
+            return
+        
+        total = queue.qsize()
+        pool_size = max(1, min(config.limits.get('detail_concurrency', 1), total))
+        completed = 0
+        
+        async def worker(worker_id: int):
+            nonlocal completed
+            detail_page = await context.new_page()
+            try:
+                while True:
+                    try:
+                        product = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    
+                    try:
+                        # Replace the page if a previous visit crashed it
+                        if detail_page.is_closed():
+                            detail_page = await context.new_page()
+                        await self._scrape_product_details(detail_page, product, config)
+                    except Exception as e:
+                        logger.warning(f"Failed to scrape details for {product.get('source_url')}: {e}")
+                    finally:
+                        queue.task_done()
+                    
+                    if request_filter and request_filter.enabled:
+                        stats = request_filter.pop_page_stats(detail_page)
+                        logger.debug(
+                            f"{product.get('source_url')}: blocked {stats['requests_blocked']} "
+                            f"(+{stats['requests_stubbed']} stubbed) requests {stats['blocked_by_type']}, "
+                            f"loaded {stats['bytes_loaded']} bytes"
+                        )
+                    
+                    completed += 1
+                    logger.debug(f"[detail worker {worker_id}] Scraped details for product {completed}/{total}")
+            finally:
+                # CRITICAL: Release the pooled page as soon as the queue is drained
+                if not detail_page.is_closed():
+                    await detail_page.close()
+        
+        logger.info(f"Visiting {total} detail pages with {pool_size} concurrent page(s)")
+        await asyncio.gather(*(worker(i) for i in range(pool_size)))
     
     async def _scrape_product_details(
         self,
@@ -278,9 +473,16 @@ class ScraperEngine:
         product_url = product['source_url']
         
         try:
-            # Wait longer for SICK's Angular SPA to fully render
-            await page.goto(product_url, wait_until='networkidle', timeout=45000)
-            await page.wait_for_timeout(3000) # Buffer for lazy-loaded components
+            # SICK's Angular SPA renders after DOMContentLoaded; wait for its content instead of a fixed buffer
+            await page.goto(product_url, wait_until='domcontentloaded', timeout=45000)
+            ready_ms = await wait_until_ready(
+                page,
+                config.readiness.get('detail_selectors', ['.tech-table', '.customs-table']),
+                quiet_ms=config.readiness.get('quiet_ms', 500),
+                max_wait_ms=config.readiness.get('detail_max_wait_ms', 8000),
+                stats=self.readiness_stats
+            )
+            logger.debug(f"Detail page ready in {ready_ms:.0f}ms: {product_url}")
             
             # 1. Extract Category (Robust Breadcrumb & Headline)
             try:
@@ -317,20 +519,20 @@ class ScraperEngine:
             # SICK often hides tables in tabs; we try to find all tech-tables/customs-tables in the DOM
             specs_selector = config.selectors.get('specs_table', '.tech-table table, .customs-table table')
             try:
-                # Wait for at least one table to appear
-                try: 
-                    await page.wait_for_selector('.tech-table', timeout=5000)
-                except:
-                    pass
-
-                specs_html_list = await page.evaluate(f"""() => {{
-                    const tables = document.querySelectorAll("{specs_selector}");
-                    return Array.from(tables).map(t => t.outerHTML);
-                }}""")
-                
                 merged_specs = product.get('specifications', {})
-                for html in specs_html_list:
-                    merged_specs.update(self._parse_table_html(html))
+                
+                if config.parser_backend == 'browser':
+                    # Key/value pairs straight from the DOM: no outerHTML round-trip
+                    pairs = await page.evaluate(BROWSER_EXTRACT_JS, specs_selector)
+                    merged_specs.update(pairs_to_specs(pairs))
+                else:
+                    specs_html_list = await page.evaluate(f"""() => {{
+                        const tables = document.querySelectorAll("{specs_selector}");
+                        return Array.from(tables).map(t => t.outerHTML);
+                    }}""")
+                    for html in specs_html_list:
+                        merged_specs.update(self._parse_table_html(html, config.parser_backend))
+                
                 product['specifications'] = merged_specs
             except Exception as e:
                 logger.warning(f"Specs extraction failed for {product_url}: {e}")
@@ -396,50 +598,273 @@ class ScraperEngine:
             if 'pdf_urls' not in product: product['pdf_urls'] = []
             if 'accessories' not in product: product['accessories'] = []
     
-    async def _scrape_with_http(self, config: ScraperConfig) -> List[Dict]:
+    async def _scrape_with_http(
+        self,
+        config: ScraperConfig,
+        state: Optional[IncrementalState] = None,
+        frontier: Optional[CrawlFrontier] = None
+    ) -> AsyncIterator[Dict]:
         """
-        Lightweight HTTP scraper for static sites
+        Lightweight async HTTP crawler for static sites
         
         Memory budget: ~50MB (vs 700MB for Playwright)
         Use this for sites that don't require JavaScript rendering
+        
+        - Follows `pagination.next_button` links up to `pagination.max_pages`
+        - Fetches detail pages (`child_pages.url_selector`) with bounded
+          concurrency (`limits.max_concurrency`) over pooled HTTP/2 connections
+        - Per-host token-bucket rate limiting (`limits.requests_per_second`,
+          `limits.burst`) with exponential backoff on 429/5xx
+        
+        In incremental mode unchanged listing rows skip their detail fetch and
+        detail pages are fetched with conditional GETs (304 = skip). Listing
+        pages without pagination are fetched conditionally too.
         """
         logger.info("Using HTTP scraper (lightweight mode)")
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            all_products = []
+        concurrency = config.limits.get('max_concurrency', 8)
+        limiter = HostRateLimiter(
+            requests_per_second=config.limits.get('requests_per_second', 2),
+            burst=config.limits.get('burst', 4)
+        )
+        semaphore = asyncio.Semaphore(concurrency)
+        max_pages = config.pagination.get('max_pages', 50)
+        next_selector = config.pagination.get('next_button')
+        
+        async with httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+        ) as client:
+            total_products = 0
             
             for start_url in config.start_urls:
-                try:
-                    response = await client.get(start_url)
-                    response.raise_for_status()
-                    
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    containers = soup.select(config.selectors['product_card'])
-                    logger.info(f"Found {len(containers)} products on {start_url}")
+                if frontier is not None and frontier.is_listing_visited(start_url):
+                    logger.info(f"Already scraped in a previous attempt: {start_url}")
+                    continue
+                
+                current_url = start_url
+                page_count = 0
+                if frontier is not None and frontier.listing_url(start_url):
+                    current_url = frontier.listing_url(start_url)
+                    page_count = frontier.depth(start_url)
+                    logger.info(f"Resuming pagination at depth {page_count}: {current_url}")
+                
+                while current_url and page_count < max_pages:
+                    if frontier is not None:
+                        frontier.stage_listing(start_url, current_url, page_count)
                     
-                    for container in containers:
-                        product = {
-                            'name': self._extract_text(container, config.selectors['product_name']),
-                            'part_number': self._extract_text(container, config.selectors['part_number']),
-                            'source_url': start_url
-                        }
+                    try:
+                        # Single-page listings can be skipped whole; paginated ones are needed for their next link
+                        headers = state.conditional_headers(current_url) if state and not next_selector else {}
+                        response = await self._fetch_with_backoff(client, limiter, current_url, config, headers)
+                        
+                        if response.status_code == 304:
+                            logger.info(f"Not modified since last run: {current_url}")
+                            state.mark_skipped(current_url)
+                            break
+                        
+                        if state is not None and not next_selector:
+                            fingerprint = content_fingerprint(response.content)
+                            if state.is_unchanged(current_url, fingerprint):
+                                logger.info(f"Content unchanged since last run: {current_url}")
+                                state.mark_skipped(current_url)
+                                break
+                            state.record_fetch(
+                                current_url,
+                                fingerprint,
+                                etag=response.headers.get('etag'),
+                                last_modified=response.headers.get('last-modified')
+                            )
                         
-                        # Extract optional fields
-                        if 'category' in config.selectors:
-                            product['category'] = self._extract_text(container, config.selectors['category'])
+                        soup = BeautifulSoup(response.text, 'lxml')
+                        products = self._parse_listing_html(soup, str(response.url), config)
+                        logger.info(f"Found {len(products)} products on {current_url}")
                         
-                        if 'image' in config.selectors:
-                            img = container.select_one(config.selectors['image'])
-                            product['image_url'] = img.get('src') if img else None
+                        if frontier is not None:
+                            products = [p for p in products if not frontier.is_completed(p)]
                         
-                        all_products.append(product)
+                        if config.child_pages.get('enabled'):
+                            products = await self._scrape_http_details(
+                                client, limiter, semaphore, products, config, str(response.url), state
+                            )
+                        
+                        total_products += len(products)
+                        for product in products:
+                            yield product
+                        
+                        # Link-based pagination
+                        next_el = soup.select_one(next_selector) if next_selector else None
+                        href = next_el.get('href') if next_el else None
+                        current_url = urljoin(str(response.url), href) if href else None
+                        page_count += 1
+                    
+                    except httpx.HTTPError as e:
+                        logger.error(f"HTTP error fetching {current_url}: {e}")
+                        break
                 
+                if frontier is not None:
+                    frontier.stage_visited(start_url)
+            
+            logger.info(f"HTTP scraping complete: {total_products} products")
+    
+    async def _fetch_with_backoff(
+        self,
+        client: httpx.AsyncClient,
+        limiter: HostRateLimiter,
+        url: str,
+        config: ScraperConfig,
+        headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        """
+        GET with per-host rate limiting and exponential backoff
+        
+        Retries 429/5xx and transport errors up to `limits.max_retries` times,
+        honouring a numeric Retry-After header (which also pauses the host).
+        304 responses are returned as-is for conditional GETs.
+        
+        Raises:
+            httpx.HTTPError: If the request still fails after all retries
+        """
+        max_retries = config.limits.get('max_retries', 4)
+        base_delay = config.limits.get('backoff_base_s', 1.0)
+        
+        for attempt in range(max_retries + 1):
+            await limiter.acquire(url)
+            try:
+                response = await client.get(url, headers=headers or {})
+            except httpx.TransportError as e:
+                if attempt == max_retries:
+                    raise
+                delay = base_delay * 2 ** attempt
+                logger.warning(f"Transport error on {url} ({e}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay + random.uniform(0, base_delay))
+                continue
+            
+            if response.status_code in RETRYABLE_STATUS and attempt < max_retries:
+                retry_after = response.headers.get('retry-after', '')
+                delay = float(retry_after) if retry_after.isdigit() else base_delay * 2 ** attempt
+                limiter.pause(url, delay)
+                logger.warning(f"HTTP {response.status_code} from {url}; backing off {delay:.1f}s")
+                await asyncio.sleep(random.uniform(0, base_delay))
+                continue
+            
+            if response.status_code != 304:
+                response.raise_for_status()
+            return response
+    
+    def _parse_listing_html(self, soup: BeautifulSoup, page_url: str, config: ScraperConfig) -> List[Dict]:
+        """Extract product rows from a static listing page"""
+        products = []
+        detail_link_selector = config.child_pages.get('url_selector') or config.selectors['product_name']
+        
+        for container in soup.select(config.selectors['product_card']):
+            link = container.select_one(detail_link_selector)
+            href = link.get('href') if link else None
+            
+            product = {
+                'product_name': self._extract_text(container, config.selectors['product_name']),
+                'part_number': self._extract_text(container, config.selectors['part_number']),
+                'source_url': urljoin(page_url, href) if href else page_url
+            }
+            
+            # Extract optional fields
+            if 'category' in config.selectors:
+                product['category'] = self._extract_text(container, config.selectors['category'])
+            
+            if 'image' in config.selectors:
+                img = container.select_one(config.selectors['image'])
+                src = img and (img.get('data-src') or img.get('src'))
+                product['image_urls'] = [urljoin(page_url, src)] if src else []
+            
+            products.append(product)
+        
+        return products
+    
+    async def _scrape_http_details(
+        self,
+        client: httpx.AsyncClient,
+        limiter: HostRateLimiter,
+        semaphore: asyncio.Semaphore,
+        products: List[Dict],
+        config: ScraperConfig,
+        listing_url: str,
+        state: Optional[IncrementalState] = None
+    ) -> List[Dict]:
+        """
+        Fetch and parse detail pages concurrently
+        
+        Rows without their own detail link (source_url == listing_url) are
+        emitted as-is.
+        
+        Returns:
+            Products to emit (unchanged ones are dropped in incremental mode)
+        """
+        specs_selector = config.selectors.get('specs_table', 'table')
+        image_selector = (config.child_pages.get('detail_selectors') or {}).get('image_hires')
+        
+        async def fetch_detail(product: Dict) -> Optional[Dict]:
+            url = product['source_url']
+            if url == listing_url:
+                return product
+            fingerprint = listing_fingerprint(product)
+            if state is not None and state.is_unchanged(url, fingerprint):
+                state.mark_skipped(url)
+                return None
+            
+            async with semaphore:
+                try:
+                    headers = state.conditional_headers(url) if state else {}
+                    response = await self._fetch_with_backoff(client, limiter, url, config, headers)
                 except httpx.HTTPError as e:
-                    logger.error(f"HTTP error fetching {start_url}: {e}")
+                    logger.warning(f"Failed to scrape details for {url}: {e}")
+                    product.setdefault('specifications', {})
+                    return product
+            
+            if response.status_code == 304:
+                if not state.fingerprint_changed(url, fingerprint):
+                    state.mark_skipped(url)
+                    return None
+                # Listing row changed but the page did not: emit it with the specs we already have
+                specs = state.saved_specs(url)
+                if specs is not None:
+                    product['specifications'] = {**product.get('specifications', {}), **specs}
+                    state.record_not_modified(url, fingerprint)
+                    return product
+                async with semaphore:
+                    try:
+                        response = await self._fetch_with_backoff(client, limiter, url, config, {})
+                    except httpx.HTTPError as e:
+                        logger.warning(f"Failed to scrape details for {url}: {e}")
+                        product.setdefault('specifications', {})
+                        return product
             
-            logger.info(f"HTTP scraping complete: {len(all_products)} products")
-            return all_products
+            soup = BeautifulSoup(response.text, 'lxml')
+            specs = product.get('specifications', {})
+            for table in soup.select(specs_selector):
+                specs.update(self._parse_table_html(str(table), config.parser_backend))
+            product['specifications'] = specs
+            
+            if image_selector:
+                images = [img.get('data-src') or img.get('src') for img in soup.select(image_selector)]
+                images = [urljoin(url, src) for src in images if src]
+                if images:
+                    product['image_urls'] = images
+            
+            if state is not None:
+                state.record_fetch(
+                    url,
+                    fingerprint,
+                    etag=response.headers.get('etag'),
+                    last_modified=response.headers.get('last-modified')
+                )
+                state.record_specs(url, specs)
+            return product
+        
+        results = await asyncio.gather(*(fetch_detail(p) for p in products))
+        return [product for product in results if product is not None]
     
     @staticmethod
     def _extract_text(element, selector: str) -> Optional[str]:
@@ -448,34 +873,10 @@ class ScraperEngine:
         return el.text.strip() if el else None
     
     @staticmethod
-    def _parse_table_html(html: str) -> Dict[str, str]:
+    def _parse_table_html(html: str, backend: str = DEFAULT_PARSER_BACKEND) -> Dict[str, str]:
         """
         Parse HTML table into key-value specifications, handling nested tables.
-        """
-        soup = BeautifulSoup(html, 'html.parser')
-        specs = {}
-        
-        # We look for all TRs that have at least 2 direct child TDs or THs
-        # Or TRs that contain sub-tables
-        for row in soup.find_all('tr'):
-            # Check for direct children only to avoid double-processing nested tables in same loop
-            cells = row.find_all(['td', 'th'], recursive=False)
-            
-            if len(cells) >= 2:
-                key = cells[0].text.strip()
-                # If the second cell has its own table, BeautifulSoup find_all('tr') will handle it
-                # because it's recursive. We just need to make sure we don't add the parent key if it's 
-                # just a header for a sub-table.
-                
-                # Check if second cell has text or is just a container
-                value_text = cells[1].get_text(strip=True, separator=' ')
-                
-                if key and value_text and not cells[1].find('table'):
-                    specs[key] = value_text
-            
-            # Special case for SICK: rows with a sub-table inside a colspan=2 cell
-            elif len(cells) == 1 and cells[0].get('colspan') == '2' and cells[0].find('table'):
-                 # These rows are just containers; the recursive find_all('tr') will pick up the inner rows.
-                 pass
         
-        return specs
+        See app/scraper/spec_parser.py for the available backends.
+        """
+        return parse_spec_table(html, backend)
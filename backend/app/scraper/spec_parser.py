@@ -0,0 +1,130 @@
+"""
+Specification table parsing backends
+
+All backends turn a spec table into the same key/value dict:
+- Every <tr> in document order (nested tables included), looking only at the
+  row's direct <td>/<th> children
+- Rows with >= 2 cells map first-cell text -> second-cell text (text nodes
+  stripped and joined with a space), unless the second cell contains a table
+- SICK special case: rows whose single colspan=2 cell wraps a sub-table are
+  containers only; their inner rows are picked up on their own
+
+Backends:
+- "lxml": libxml2 parser, several times faster than html.parser (default)
+- "bs4": the original BeautifulSoup + html.parser implementation
+- "browser": runs BROWSER_EXTRACT_JS inside the page via page.evaluate and
+  returns pairs directly, skipping outerHTML serialization and re-parsing
+  (Playwright only; HTML-based callers fall back to lxml)
+"""
+
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
+
+DEFAULT_BACKEND = "lxml"
+BACKENDS = ("lxml", "bs4", "browser")
+
+# Returns [[key, value], ...] for all tables matching the selector.
+# Pairs (not an object) so key order survives JS integer-key reordering.
+BROWSER_EXTRACT_JS = """(selector) => {
+    const SKIP = new Set(['SCRIPT', 'STYLE', 'TEMPLATE']);
+    const textNodes = (cell) => {
+        const parts = [];
+        const walker = document.createTreeWalker(cell, NodeFilter.SHOW_TEXT);
+        while (walker.nextNode()) {
+            const node = walker.currentNode;
+            if (node.parentElement && SKIP.has(node.parentElement.tagName)) continue;
+            parts.push(node.nodeValue);
+        }
+        return parts;
+    };
+    const pairs = [];
+    for (const table of document.querySelectorAll(selector)) {
+        for (const row of table.querySelectorAll('tr')) {
+            const cells = Array.from(row.children).filter(c => c.tagName === 'TD' || c.tagName === 'TH');
+            if (cells.length < 2) continue;
+            const key = textNodes(cells[0]).join('').trim();
+            const value = textNodes(cells[1]).map(t => t.trim()).filter(Boolean).join(' ');
+            if (key && value && !cells[1].querySelector('table')) pairs.push([key, value]);
+        }
+    }
+    return pairs;
+}"""
+
+
+def parse_spec_table(html: str, backend: str = DEFAULT_BACKEND) -> Dict[str, str]:
+    """
+    Parse an HTML table into key-value specifications
+
+    Args:
+        html: Table outerHTML
+        backend: "lxml" or "bs4" ("browser" is handled in-page; falls back to lxml here)
+    """
+    if backend == "bs4":
+        return _parse_with_bs4(html)
+    return _parse_with_lxml(html)
+
+
+def pairs_to_specs(pairs: List[List[str]]) -> Dict[str, str]:
+    """Build the specs dict from BROWSER_EXTRACT_JS output (later pairs win)"""
+    return {key: value for key, value in pairs}
+
+
+def _parse_with_bs4(html: str) -> Dict[str, str]:
+    soup = BeautifulSoup(html, 'html.parser')
+    specs = {}
+
+    # We look for all TRs that have at least 2 direct child TDs or THs
+    # Or TRs that contain sub-tables
+    for row in soup.find_all('tr'):
+        # Check for direct children only to avoid double-processing nested tables in same loop
+        cells = row.find_all(['td', 'th'], recursive=False)
+
+        if len(cells) >= 2:
+            key = cells[0].text.strip()
+            # If the second cell has its own table, find_all('tr') will handle it
+            # because it's recursive. We just need to make sure we don't add the parent key if it's
+            # just a header for a sub-table.
+
+            # Check if second cell has text or is just a container
+            value_text = cells[1].get_text(strip=True, separator=' ')
+
+            if key and value_text and not cells[1].find('table'):
+                specs[key] = value_text
+
+        # Special case for SICK: rows with a sub-table inside a colspan=2 cell
+        elif len(cells) == 1 and cells[0].get('colspan') == '2' and cells[0].find('table'):
+            # These rows are just containers; the recursive find_all('tr') will pick up the inner rows.
+            pass
+
+    return specs
+
+
+def _text_parts(element) -> List[str]:
+    return [text.strip() for text in element.itertext() if text.strip()]
+
+
+def _parse_with_lxml(html: str) -> Dict[str, str]:
+    if not html or not html.strip():
+        return {}
+
+    root = lxml.html.fragment_fromstring(html, create_parent='div')
+    # get_text() ignores comments, scripts and styles; drop them so itertext() matches
+    etree.strip_elements(root, etree.Comment, 'script', 'style', 'template', with_tail=False)
+    specs = {}
+
+    for row in root.iter('tr'):
+        cells = [child for child in row if child.tag in ('td', 'th')]
+        if len(cells) < 2:
+            # Includes the SICK colspan=2 container rows: inner rows are visited on their own
+            continue
+
+        key = cells[0].text_content().strip()
+        value_text = ' '.join(_text_parts(cells[1]))
+
+        if key and value_text and cells[1].find('.//table') is None:
+            specs[key] = value_text
+
+    return specs
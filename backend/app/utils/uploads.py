@@ -0,0 +1,230 @@
+"""
+Upload handling for the search endpoints
+
+Features:
+- Body size limits per path, enforced while the request streams in
+  (Content-Length is checked up front, chunked bodies are counted), so an
+  oversized upload is cut off with 413 instead of being spooled to disk first
+- Uploads are read into memory in chunks (bounded by the limit) and handed
+  to inference as bytes; nothing has to be written to disk on the hot path
+- Optional retention of uploads for debugging, content-addressed by SHA-256
+  so repeated uploads of the same photo / recording are stored once
+- TTL janitor that deletes retained uploads (and the legacy temp_* files of
+  the old data/images and data/audio dirs) once they expire
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from fastapi import HTTPException, UploadFile
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 256 * 1024
+MULTIPART_OVERHEAD = 64 * 1024  # Boundaries and part headers around the file
+
+
+class UploadTooLarge(HTTPException):
+    # An HTTPException so FastAPI's body parser re-raises it instead of turning it into a 400
+    def __init__(self, limit: int):
+        super().__init__(status_code=413, detail=f"Upload exceeds the {limit // 1_048_576} MB limit")
+
+
+class BodySizeLimitMiddleware:
+    """
+    ASGI middleware limiting request body size for the given paths
+
+    Args:
+        limits: Path -> max body bytes
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope.get("path")) if scope["type"] == "http" else None
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > limit + MULTIPART_OVERHEAD:
+            return await self._reject(limit, send)
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit + MULTIPART_OVERHEAD:
+                    raise UploadTooLarge(limit)
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except UploadTooLarge:
+            # Only reached if the body is read outside FastAPI's request handling
+            if response_started:
+                raise
+            await self._reject(limit, send)
+
+    @staticmethod
+    async def _reject(limit: int, send):
+        from fastapi.responses import JSONResponse
+
+        response = JSONResponse({"detail": UploadTooLarge(limit).detail}, status_code=413, headers={"Connection": "close"})
+        await response({"type": "http"}, None, send)
+
+
+@dataclass
+class Upload:
+    data: bytes
+    sha256: str
+    filename: str
+    content_type: Optional[str]
+
+    @property
+    def extension(self) -> str:
+        ext = os.path.splitext(self.filename or "")[1].lower()
+        return ext if ext[1:].isalnum() and len(ext) <= 6 else ""
+
+
+async def read_upload(file: UploadFile, max_bytes: int) -> Upload:
+    """
+    Read an upload into memory in chunks, hashing as it goes
+
+    Raises:
+        UploadTooLarge: More than `max_bytes` (also guards requests that bypass the middleware)
+        HTTPException 400: Empty upload
+    """
+    digest = hashlib.sha256()
+    chunks = []
+    size = 0
+    while True:
+        chunk = await file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLarge(max_bytes)
+        digest.update(chunk)
+        chunks.append(chunk)
+    if not size:
+        raise HTTPException(status_code=400, detail="Empty upload")
+    return Upload(b"".join(chunks), digest.hexdigest(), file.filename or "", file.content_type)
+
+
+class UploadStore:
+    """
+    Content-addressed retention of uploads: `<root>/<kind>/<sha256><ext>`
+
+    Args:
+        root: Base directory
+        retention_seconds: Keep files this long after their last upload; 0 disables retention
+        legacy_dirs: Old per-request temp dirs swept by the janitor (temp_* files only)
+    """
+
+    def __init__(self, root: str, retention_seconds: int, legacy_dirs: Iterable[str] = ()):
+        self.root = Path(root)
+        self.retention_seconds = retention_seconds
+        self.legacy_dirs = [Path(d) for d in legacy_dirs]
+        self.saved = 0
+        self.deduplicated = 0
+        self.purged = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.retention_seconds > 0
+
+    def save(self, kind: str, upload: Upload) -> Optional[Path]:
+        """Blocking; run it in a thread or as a background task"""
+        if not self.enabled:
+            return None
+        path = self.root / kind / f"{upload.sha256}{upload.extension}"
+        if path.exists():
+            # Same content already kept: just extend its retention
+            os.utime(path)
+            self.deduplicated += 1
+            return path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(upload.data)
+        os.replace(tmp, path)
+        self.saved += 1
+        return path
+
+    def _expired(self, paths: Iterable[Path], cutoff: float) -> int:
+        removed = 0
+        for path in paths:
+            try:
+                if path.is_file() and path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Upload janitor: cannot remove {path}: {e}")
+        return removed
+
+    def purge_expired(self) -> int:
+        """Delete retained uploads (and legacy temp files) older than the retention"""
+        cutoff = time.time() - max(self.retention_seconds, 0)
+        removed = 0
+        if self.root.exists():
+            removed += self._expired(self.root.glob("*/*"), cutoff)
+        for legacy in self.legacy_dirs:
+            if legacy.exists():
+                removed += self._expired(legacy.glob("temp_*"), cutoff)
+        self.purged += removed
+        if removed:
+            logger.info(f"Upload janitor: removed {removed} expired files")
+        return removed
+
+    async def run_janitor(self, interval_seconds: int):
+        """Purge periodically until cancelled (started from the app lifespan)"""
+        while True:
+            try:
+                await asyncio.to_thread(self.purge_expired)
+            except Exception as e:
+                logger.error(f"Upload janitor failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+    def stats(self) -> dict:
+        return {
+            "retention_seconds": self.retention_seconds,
+            "saved": self.saved,
+            "deduplicated": self.deduplicated,
+            "purged": self.purged,
+        }
+
+
+_store: Optional[UploadStore] = None
+
+
+def get_upload_store() -> UploadStore:
+    global _store
+    if _store is None:
+        from app.config import settings
+
+        _store = UploadStore(
+            settings.UPLOAD_DIR,
+            settings.UPLOAD_RETENTION_S,
+            legacy_dirs=("data/images", "data/audio"),
+        )
+    return _store
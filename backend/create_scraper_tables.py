@@ -5,7 +5,7 @@ Run this inside the backend container to create scraper tables
 """
 
 from app.database import engine, Base
-from app.models.scraper import ScraperJob, ScrapedProduct
+from app.models.scraper import ScraperJob, ScrapedProduct, ScrapedPageState, VectorIndexState
 
 # Import models to register them with Base
 print("Creating scraper database tables...")
@@ -29,7 +29,16 @@ with engine.connect() as conn:
         except Exception as e:
             print(f"❌ Failed to add column: {e}")
 
+# create_all() does not add indexes to existing tables
+with engine.connect() as conn:
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS idx_scraped_products_source ON scraped_products (scraper_id, source_url)"
+    ))
+    conn.commit()
+
 print("✅ Scraper tables created successfully!")
 print("Tables:")
 print("  - scraper_jobs")
 print("  - scraped_products")
+print("  - scraped_page_states")
+print("  - vector_index_states")
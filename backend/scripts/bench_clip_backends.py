@@ -0,0 +1,155 @@
+"""
+Benchmark the CLIP embedding backends on this machine's CPU
+
+Runs the PyTorch backend ("clip-vit-b32") and the ONNX Runtime backend
+("clip-vit-b32-onnx", fp32 and int8 graphs) on the same texts and synthetic
+images, and reports per-batch latency, RSS growth while loading, and the
+cosine agreement of the ONNX vectors with the PyTorch ones.
+
+The ONNX graphs are exported to --model-dir first if missing (needs the
+Hugging Face hub once).
+
+Usage (from backend/):
+    python scripts/bench_clip_backends.py
+    python scripts/bench_clip_backends.py --batch-size 16 --iterations 20 --threads 4
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import psutil
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.ai.onnx_clip import (  # noqa: E402
+    TEXT_GRAPH, VISION_GRAPH, OnnxClip, clip_features, export_pretrained, graph_path,
+)
+from app.config import settings  # noqa: E402
+
+SAMPLE_TEXTS = [
+    "photoelectric sensor M18 PNP",
+    "proximity switch inductive 8mm",
+    "حساس ضوئي صناعي",
+    "safety light curtain type 4",
+    "encoder incremental 1024 ppr",
+    "servo motor 400W with brake",
+    "PLC digital input module 16 channels",
+    "contactor 3 pole 24V DC coil",
+]
+
+
+def rss_mb() -> float:
+    return psutil.Process().memory_info().rss / 1_048_576
+
+
+def sample_inputs(batch_size: int):
+    texts = [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] for i in range(batch_size)]
+    rng = np.random.default_rng(0)
+    images = [Image.fromarray(rng.integers(0, 255, (480, 640, 3), dtype=np.uint8)) for _ in range(batch_size)]
+    return texts, images
+
+
+class TorchClip:
+    def __init__(self):
+        import torch
+        from transformers import CLIPModel, CLIPProcessor
+
+        self.torch = torch
+        self.processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
+        self.model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32").eval()
+
+    def embed_texts(self, texts):
+        inputs = self.processor(text=texts, return_tensors="pt", padding=True, truncation=True, max_length=77)
+        with self.torch.no_grad():
+            return clip_features(self.model.get_text_features(**inputs)).numpy()
+
+    def embed_images(self, images):
+        inputs = self.processor(images=images, return_tensors="pt")
+        with self.torch.no_grad():
+            return clip_features(self.model.get_image_features(**inputs)).numpy()
+
+
+class OnnxRunner:
+    def __init__(self, model_dir: str, quantized: bool, threads: int):
+        from transformers import CLIPProcessor
+
+        self.clip = OnnxClip(model_dir, quantized=quantized, intra_op_threads=threads,
+                             processor=CLIPProcessor.from_pretrained(model_dir))
+
+    def embed_texts(self, texts):
+        inputs = self.clip.processor(text=texts, return_tensors="np", padding=True, truncation=True, max_length=77)
+        return self.clip.text_features(inputs["input_ids"], inputs["attention_mask"])
+
+    def embed_images(self, images):
+        return self.clip.image_features(self.clip.processor(images=images, return_tensors="np")["pixel_values"])
+
+
+def timed(fn, arg, iterations: int) -> dict:
+    fn(arg)  # Warm-up (allocations, kernel selection)
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn(arg)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {"p50": statistics.median(samples), "p95": samples[round(0.95 * (len(samples) - 1))]}
+
+
+def min_cosine(a: np.ndarray, b: np.ndarray) -> float:
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return float((a * b).sum(axis=1).min())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-dir", default=settings.ONNX_CLIP_DIR)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=settings.ONNX_INTRA_OP_THREADS,
+                        help="ONNX Runtime intra-op threads (0 = physical cores)")
+    args = parser.parse_args()
+
+    if not all(graph_path(args.model_dir, tower, q).exists() for tower in (TEXT_GRAPH, VISION_GRAPH) for q in (False, True)):
+        print(f"Exporting ONNX graphs to {args.model_dir}...")
+        export_pretrained(args.model_dir, quantize=True)
+
+    texts, images = sample_inputs(args.batch_size)
+    runners = [
+        ("torch fp32", lambda: TorchClip()),
+        ("onnx fp32", lambda: OnnxRunner(args.model_dir, False, args.threads)),
+        ("onnx int8", lambda: OnnxRunner(args.model_dir, True, args.threads)),
+    ]
+
+    # Load order matters for RSS deltas: each runner is measured on top of the previous ones
+    reference = None
+    print(f"batch={args.batch_size} iterations={args.iterations} cpu={psutil.cpu_count(logical=False)} cores")
+    print(f"{'backend':<12} {'load MB':>8} {'text p50':>9} {'text p95':>9} {'img p50':>9} {'img p95':>9} {'cos text':>9} {'cos img':>8}")
+    for label, factory in runners:
+        before = rss_mb()
+        runner = factory()
+        loaded_mb = rss_mb() - before
+
+        text_ms = timed(runner.embed_texts, texts, args.iterations)
+        image_ms = timed(runner.embed_images, images, args.iterations)
+        vectors = (runner.embed_texts(texts), runner.embed_images(images))
+        if reference is None:
+            reference = vectors
+        cos_text, cos_image = min_cosine(vectors[0], reference[0]), min_cosine(vectors[1], reference[1])
+
+        print(
+            f"{label:<12} {loaded_mb:>8.0f} {text_ms['p50']:>8.1f}ms {text_ms['p95']:>8.1f}ms "
+            f"{image_ms['p50']:>8.1f}ms {image_ms['p95']:>8.1f}ms {cos_text:>9.4f} {cos_image:>8.4f}"
+        )
+        del runner
+
+    print(f"Process RSS at exit: {rss_mb():.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Micro-benchmark for spec table parsing backends
+
+Extracts the spec tables from a saved SICK detail page (MHTML, as saved by
+Chrome) and times every HTML backend in app/scraper/spec_parser.py on them,
+after checking that all backends produce identical output.
+
+Usage (from backend/):
+    python scripts/bench_spec_parser.py
+    python scripts/bench_spec_parser.py "../WTB16P-X01 - W16 _ SICK.mhtml" --iterations 200
+"""
+
+import argparse
+import email
+import sys
+import time
+from email import policy
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.scraper.spec_parser import parse_spec_table  # noqa: E402
+
+DEFAULT_FIXTURE = Path(__file__).resolve().parents[2] / "WTB16P-X01 - W16 _ SICK.mhtml"
+SPECS_SELECTOR = ".tech-table table, .customs-table table"
+
+
+def load_tables(path: Path, selector: str = SPECS_SELECTOR) -> list:
+    """Return the outerHTML of every spec table in an MHTML snapshot"""
+    with open(path, "rb") as f:
+        message = email.message_from_binary_file(f, policy=policy.default)
+
+    html = next(
+        part.get_content() for part in message.walk()
+        if part.get_content_type() == "text/html"
+    )
+    soup = BeautifulSoup(html, "lxml")
+    return [str(table) for table in soup.select(selector)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixture", nargs="?", default=str(DEFAULT_FIXTURE))
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    tables = load_tables(Path(args.fixture))
+    print(f"{len(tables)} spec tables, {sum(len(t) for t in tables) / 1024:.0f} KB of HTML")
+
+    reference = [parse_spec_table(t, backend="bs4") for t in tables]
+    for backend in ("lxml",):
+        assert [parse_spec_table(t, backend=backend) for t in tables] == reference, f"{backend} output differs"
+    print(f"Outputs identical ({sum(len(r) for r in reference)} spec rows)")
+
+    timings = {}
+    for backend in ("bs4", "lxml"):
+        started = time.perf_counter()
+        for _ in range(args.iterations):
+            for table in tables:
+                parse_spec_table(table, backend=backend)
+        timings[backend] = (time.perf_counter() - started) / args.iterations * 1000
+        print(f"{backend:>5}: {timings[backend]:8.2f} ms per page")
+
+    print(f"lxml speedup: {timings['bs4'] / timings['lxml']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark the voice search transcription backends on this machine's CPU
+
+Each backend runs in a fresh process (clean RSS numbers) over the given
+clips, once with the clip's language hint and once with auto-detection,
+and reports load time, peak RSS and real-time factor (RTF = processing
+time / audio duration; lower is better, <1 is faster than real time).
+
+Clips are given as LANG:PATH (any format ffmpeg reads), e.g. recordings of
+the same spoken queries in Arabic and English.
+
+Usage (from backend/):
+    python scripts/bench_transcription.py --clip ar:samples/ar_query.ogg --clip en:samples/en_query.webm
+    python scripts/bench_transcription.py --clip en:q.wav --backends faster-whisper --model-size small
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.ai.audio import SAMPLE_RATE, decode_audio  # noqa: E402
+from app.ai.transcription_backends import BACKENDS  # noqa: E402
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+
+
+def run_backend(name: str, clips: list, model_size: str, iterations: int) -> dict:
+    """Runs in a child process"""
+    # Settings are read at import time, so they have to be in the environment first
+    os.environ["WHISPER_MODEL_SIZE"] = model_size
+    from app.ai.model_registry import model_registry
+    from app.ai.transcription_backends import get_transcription_backend
+
+    backend = get_transcription_backend(name)
+    baseline_mb = peak_rss_mb()
+    started = time.perf_counter()
+    model_registry.get(backend.registry_model)
+    load_seconds = time.perf_counter() - started
+
+    rows = []
+    for language, path, samples in clips:
+        duration = len(samples) / SAMPLE_RATE
+        for hint in (language, None):
+            backend.transcribe(samples, hint)  # Warm-up
+            elapsed = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                result = backend.transcribe(samples, hint)
+                elapsed.append(time.perf_counter() - started)
+            rows.append({
+                "clip": Path(path).name,
+                "hint": hint or "auto",
+                "duration": duration,
+                "rtf": min(elapsed) / duration,
+                "language": result["language"],
+                "text": result["text"],
+            })
+    return {"load_seconds": load_seconds, "rss_mb": peak_rss_mb() - baseline_mb, "rows": rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clip", action="append", required=True, metavar="LANG:PATH")
+    parser.add_argument("--backends", default=",".join(reversed(list(BACKENDS))))
+    parser.add_argument("--model-size", default="base")
+    parser.add_argument("--iterations", type=int, default=3)
+    args = parser.parse_args()
+
+    clips = []
+    for spec in args.clip:
+        language, _, path = spec.partition(":")
+        clips.append((language, path, decode_audio(Path(path).read_bytes(), Path(path).suffix)))
+    print(f"{len(clips)} clips, {sum(len(s) for *_, s in clips) / SAMPLE_RATE:.1f}s of audio, model size '{args.model_size}'")
+
+    context = multiprocessing.get_context("spawn")
+    for name in args.backends.split(","):
+        with context.Pool(1) as pool:
+            report = pool.apply(run_backend, (name, clips, args.model_size, args.iterations))
+        print(f"\n{name}: loaded in {report['load_seconds']:.1f}s, +{report['rss_mb']:.0f} MB peak RSS")
+        print(f"  {'clip':<24} {'hint':<5} {'secs':>5} {'RTF':>6} {'lang':<4} text")
+        for row in report["rows"]:
+            print(
+                f"  {row['clip'][:24]:<24} {row['hint']:<5} {row['duration']:>5.1f} {row['rtf']:>6.3f} "
+                f"{row['language']:<4} {row['text'][:60]}"
+            )
+
+
+if __name__ == "__main__":
+    main()
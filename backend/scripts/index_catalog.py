@@ -0,0 +1,85 @@
+"""
+Index scraped products into Qdrant
+
+Embeds products added or updated since the last run (or the whole catalog
+with --full) into the parts_text and parts_images collections. Safe to
+interrupt: the next run resumes after the last indexed chunk.
+
+With --recreate the catalog is embedded into fresh collections (sized for
+the configured embedding backends) and the parts_text / parts_images aliases
+are switched to them at the end; needed after changing QDRANT_TEXT_BACKEND
+or QDRANT_IMAGE_BACKEND. Search keeps using the old collections meanwhile.
+
+Usage (from backend/):
+    python scripts/index_catalog.py
+    python scripts/index_catalog.py --full --no-images
+    python scripts/index_catalog.py --recreate
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.ai.catalog_indexer import CatalogIndexer  # noqa: E402
+from app.ai.qdrant_client import QdrantManager  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--full", action="store_true", help="Re-embed every product")
+    parser.add_argument("--recreate", action="store_true", help="Build new collections, then switch aliases (implies --full)")
+    parser.add_argument("--no-images", action="store_true", help="Only fill parts_text")
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--image-concurrency", type=int, default=8)
+    parser.add_argument("--upload-parallel", type=int, default=2)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    qdrant = QdrantManager()
+    targets = {}
+    if args.recreate:
+        # Index into new physical collections; the live aliases keep serving until the switch
+        for name in (qdrant.text_collection, qdrant.image_collection):
+            targets[name] = qdrant.create_physical_collection(name, qdrant.profile, qdrant.vector_sizes[name])
+            qdrant.ensure_payload_indexes(targets[name])
+        build_qdrant = QdrantManager()
+        build_qdrant.text_collection = targets[qdrant.text_collection]
+        build_qdrant.image_collection = targets[qdrant.image_collection]
+    else:
+        qdrant.initialize_collections()
+        build_qdrant = qdrant
+
+    db = SessionLocal()
+    try:
+        indexer = CatalogIndexer(
+            db,
+            qdrant=build_qdrant,
+            chunk_size=args.chunk_size,
+            image_concurrency=args.image_concurrency,
+            upload_parallel=args.upload_parallel,
+            index_images=not args.no_images,
+        )
+        stats = asyncio.run(indexer.run(full=args.full or args.recreate))
+    finally:
+        db.close()
+
+    for name, new in targets.items():
+        old = qdrant.resolve_collection(name)
+        if old is None:
+            qdrant.swap_alias(name, new)
+        else:
+            qdrant.replace_collection(name, old, new)
+        print(f"{name} -> {new}")
+
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
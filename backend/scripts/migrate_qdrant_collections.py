@@ -0,0 +1,44 @@
+"""
+Move the Qdrant part collections to another storage profile
+
+Rebuilds parts_text / parts_images with the given profile (see
+app/ai/collection_profiles.py) and switches their aliases once the copy is
+complete, so searches keep working throughout. Stop the catalog indexer
+while this runs.
+
+Usage (from backend/):
+    python scripts/migrate_qdrant_collections.py --profile int8
+    python scripts/migrate_qdrant_collections.py --profile binary --collections text --keep-old
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.ai.collection_profiles import PROFILES, get_profile  # noqa: E402
+from app.ai.qdrant_client import QdrantManager  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", required=True, choices=list(PROFILES))
+    parser.add_argument("--collections", nargs="+", choices=["text", "image"], default=["text", "image"])
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--keep-old", action="store_true", help="Keep the previous physical collection for rollback")
+    args = parser.parse_args()
+
+    qdrant = QdrantManager()
+    profile = get_profile(args.profile)
+    for collection_type in args.collections:
+        qdrant.migrate_collection(
+            qdrant.collection_name(collection_type),
+            profile,
+            batch_size=args.batch_size,
+            keep_old=args.keep_old,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -31,7 +31,7 @@ cd "$(dirname "$0")/.."
 echo ""
 echo "Starting ARQ worker..."
 echo "Worker configuration:"
-echo "  - Max concurrent jobs: 1 (memory constraint)"
+echo "  - Concurrent jobs: admitted by memory budget (see worker: in scraper_config.yaml)"
 echo "  - Job timeout: 3600s (1 hour)"
 echo "  - Retry attempts: 3"
 echo ""
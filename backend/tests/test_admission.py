@@ -0,0 +1,38 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.scraper import scheduler
+from app.scraper.admission import AdmissionController
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def test_job_that_does_not_fit_is_re_enqueued_instead_of_waiting(monkeypatch):
+    admission = AdmissionController(budget_mb=10_000, footprints_mb={'playwright': 10_000})
+    redis = fakeredis.FakeAsyncRedis()
+    queued = []
+
+    async def enqueue_job(function, *args, **kwargs):
+        queued.append((function, args, kwargs))
+        return SimpleNamespace(job_id="follow-up")
+
+    async def execute(ctx, scraper_id, full_refresh):
+        raise AssertionError("job ran without admission")
+
+    redis.enqueue_job = enqueue_job
+    monkeypatch.setattr(scheduler, "_scraping_method", lambda scraper_id: 'playwright')
+    monkeypatch.setattr(scheduler, "_execute_scraper_job", execute)
+
+    async def main():
+        await redis.set(scheduler.ARQ_JOB_KEY.format("try-2"), 7)
+        async with admission.admit("long-crawl", 'playwright'):
+            result = await scheduler.run_scraper_job({'redis': redis, 'admission': admission, 'job_id': "try-2"}, "vendor")
+        return result, await redis.get(scheduler.ARQ_JOB_KEY.format("follow-up"))
+
+    result, resumes_job = asyncio.run(main())
+
+    assert result == {'status': 'deferred'}
+    assert queued == [('run_scraper_job', ("vendor", False), {'_defer_by': scheduler.ADMISSION_DEFER_SECONDS})]
+    assert resumes_job == b"7"
@@ -0,0 +1,55 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.ai.batching import MicroBatcher
+from app.ai.inference_pool import InferenceBusy, InferencePool
+
+
+def test_concurrent_requests_share_a_batch():
+    calls = []
+    release = threading.Event()
+
+    def run_batch(items):
+        release.wait(1)
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(run_batch, max_batch_size=8, max_wait_ms=50)
+
+    async def main():
+        tasks = [asyncio.create_task(batcher.submit_async(i)) for i in range(5)]
+        await asyncio.sleep(0.01)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    assert asyncio.run(main()) == [0, 2, 4, 6, 8]
+    assert sum(len(c) for c in calls) == 5
+    assert len(calls) < 5
+    stats = batcher.stats()
+    assert stats["items"] == 5
+    assert stats["latency_ms_p95"] is not None
+
+
+def test_batch_failure_propagates_to_every_caller():
+    def run_batch(items):
+        raise ValueError("model exploded")
+
+    batcher = MicroBatcher(run_batch, max_batch_size=4, max_wait_ms=1)
+    with pytest.raises(ValueError):
+        batcher.submit("x").result(timeout=2)
+    assert batcher.stats()["errors"] == 1
+
+
+def test_inference_pool_rejects_when_saturated():
+    release = threading.Event()
+    pool = InferencePool(workers=0, max_pending=1, retry_after=7)
+    first = pool.submit(release.wait, 2)
+    with pytest.raises(InferenceBusy) as exc_info:
+        pool.submit(release.wait, 2)
+    assert exc_info.value.retry_after == 7
+    release.set()
+    assert first.result(timeout=2) is True
+    assert pool.stats()["rejected"] == 1
+    pool.shutdown()
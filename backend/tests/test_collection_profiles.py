@@ -0,0 +1,28 @@
+from qdrant_client import QdrantClient
+
+from app.ai.collection_profiles import get_profile
+from app.ai.qdrant_client import QdrantManager
+
+
+def make_manager(configured_profile):
+    manager = QdrantManager.__new__(QdrantManager)
+    manager.client = QdrantClient(":memory:")
+    manager.text_collection, manager.image_collection = "parts_text", "parts_images"
+    manager.profile = get_profile(configured_profile)
+    manager._collection_profiles = {}
+    return manager
+
+
+def test_search_uses_the_profile_the_live_collection_was_built_with():
+    manager = make_manager("int8")
+    manager.swap_alias("parts_text", manager.create_physical_collection("parts_text", get_profile("binary"), 4))
+    manager.client.create_collection("parts_images", vectors_config=get_profile("default").vector_params(4))
+    calls = []
+    manager.client.search = lambda **kwargs: calls.append(kwargs) or []
+
+    manager.search_by_vector([0.1] * 4, collection_type="text")
+    manager.search_by_vector([0.1] * 4, collection_type="image")
+
+    assert calls[0]["search_params"].quantization.oversampling == 3.0
+    assert calls[1]["search_params"] is None
+    assert manager.collection_profile("parts_text").name == "binary"
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.scraper import ScrapedProduct
+from app.scraper.data_pipeline import validate_and_save_products
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine, tables=[ScrapedProduct.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _products(count):
+    return [
+        {
+            "part_number": f"10413{i:02d}",
+            "product_name": "WTB16P Photoelectric sensor",
+            "source_url": f"https://www.sick.com/p/10413{i:02d}",
+            "specifications": {"Sensing range": "10 mm ... 1,000 mm"},
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+def test_bulk_and_row_modes_return_same_counts(db, bulk):
+    first = asyncio.run(validate_and_save_products(_products(5), "sick-ag-products", "SICK AG", db, bulk=bulk))
+    assert (first["saved"], first["updated"], first["rejected"]) == (5, 0, 0)
+
+    rows = _products(5)
+    rows[0]["specifications"] = {"Sensing range": "20 mm ... 1,200 mm"}
+    rows.append({"part_number": "", "product_name": "x", "source_url": "u"})
+    second = asyncio.run(validate_and_save_products(rows, "sick-ag-products", "SICK AG", db, bulk=bulk))
+
+    assert (second["saved"], second["updated"], second["rejected"]) == (0, 1, 1)
+    assert second["rejected_records"][0]["row_index"] == 5
+    assert db.query(ScrapedProduct).count() == 5
+    changed = db.query(ScrapedProduct).filter_by(part_number="1041300").one()
+    assert changed.specifications == {"Sensing range": "20 mm ... 1,200 mm"}
+
+
+def test_bulk_mode_collapses_duplicates_in_batch(db):
+    rows = _products(2) + _products(1)
+    result = asyncio.run(validate_and_save_products(rows, "sick-ag-products", "SICK AG", db))
+    assert result["saved"] == 2
+    assert db.query(ScrapedProduct).count() == 2
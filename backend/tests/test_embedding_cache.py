@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from app.ai.embedding_cache import EmbeddingCache
+
+
+def test_text_keys_are_normalized():
+    cased = EmbeddingCache("e5-test")
+    uncased = EmbeddingCache("clip-test", lowercase=True)
+
+    assert cased.text_key("Photoelectric  W16") == cased.text_key(" Photoelectric W16 ")
+    assert cased.text_key("Photoelectric W16") != cased.text_key("photoelectric w16")
+    assert uncased.text_key("Photoelectric  W16") == uncased.text_key(" photoelectric w16 ")
+    assert uncased.text_key("sensor") != uncased.text_key("sensors")
+
+
+def test_lru_roundtrip_and_eviction():
+    cache = EmbeddingCache("clip-test", max_items=2, dtype="float16")
+    vector = np.random.rand(512).astype(np.float32)
+
+    cache.put("a", vector)
+    cache.put("b", vector)
+    assert cache.get("a") is not None  # "a" becomes most recent
+    cache.put("c", vector)
+
+    assert cache.get("b") is None
+    np.testing.assert_allclose(cache.get("a"), vector, rtol=1e-3, atol=1e-3)
+    assert cache.stats()["local_hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_redis_tier_survives_process_restart():
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeRedis()
+    vector = [0.25] * 512
+
+    EmbeddingCache("clip-test", redis_client=redis_client, dtype="float32").put("k", vector)
+    # float32 blob: 4 bytes per dim, no JSON
+    assert len(redis_client.get("emb:clip-test:float32:k")) == 512 * 4
+
+    fresh = EmbeddingCache("clip-test", redis_client=redis_client, dtype="float32")
+    assert fresh.get("k") == vector
+    assert fresh.stats()["remote_hits"] == 1
+    assert fresh.get("k") == vector
+    assert fresh.stats()["local_hits"] == 1
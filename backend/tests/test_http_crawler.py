@@ -0,0 +1,125 @@
+import asyncio
+import functools
+import time
+
+import httpx
+import pytest
+
+from app.scraper import scraper_engine
+from app.scraper.frontier import CrawlFrontier
+from app.scraper.rate_limiter import HostRateLimiter
+from app.scraper.scraper_engine import ScraperConfig, ScraperEngine
+
+fakeredis = pytest.importorskip("fakeredis")
+
+LISTING_URL = "https://vendor.example/sensors"
+
+
+def make_config(**overrides):
+    return ScraperConfig(**{
+        "id": "vendor",
+        "vendor_name": "Vendor",
+        "base_url": "https://vendor.example",
+        "start_urls": [LISTING_URL],
+        "scraping_method": "http",
+        "selectors": {"product_card": ".card", "product_name": ".name", "part_number": ".pn"},
+        "pagination": {},
+        "child_pages": {},
+        "limits": {"max_retries": 0},
+        **overrides,
+    })
+
+
+def use_transport(monkeypatch, handler):
+    """Route the crawler's own AsyncClient through a mock transport"""
+    client = functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(scraper_engine.httpx, "AsyncClient", client)
+
+
+def test_resume_keeps_uncommitted_rows_without_detail_links(monkeypatch):
+    cards = "".join(f'<div class="card"><span class="name">Sensor {i}</span><span class="pn">P-{i}</span></div>' for i in range(3))
+    use_transport(monkeypatch, lambda request: httpx.Response(200, text=f"<html><body>{cards}</body></html>"))
+    engine, config = ScraperEngine.__new__(ScraperEngine), make_config()
+    redis = fakeredis.FakeAsyncRedis()
+
+    async def main():
+        # First attempt: the batch holding the first row is committed, then the worker dies
+        frontier = await CrawlFrontier(redis, job_id=1).load()
+        async for product in engine._scrape_with_http(config, frontier=frontier):
+            await frontier.commit([product])
+            first = product
+            break
+        resumed = await CrawlFrontier(redis, job_id=1).load()
+        return first, [product async for product in engine._scrape_with_http(config, frontier=resumed)]
+
+    first, resumed = asyncio.run(main())
+
+    assert first["source_url"] == LISTING_URL
+    assert [p["part_number"] for p in resumed] == ["P-1", "P-2"]
+
+
+class RecordingLimiter:
+    def __init__(self):
+        self.pauses = []
+
+    async def acquire(self, url):
+        pass
+
+    def pause(self, url, seconds):
+        self.pauses.append(seconds)
+
+
+def fetch(responses, limits):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return responses[min(len(requests), len(responses)) - 1]
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            limiter = RecordingLimiter()
+            response = await ScraperEngine.__new__(ScraperEngine)._fetch_with_backoff(
+                client, limiter, f"{LISTING_URL}/1", make_config(limits=limits)
+            )
+            return response, limiter.pauses, len(requests)
+
+    return asyncio.run(main())
+
+
+def test_limits_accept_fractional_rates_and_keep_integer_counts():
+    config = make_config(limits={"requests_per_second": 0.5, "backoff_base_s": 1.5, "max_retries": 3})
+
+    assert config.limits == {"requests_per_second": 0.5, "backoff_base_s": 1.5, "max_retries": 3}
+    assert isinstance(config.limits["max_retries"], int)
+
+
+def test_backoff_honours_retry_after_on_429():
+    responses = [httpx.Response(429, headers={"Retry-After": "7"}), httpx.Response(200, text="ok")]
+
+    response, pauses, attempts = fetch(responses, {"max_retries": 2, "backoff_base_s": 0.01})
+
+    assert response.status_code == 200 and attempts == 2
+    assert pauses == [7.0]
+
+
+def test_backoff_gives_up_after_max_retries():
+    with pytest.raises(httpx.HTTPStatusError):
+        fetch([httpx.Response(503)], {"max_retries": 2, "backoff_base_s": 0.01})
+
+
+def test_rate_limiter_paces_each_host_separately():
+    limiter = HostRateLimiter(requests_per_second=20, burst=2)
+
+    async def timed(urls):
+        started = time.perf_counter()
+        for url in urls:
+            await limiter.acquire(url)
+        return time.perf_counter() - started
+
+    # Burst of 2, then one request every 50 ms
+    paced = asyncio.run(timed([LISTING_URL] * 6))
+    other_host = asyncio.run(timed(["https://cdn.example/a.jpg"] * 2))
+
+    assert 0.18 <= paced < 0.5
+    assert other_host < 0.02
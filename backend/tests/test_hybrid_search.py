@@ -0,0 +1,90 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.ai.hybrid_search import (
+    CatalogSnapshot,
+    HybridSearchEngine,
+    is_specific_part_number,
+    looks_like_part_number,
+    reciprocal_rank_fusion,
+)
+
+PRODUCTS = {
+    1: {"part_number": "1041380", "product_name": "WTB16P-24161120A00", "category": "Photoelectric sensors", "vendor_name": "SICK AG"},
+    2: {"part_number": "1041381", "product_name": "WTB16P-24162120A00", "category": "Photoelectric sensors", "vendor_name": "SICK AG"},
+    3: {"part_number": "6011123", "product_name": "Inductive proximity sensor IME12", "category": "Inductive sensors", "vendor_name": "SICK AG"},
+}
+
+
+class FakeTextSearch:
+    def __init__(self, ids):
+        self.ids = ids
+        self.calls = 0
+
+    async def search_by_description(self, query, top_k=10, filters=None, hnsw_ef=None, exact=False):
+        self.calls += 1
+        self.filters = filters
+        return [SimpleNamespace(id=i, payload=PRODUCTS[i]) for i in self.ids[:top_k]]
+
+
+def make_engine(vector_ids):
+    engine = HybridSearchEngine(FakeTextSearch(vector_ids))
+    docs = [(i, f"{p['part_number']} {p['product_name']} {p['category']}") for i, p in PRODUCTS.items()]
+    engine._snapshot = CatalogSnapshot(PRODUCTS, docs)
+    return engine
+
+
+def test_part_number_detection():
+    assert looks_like_part_number("1041380")
+    assert looks_like_part_number("WTB16P-24161120A00")
+    assert not looks_like_part_number("photoelectric sensor")
+    assert not looks_like_part_number("W16")
+    assert is_specific_part_number("104138")
+    assert not is_specific_part_number("IP67") and not is_specific_part_number("24VDC")
+
+
+def test_exact_part_number_skips_the_model():
+    engine = make_engine([3])
+    response = asyncio.run(engine.search("1041380"))
+    assert response["strategy"] == "part_number_exact"
+    assert [r["id"] for r in response["results"]] == [1]
+    assert engine.text_search.calls == 0
+
+
+def test_prefix_part_number_uses_index_not_model():
+    engine = make_engine([3])
+    response = asyncio.run(engine.search("104138"))
+    assert response["strategy"] == "part_number_prefix"
+    assert {r["id"] for r in response["results"]} == {1, 2}
+    assert engine.text_search.calls == 0
+
+
+def test_short_code_without_exact_hit_keeps_vector_search():
+    engine = make_engine([3])
+    response = asyncio.run(engine.search("IME12"))
+    assert response["strategy"] == "hybrid"
+    assert engine.text_search.calls == 1
+    assert response["results"][0]["id"] == 3
+
+
+def test_descriptive_query_fuses_lexical_and_vector():
+    engine = make_engine([3, 2])
+    response = asyncio.run(engine.search("inductive sensor"))
+    assert response["strategy"] == "hybrid"
+    assert response["results"][0]["id"] == 3
+    assert set(response["results"][0]["sources"]) == {"lexical", "vector"}
+
+
+def test_filters_apply_to_every_leg():
+    engine = make_engine([3])
+    response = asyncio.run(engine.search("104138", filters={"category": "Inductive sensors"}))
+    assert response["results"] == []
+
+    response = asyncio.run(engine.search("sensor", filters={"category": ["Inductive sensors"]}))
+    assert [r["id"] for r in response["results"]] == [3]
+    assert engine.text_search.filters == {"category": ["Inductive sensors"]}
+
+
+def test_rrf_rewards_agreement():
+    fused = reciprocal_rank_fusion({"a": [1, 2, 3], "b": [3, 1]})
+    assert [doc_id for doc_id, _, _ in fused] == [1, 3, 2]
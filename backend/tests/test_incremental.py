@@ -0,0 +1,74 @@
+import asyncio
+from datetime import datetime
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.scraper import ScrapedProduct
+from app.scraper.incremental import IncrementalState, listing_fingerprint
+from app.scraper.rate_limiter import HostRateLimiter
+from app.scraper.scraper_engine import ScraperConfig, ScraperEngine
+
+LISTING_URL = "https://vendor.example/sensors"
+DETAIL_URL = "https://vendor.example/sensors/wtb16p"
+
+
+def make_config():
+    return ScraperConfig(
+        id="vendor",
+        vendor_name="Vendor",
+        base_url="https://vendor.example",
+        start_urls=[LISTING_URL],
+        scraping_method="http",
+        selectors={"product_card": ".card", "product_name": ".name", "part_number": ".pn"},
+        pagination={},
+        child_pages={},
+        limits={"max_retries": 0},
+    )
+
+
+def scrape_details(product, state):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(304)
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await ScraperEngine.__new__(ScraperEngine)._scrape_http_details(
+                client, HostRateLimiter(100, 100), asyncio.Semaphore(1), [product], make_config(), LISTING_URL, state
+            )
+
+    return asyncio.run(main()), requests
+
+
+def test_not_modified_page_with_changed_listing_row_is_emitted_from_saved_specs():
+    engine = create_engine("sqlite://")
+    ScrapedProduct.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    db.add(ScrapedProduct(
+        scraper_id="vendor", vendor_name="Vendor", part_number="1", product_name="WTB16P",
+        specifications={"Sensing range": "20 m"}, source_url=DETAIL_URL, data_hash="h1"
+    ))
+    db.commit()
+    old_row = {"product_name": "WTB16P", "part_number": "1", "source_url": DETAIL_URL}
+    state = IncrementalState("vendor", {
+        DETAIL_URL: {
+            "content_fingerprint": listing_fingerprint(old_row),
+            "etag": '"v1"',
+            "last_modified": None,
+            "last_full_fetch_at": datetime.utcnow(),
+        }
+    }, db=db)
+    new_row = {**old_row, "product_name": "WTB16P Photoelectric sensor"}
+
+    emitted, requests = scrape_details(dict(new_row), state)
+
+    assert requests[0].headers["if-none-match"] == '"v1"'
+    assert emitted[0]["specifications"] == {"Sensing range": "20 m"}
+    assert state.states[DETAIL_URL]["content_fingerprint"] == listing_fingerprint(new_row)
+    assert state.states[DETAIL_URL]["etag"] == '"v1"'
+    assert state.skipped == 0
+    assert "specifications" not in state.states[DETAIL_URL]
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+ort = pytest.importorskip("onnxruntime")
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+from app.ai.onnx_clip import OnnxClip, clip_features, export_towers  # noqa: E402
+
+
+def tiny_clip():
+    """Random CLIP with the real architecture at toy size (no download needed)"""
+    torch.manual_seed(0)
+    config = transformers.CLIPConfig(
+        text_config={"vocab_size": 99, "hidden_size": 32, "intermediate_size": 64, "num_hidden_layers": 2,
+                     "num_attention_heads": 4, "max_position_embeddings": 77},
+        vision_config={"hidden_size": 32, "intermediate_size": 64, "num_hidden_layers": 2,
+                       "num_attention_heads": 4, "image_size": 32, "patch_size": 8},
+        projection_dim=16,
+    )
+    return transformers.CLIPModel(config).eval()
+
+
+def cosine(a, b):
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return (a * b).sum(axis=1)
+
+
+@pytest.fixture(scope="module")
+def exported(tmp_path_factory):
+    model = tiny_clip()
+    model_dir = tmp_path_factory.mktemp("clip-onnx")
+    export_towers(model, str(model_dir), quantize=True)
+    return model, str(model_dir)
+
+
+@pytest.mark.parametrize("quantized, tolerance", [(False, 0.9999), (True, 0.98)])
+def test_onnx_vectors_match_torch(exported, quantized, tolerance):
+    model, model_dir = exported
+    clip = OnnxClip(model_dir, quantized=quantized, intra_op_threads=1)
+
+    # Different batch size and sequence length than the export: axes are dynamic
+    input_ids = torch.randint(1, 98, (3, 12))
+    input_ids[:, -1] = 98
+    attention_mask = torch.ones_like(input_ids)
+    attention_mask[0, 6:-1] = 0
+    pixel_values = torch.randn(5, 3, 32, 32)
+
+    with torch.no_grad():
+        text_ref = clip_features(model.get_text_features(input_ids=input_ids, attention_mask=attention_mask)).numpy()
+        image_ref = clip_features(model.get_image_features(pixel_values=pixel_values)).numpy()
+
+    text = clip.text_features(input_ids.numpy(), attention_mask.numpy())
+    image = clip.image_features(pixel_values.numpy())
+
+    assert text.shape == text_ref.shape and image.shape == image_ref.shape
+    assert cosine(text, text_ref).min() >= tolerance
+    assert cosine(image, image_ref).min() >= tolerance
+
+
+def test_torch_backend_returns_projected_vectors(exported, monkeypatch):
+    from PIL import Image
+
+    from app.ai import embedding_backends
+
+    model, _ = exported
+    processor = transformers.CLIPImageProcessor(size={"shortest_edge": 32}, crop_size={"height": 32, "width": 32})
+    monkeypatch.setattr(embedding_backends.model_registry, "get", lambda name: (model, processor))
+
+    vectors = embedding_backends.ClipTorchBackend().embed_images([Image.new("RGB", (48, 40), "gray")])
+
+    assert np.asarray(vectors).shape == (1, model.config.projection_dim)
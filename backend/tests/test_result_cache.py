@@ -0,0 +1,35 @@
+import time
+
+from app.ai.result_cache import PerceptualResultCache, ResultCache
+
+
+def test_lru_bound_and_ttl():
+    cache = ResultCache("voice", max_items=2, ttl_seconds=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "a" is now most recent
+    cache.put("c", 3)
+    assert cache.get("b") is None and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+    cache.ttl_seconds = 0.01
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.stats()["items"] == 1
+
+
+def test_perceptual_lookup_respects_distance_and_scope():
+    cache = PerceptualResultCache("vision", max_items=10, ttl_seconds=60, max_distance=4)
+    textured = 0x0F0F_3C3C_F0F0_A5A5
+    cache.put_image("sha-a", textured, {"part": "A"}, scope="{}")
+
+    assert cache.get_exact("sha-a", "{}") == {"part": "A"}
+    assert cache.get_similar(textured ^ 0b101, "{}") == ({"part": "A"}, 2)
+    assert cache.get_similar(textured ^ 0xFF, "{}") == (None, None)  # 8 bits apart
+    assert cache.get_similar(textured, '{"category": "Sensors"}') == (None, None)
+    assert cache.stats()["near_duplicate_hits"] == 1
+
+    # Flat images: only an identical hash matches
+    cache.put_image("sha-blank", 0, {"part": "blank"}, scope="{}")
+    assert cache.get_similar(0b11, "{}") == (None, None)
+    assert cache.get_similar(0, "{}") == ({"part": "blank"}, 0)
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+
+from app.scraper.scraper_engine import ScraperEngine
+from app.scraper.spec_parser import parse_spec_table
+
+MHTML_FIXTURE = Path(__file__).resolve().parents[2] / "WTB16P-X01 - W16 _ SICK.mhtml"
+
+NESTED_SICK_TABLE = """
+<table>
+  <tr><th>Functional principle</th><td>Photoelectric <b>proximity</b> sensor</td></tr>
+  <tr><td colspan="2">
+    <table>
+      <tr><td>Sensing range</td><td><span>10 mm ... 1,000 mm</span><!-- max --></td></tr>
+      <tr><td>Light source</td><td>PinPoint LED<br/>red</td></tr>
+    </table>
+  </td></tr>
+  <tr><td>Dimensions</td><td><table><tr><td>Width</td><td>16 mm</td></tr></table></td></tr>
+  <tr><td> Housing&nbsp;</td><td>
+      Rectangular </td></tr>
+  <tr><td></td><td>orphan value</td></tr>
+</table>
+"""
+
+
+@pytest.mark.parametrize("backend", ["bs4", "lxml"])
+def test_nested_sick_table(backend):
+    assert parse_spec_table(NESTED_SICK_TABLE, backend=backend) == {
+        "Functional principle": "Photoelectric proximity sensor",
+        "Sensing range": "10 mm ... 1,000 mm",
+        "Light source": "PinPoint LED red",
+        "Width": "16 mm",
+        "Housing": "Rectangular",
+    }
+
+
+def test_engine_parser_defaults_to_lxml_with_same_output():
+    assert ScraperEngine._parse_table_html(NESTED_SICK_TABLE) == parse_spec_table(NESTED_SICK_TABLE, backend="bs4")
+
+
+@pytest.mark.skipif(not MHTML_FIXTURE.exists(), reason="saved SICK page not available")
+def test_backends_match_on_saved_sick_page():
+    from scripts.bench_spec_parser import load_tables
+
+    tables = load_tables(MHTML_FIXTURE)
+    assert tables
+    for table in tables:
+        assert parse_spec_table(table, backend="lxml") == parse_spec_table(table, backend="bs4")
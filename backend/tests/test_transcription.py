@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.ai import transcription_backends
+from app.ai.transcription_backends import FasterWhisperBackend, get_transcription_backend
+
+
+class FakeWhisperModel:
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, **options):
+        self.calls.append(options)
+        segments = [
+            SimpleNamespace(start=0.0, end=1.0, text=" حساس", avg_logprob=np.log(0.9)),
+            SimpleNamespace(start=1.5, end=4.5, text=" ضوئي", avg_logprob=np.log(0.5)),
+        ]
+        info = SimpleNamespace(language=options["language"] or "en", duration=8.0, duration_after_vad=4.0)
+        return iter(segments), info
+
+
+def test_faster_whisper_passes_hint_and_vad(monkeypatch):
+    model = FakeWhisperModel()
+    monkeypatch.setattr(transcription_backends.model_registry, "get", lambda name: model)
+
+    result = FasterWhisperBackend().transcribe(np.zeros(16000, dtype=np.float32), "ar")
+
+    assert model.calls[0]["language"] == "ar"
+    assert model.calls[0]["vad_filter"] is True
+    assert result["text"] == "حساس ضوئي"
+    assert result["language"] == "ar"
+    assert result["confidence"] == pytest.approx((0.9 * 1 + 0.5 * 3) / 4, abs=1e-3)
+    assert result["speech_duration"] == 4.0
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        get_transcription_backend("whisper-xl")
+
+
+def test_voice_language_hint_defaults_to_auto_detection():
+    from app.api.search_routes import voice_language
+
+    assert voice_language(None, None) is None
+    assert voice_language("AR", None) == "ar"
+    assert voice_language(None, SimpleNamespace(preferred_language="ar")) == "ar"
+    assert voice_language("fr", None) is None
@@ -0,0 +1,64 @@
+import hashlib
+import os
+import time
+
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.utils.uploads import BodySizeLimitMiddleware, Upload, UploadStore, read_upload
+
+LIMIT = 256 * 1024
+
+
+def make_client():
+    app = FastAPI()
+    app.add_middleware(BodySizeLimitMiddleware, limits={"/upload": LIMIT})
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        result = await read_upload(file, LIMIT)
+        return {"size": len(result.data), "sha256": result.sha256}
+
+    return TestClient(app)
+
+
+def test_upload_within_limit_is_read_and_hashed():
+    data = os.urandom(100 * 1024)
+    response = make_client().post("/upload", files={"file": ("photo.jpg", data, "image/jpeg")})
+    assert response.status_code == 200
+    assert response.json() == {"size": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def test_oversized_upload_is_rejected_with_413():
+    client = make_client()
+    data = os.urandom(LIMIT * 2)
+    response = client.post("/upload", files={"file": ("photo.jpg", data, "image/jpeg")})
+    assert response.status_code == 413
+
+    # No Content-Length: cut off while streaming
+    def chunks():
+        for _ in range(8):
+            yield b"x" * (LIMIT // 2)
+
+    response = client.post("/upload", content=chunks(), headers={"Content-Type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
+
+
+def test_store_deduplicates_by_content_and_expires(tmp_path):
+    store = UploadStore(str(tmp_path / "uploads"), retention_seconds=60, legacy_dirs=[str(tmp_path / "legacy")])
+    upload = Upload(b"same bytes", hashlib.sha256(b"same bytes").hexdigest(), "a.JPG", "image/jpeg")
+
+    first = store.save("images", upload)
+    second = store.save("images", upload)
+    assert first == second and first.name == f"{upload.sha256}.jpg"
+    assert store.stats()["saved"] == 1 and store.stats()["deduplicated"] == 1
+
+    legacy = tmp_path / "legacy" / "temp_123.wav"
+    legacy.parent.mkdir()
+    legacy.write_bytes(b"old")
+    old = time.time() - 3600
+    os.utime(first, (old, old))
+    os.utime(legacy, (old, old))
+
+    assert store.purge_expired() == 2
+    assert not first.exists() and not legacy.exists()
@@ -0,0 +1,148 @@
+import asyncio
+import base64
+import io
+import time
+
+import httpx
+import numpy as np
+import pytest
+from PIL import Image, UnidentifiedImageError
+
+from app.ai import ollama_client
+from app.ai.image_preprocess import prepare_image
+from app.ai.inference_pool import InferenceBusy
+from app.ai.result_cache import PerceptualResultCache
+from app.ai.vision_agent import VisionAgent
+
+
+class FakeEmbedder:
+    async def embed_image(self, image):
+        await asyncio.sleep(0.2)
+        return [0.1, 0.2]
+
+
+class FakeQdrant:
+    def search_by_vector(self, vector, top_k, collection_type, filters):
+        return [{"id": 1, "filters": filters}]
+
+
+def make_agent(tmp_path, ocr_error=None):
+    image_path = tmp_path / "part.jpg"
+    Image.new("RGB", (640, 480), "gray").save(image_path)
+
+    agent = VisionAgent.__new__(VisionAgent)
+    agent.embedder = FakeEmbedder()
+    agent.qdrant = FakeQdrant()
+    agent.result_cache = PerceptualResultCache("vision", max_items=10, ttl_seconds=60)
+    seen = {}
+
+    async def extract_text(image):
+        seen["ocr_input"] = image
+        await asyncio.sleep(0.2)
+        if ocr_error:
+            raise ocr_error
+        return "WTB16P-24161120A00"
+
+    async def analyze_with_vision_llm(base64_image, ocr_text):
+        seen["ocr_text"] = ocr_text
+        await asyncio.sleep(0.1)
+        return {"part_name": "sensor"}
+
+    agent.extract_text = extract_text
+    agent.analyze_with_vision_llm = analyze_with_vision_llm
+    return agent, str(image_path), seen
+
+
+def test_branches_run_concurrently(tmp_path):
+    agent, image_path, seen = make_agent(tmp_path)
+
+    started = time.perf_counter()
+    result = asyncio.run(agent.identify_part_from_image(image_path, filters={"category": "Sensors"}))
+    elapsed = time.perf_counter() - started
+
+    # Sequential would be 0.2 + 0.2 + 0.1; concurrent is the slower branch (OCR -> LLM)
+    assert elapsed < 0.45
+    assert seen["ocr_text"] == "WTB16P-24161120A00"
+    assert result["similar_parts"] == [{"id": 1, "filters": {"category": "Sensors"}}]
+    assert result["llm_analysis"] == {"part_name": "sensor"}
+    assert set(result["timings_ms"]) == {"preprocess", "embed", "search", "ocr", "llm", "total"}
+    assert isinstance(seen["ocr_input"], np.ndarray)
+    assert result["cache"] == {"hit": None}
+
+
+def test_repeat_and_near_duplicate_uploads_are_served_from_cache(tmp_path):
+    agent, image_path, _ = make_agent(tmp_path)
+    blocks = np.random.default_rng(0).integers(0, 255, (12, 16, 3), dtype=np.uint8)
+    photo = Image.fromarray(blocks).resize((640, 480), Image.NEAREST)
+    original, recompressed = io.BytesIO(), io.BytesIO()
+    photo.save(original, format="JPEG", quality=95)
+    photo.resize((320, 240)).save(recompressed, format="JPEG", quality=60)
+
+    async def main():
+        first = await agent.identify_part_from_image(original.getvalue())
+        started = time.perf_counter()
+        repeat = await agent.identify_part_from_image(original.getvalue())
+        repeat_seconds = time.perf_counter() - started
+        near = await agent.identify_part_from_image(recompressed.getvalue())
+        other_filters = await agent.identify_part_from_image(original.getvalue(), filters={"category": "Sensors"})
+        return first, repeat, repeat_seconds, near, other_filters
+
+    first, repeat, repeat_seconds, near, other_filters = asyncio.run(main())
+
+    assert repeat["cache"] == {"hit": "exact", "distance": 0} and repeat_seconds < 0.05
+    assert repeat["llm_analysis"] == first["llm_analysis"]
+    assert near["cache"]["hit"] == "near_duplicate"
+    assert other_filters["cache"] == {"hit": None}
+    assert agent.result_cache.stats()["hit_rate"] == 0.5
+
+
+def test_failed_vision_llm_call_is_not_cached(tmp_path, monkeypatch):
+    agent, image_path, _ = make_agent(tmp_path)
+    del agent.analyze_with_vision_llm  # Use the real Ollama call
+    calls = []
+
+    def ollama(request):
+        calls.append(request)
+        return httpx.Response(500, json={"error": "model not loaded"})
+
+    async def main():
+        monkeypatch.setattr(ollama_client, "_client", httpx.AsyncClient(base_url="http://ollama", transport=httpx.MockTransport(ollama)))
+        first = await agent.identify_part_from_image(image_path)
+        second = await agent.identify_part_from_image(image_path)
+        return first, second
+
+    first, second = asyncio.run(main())
+
+    assert "error" in first["llm_analysis"]
+    assert second["cache"] == {"hit": None} and len(calls) == 2
+
+
+def test_branch_failure_propagates(tmp_path):
+    agent, image_path, _ = make_agent(tmp_path, ocr_error=InferenceBusy(5))
+
+    with pytest.raises(InferenceBusy):
+        asyncio.run(agent.identify_part_from_image(image_path))
+
+
+def test_preprocessing_applies_exif_rotation_and_bounds_views():
+    photo = Image.new("RGB", (4000, 3000), "white")
+    exif = photo.getexif()
+    exif[0x0112] = 6  # Rotated 90 degrees: the camera held upright
+    buffer = io.BytesIO()
+    photo.save(buffer, format="JPEG", exif=exif)
+
+    prepared = prepare_image(buffer.getvalue(), ocr_max_side=1600, llm_max_side=1024)
+
+    assert prepared.original_size == (3000, 4000)
+    assert min(prepared.clip.size) == 224 and prepared.clip.height > prepared.clip.width
+    assert prepared.ocr.shape == (1600, 1200, 3)
+    llm_view = Image.open(io.BytesIO(base64.b64decode(prepared.llm_jpeg_b64)))
+    assert llm_view.format == "JPEG" and llm_view.size == (768, 1024)
+
+
+def test_truncated_upload_is_rejected_as_unreadable():
+    buffer = io.BytesIO()
+    Image.fromarray(np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)).save(buffer, format="JPEG")
+
+    with pytest.raises(UnidentifiedImageError):
+        prepare_image(buffer.getvalue()[: len(buffer.getvalue()) // 2])